@@ -4,6 +4,7 @@ from . import ui
 import clocktime
 import lvgl as lv
 from . import base
+from . import profiler
 
 # App Name
 NAME = "Days Matter"
@@ -186,6 +187,7 @@ async def on_boot(apm):
     app_mgr = apm
     await ui.on_boot(apm)
 
+@profiler.profile("on_stop")
 async def on_stop():
     """
     App lifecycle: Called when user leaves this app.
@@ -193,11 +195,13 @@ async def on_stop():
     """
     global scr
     print('on stop')
+    ui.stop_list_rebuild()
     if scr:
         scr.clean()
         del scr
         scr = None
 
+@profiler.profile("on_start")
 async def on_start():
     """
     App lifecycle: Called when user enters this app.
@@ -215,6 +219,7 @@ async def on_start():
     lv.scr_load(scr)
     await init()
 
+@profiler.profile("on_running_foreground")
 async def on_running_foreground():
     """
     App lifecycle: Called periodically when app is in foreground.
@@ -1,7 +1,10 @@
 import lvgl as lv
 from . import base
+from . import profiler
+from .timeslice import TimeSlice
 
 app_mgr = None
+list_seq = 0
 
 STYLES = {"light": {"text": 0x111111,
                     "bg": 0xFFFFFF,
@@ -29,6 +32,14 @@ PAST_DAYS_COLOR_LIGHT = 0xFFA500
 CURRENT_DAYS_COLOR = 0x1E90FF
 CURRENT_DAYS_COLOR_LIGHT = 0x00A5FF
 
+def stop_list_rebuild():
+    """
+    Make a list rebuild in progress stop at its next row.
+    Must be called before the parent of the list is cleaned by anything else.
+    """
+    global list_seq
+    list_seq += 1
+
 
 async def show_days_matter(parent, name, days, time_tuple, handle_event_cb):
     """
@@ -41,6 +52,7 @@ async def show_days_matter(parent, name, days, time_tuple, handle_event_cb):
         time_tuple: Date tuple
         handle_event_cb: Event handler callback
     """
+    stop_list_rebuild()
     if parent: parent.clean()
     app_mgr.leave_root_page()
     style = app_mgr.config().get("style", "light")
@@ -222,8 +234,14 @@ async def show_days_list(parent, last_index, days_list, handle_event_cb):
         last_index: Previously selected item index
         days_list: List of day event dictionaries
         handle_event_cb: Event handler callback
+
+    Rows are built a frame's worth at a time so that key input is handled in between;
+    the rebuild stops early when another one starts or the list is replaced.
     """
     if not parent: return
+    stop_list_rebuild()
+    seq = list_seq
+    slicer = TimeSlice("show_days_list", span=profiler.span("show_days_list"))
     parent.clean()
     app_mgr.enter_root_page()
     style = app_mgr.config().get("style", "light")
@@ -293,6 +311,10 @@ async def show_days_list(parent, last_index, days_list, handle_event_cb):
             line.set_style_line_color(lv.color_hex(STYLES[style]["list_line"]), lv.PART.MAIN)
             line.align(lv.ALIGN.BOTTOM_LEFT, -12, 7)
 
+        await slicer.checkpoint(index)
+        if seq != list_seq: return
+
+    slicer.finish()
     # Set focus and selection
     lv.group_get_default().set_editing(False)
     if last_index > len(days_list) - 1:
@@ -309,6 +331,7 @@ async def show_error_msg(parent, msg):
         parent: Parent container
         msg: Error message text
     """
+    stop_list_rebuild()
     if not parent: return
     parent.clean()
     title = lv.label(parent)
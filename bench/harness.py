@@ -0,0 +1,221 @@
+"""
+Benchmark harness: loads an app package against the stand-in modules in bench/stubs,
+drives its lifecycle hooks, foreground ticks and key events, and measures every step.
+"""
+import os
+import sys
+import atexit
+import copy
+import time
+import random
+import asyncio
+import builtins
+import tempfile
+import tracemalloc
+import shutil
+import importlib.util
+
+# Compiled modules go to a private cache: the app folders stay clean and a stale __pycache__
+# left there by other tools does not make the import step of one run slower than another
+sys.pycache_prefix = tempfile.mkdtemp(prefix="bench-pycache-")
+atexit.register(shutil.rmtree, sys.pycache_prefix, True)
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(BENCH_DIR, "stubs"))
+
+import lvgl       # noqa: E402  (stand-in modules, importable once stubs/ is on the path)
+import aioble     # noqa: E402
+import clocktime  # noqa: E402
+
+DEFAULT_NOW = clocktime.now()
+SETTLE_ROUNDS = 100  # Event loop turns given to background tasks after every step
+METRICS = ("created", "deleted", "style_calls")  # Counters of the stand-in lvgl module, compared exactly
+
+_real_sleep = asyncio.sleep
+_tick_offset_ms = 0  # Virtual time added to time.ticks_ms() by advance()
+
+
+def advance(seconds):
+    """Move the wall clock (clocktime) and the tick counter (time.ticks_ms) forward together."""
+    global _tick_offset_ms
+    clocktime.advance(seconds)
+    _tick_offset_ms += seconds * 1000
+
+
+def install_micropython_shims():
+    """Add the MicroPython-only parts of time/asyncio/gc the apps use; sleeps return on the next loop turn."""
+    import gc
+
+    time.ticks_ms = lambda: (int(time.perf_counter() * 1000) + _tick_offset_ms) & 0x3FFFFFFF
+    time.ticks_diff = lambda a, b: ((a - b + 0x20000000) & 0x3FFFFFFF) - 0x20000000
+    time.ticks_add = lambda a, b: (a + b) & 0x3FFFFFFF
+    time.sleep_ms = lambda ms: None
+
+    async def sleep(seconds, result=None):
+        return await _real_sleep(0, result)
+
+    async def sleep_ms(ms):
+        await _real_sleep(0)
+
+    asyncio.sleep = sleep
+    asyncio.sleep_ms = sleep_ms
+    if not hasattr(gc, "mem_alloc"): gc.mem_alloc = lambda: 0
+
+
+class AppFiles:
+    """Redirect the device paths used by the apps ("/apps/...") into a temporary directory."""
+
+    _PREFIX = "/apps"
+
+    def __init__(self, folder):
+        self.folder = folder  # The app's own directory, /apps/<folder>, exists like on the device
+        self.root = None
+        self._saved = {}
+
+    def map(self, path):
+        if isinstance(path, str) and (path == self._PREFIX or path.startswith(self._PREFIX + "/")): return self.root + path
+        return path
+
+    def __enter__(self):
+        self.root = tempfile.mkdtemp(prefix="bench-apps-")
+        os.makedirs(f"{self.root}{self._PREFIX}/{self.folder}")
+        self._saved = {"open": builtins.open, "mkdir": os.mkdir, "remove": os.remove, "listdir": os.listdir, "stat": os.stat}
+        saved = self._saved
+
+        builtins.open = lambda path, *args, **kwargs: saved["open"](self.map(path), *args, **kwargs)
+        os.mkdir = lambda path, *args: saved["mkdir"](self.map(path), *args)
+        os.remove = lambda path: saved["remove"](self.map(path))
+        os.listdir = lambda path=".": saved["listdir"](self.map(path))
+        os.stat = lambda path, *args, **kwargs: saved["stat"](self.map(path), *args, **kwargs)
+        os.ilistdir = self._ilistdir
+        return self
+
+    def _ilistdir(self, path="."):
+        path = self.map(path)
+        for name in self._saved["listdir"](path):
+            full = os.path.join(path, name)
+            yield (name, 0x4000 if os.path.isdir(full) else 0x8000, 0, os.path.getsize(full))
+
+    def __exit__(self, *exc):
+        builtins.open = self._saved["open"]
+        os.mkdir = self._saved["mkdir"]
+        os.remove = self._saved["remove"]
+        os.listdir = self._saved["listdir"]
+        os.stat = self._saved["stat"]
+        del os.ilistdir
+        shutil.rmtree(self.root, ignore_errors=True)
+        return False
+
+
+class AppManager:
+    """Stand-in for the system app manager handed to on_boot."""
+
+    def __init__(self, config):
+        self._config = config
+        self.errors = []
+        self.exited = False
+
+    def config(self, cfg=None):
+        if cfg is None: return self._config
+        self._config = cfg
+
+    def enter_root_page(self): pass
+    def leave_root_page(self): pass
+
+    def error(self, title, msg, confirm=None, cancel=None, cb=None):
+        self.errors.append(title)
+
+    async def exit(self):
+        self.exited = True
+
+
+class Context:
+    """What a scenario step gets to work with."""
+
+    def __init__(self, folder, app, app_mgr):
+        self.folder = folder
+        self.app = app
+        self.app_mgr = app_mgr
+
+    def reload(self):
+        self.app = load_app(self.folder)
+
+    def key(self, name):
+        lvgl.group_get_default().send_key(getattr(lvgl.KEY, name))
+
+    def focus(self, target):
+        group = lvgl.group_get_default()
+        group.add_obj(target)
+        group.focus_obj(target)
+
+
+class Scenario:
+    def __init__(self, name, folder, config, steps):
+        self.name = name
+        self.folder = folder    # App directory in the repository
+        self.config = config    # Initial app configuration
+        self.steps = steps      # [(step name, async callable(ctx))]
+
+
+def load_app(folder):
+    """Import the app package in `folder` from scratch (folder names may contain spaces)."""
+    name = "bench_app_" + "".join([c if c.isalnum() else "_" for c in folder])
+    for key in [k for k in sys.modules if k == name or k.startswith(name + ".")]: del sys.modules[key]
+
+    path = os.path.join(REPO_DIR, folder)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(path, "__init__.py"), submodule_search_locations=[path])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+async def settle():
+    """Give background tasks created by a step (page switches, charts, scans) a chance to run."""
+    for _ in range(SETTLE_ROUNDS): await _real_sleep(0)
+
+
+async def measure(name, action):
+    """Run one step; returns its widget/style counters, net Python heap growth (KiB) and wall time (ms)."""
+    before = dict(lvgl.STATS)
+    alloc = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    await action()
+    await settle()
+    res = {"step": name, "ms": round((time.perf_counter() - start) * 1000, 2)}
+    res["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - alloc) / 1024, 1)
+    for key in METRICS: res[key] = lvgl.STATS[key] - before[key]
+    return res
+
+
+async def run_scenario(scenario):
+    """Run one scenario in a fresh app instance, returns the measurements of every step."""
+    global _tick_offset_ms
+    _tick_offset_ms = 0
+    lvgl.reset()
+    lvgl.reset_stats()
+    aioble.reset()
+    clocktime.set_now(DEFAULT_NOW)
+    random.seed(0)
+
+    results = []
+    tracemalloc.start()
+    with AppFiles(scenario.folder):
+        holder = {}
+
+        async def do_import():
+            holder["app"] = load_app(scenario.folder)
+
+        results.append(await measure("import", do_import))
+        ctx = Context(scenario.folder, holder["app"], AppManager(copy.deepcopy(scenario.config)))
+        try:
+            for step_name, action in scenario.steps:
+                results.append(await measure(step_name, lambda: action(ctx)))
+        finally:
+            # Stop whatever the app left running (scan loops, timers) before the next scenario
+            current = asyncio.current_task()
+            tasks = [t for t in asyncio.all_tasks() if t is not current]
+            for task in tasks: task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            tracemalloc.stop()
+    return results
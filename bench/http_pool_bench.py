@@ -0,0 +1,112 @@
+"""
+Measure what connection reuse (stock_view/http_pool.py), conditional requests and the
+compact quote format (stock_view/service.py) save.
+
+The local quote server of stock_view/demo answers the requests with fixed prices; every new connection
+is delayed by --handshake-ms to stand in for the DNS + TCP + TLS setup of the device's Wi-Fi link.
+The stock service then refreshes the same symbols several times in each mode:
+without connection reuse, with reuse, with reuse and ETags, and with all of them plus CSV.
+
+    python bench/http_pool_bench.py
+    python bench/http_pool_bench.py --symbols 40 --refreshes 5 --handshake-ms 150
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+import harness
+
+sys.path.insert(0, os.path.join(harness.REPO_DIR, "stock_view", "demo"))
+from quote_server import QuoteServer  # noqa: E402
+
+
+async def refresh(service, symbols, refreshes):
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        details = await service.get_stock_details(symbols)
+        if any(d["currentPrice"] is None for d in details): raise RuntimeError("quote missing")
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_parse(service, count, rounds=200):
+    """Time and peak heap of parsing the quotes of `count` symbols as JSON and as compact CSV."""
+    stocks = [{"symbol": f"SYM{i}", "shortName": "NASDAQ", "currentPrice": 101.5, "previousClose": 100.0, "currency": "USD"} for i in range(count)]
+    documents = (
+        ("json", json.dumps({"stocks": stocks}), lambda text: json.loads(text)["stocks"]),
+        ("csv", "\n".join(["symbol,currentPrice,previousClose,currency"] + [f"SYM{i},101.5,100.0,USD" for i in range(count)]), service.parse_compact_quotes),
+    )
+    results = {}
+    for name, text, parse in documents:
+        start = time.perf_counter()
+        for _ in range(rounds): parse(text)
+        ms = (time.perf_counter() - start) * 1000 / rounds
+        tracemalloc.start()
+        parse(text)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = (len(text), ms, peak)
+    return results
+
+
+async def run(args, server):
+    with harness.AppFiles("stock_view"):
+        app = harness.load_app("stock_view")
+        service, pool = app.service, app.http_pool
+        service._STOCK_API_URL = server.url
+        service._USE_SIMULATED_DATA = False
+        symbols = [f"SYM{i}:NASDAQ" for i in range(args.symbols)]
+
+        modes = (
+            # (name, idle connections kept per server, conditional requests, compact format)
+            ("new connection per request", 0, False, False),
+            ("keep-alive pool", pool._MAX_IDLE_PER_HOST, False, False),
+            ("keep-alive + ETag", pool._MAX_IDLE_PER_HOST, True, False),
+            ("keep-alive + ETag + CSV", pool._MAX_IDLE_PER_HOST, True, True),
+        )
+        results = {}
+        for name, idle_per_host, conditional, compact in modes:
+            pool._MAX_IDLE_PER_HOST = idle_per_host
+            service._USE_CONDITIONAL_REQUESTS = conditional
+            service._USE_COMPACT_FORMAT = compact
+            service._etags.clear()
+            for key in pool._stats: pool._stats[key] = 0
+            server.reset_stats()
+            ms = await refresh(service, symbols, args.refreshes)
+            await pool.close_all()
+            results[name] = (ms, dict(pool._stats), server.stats["body_bytes"])
+        return results, measure_parse(service, args.symbols)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Connection reuse benchmark of stock_view/http_pool.py")
+    parser.add_argument("--symbols", type=int, default=20, help="configured symbols (default 20)")
+    parser.add_argument("--refreshes", type=int, default=3, help="refreshes within the idle timeout (default 3)")
+    parser.add_argument("--handshake-ms", type=float, default=100, help="setup cost of a new connection (default 100)")
+    args = parser.parse_args(argv)
+
+    # Fixed prices: a client sending the last ETag always gets a 304
+    server = QuoteServer(handshake_ms=args.handshake_ms, update_s=0, seed=0).start()
+    harness.install_micropython_shims()
+    try:
+        results, parse_results = asyncio.run(run(args, server))
+    finally:
+        server.stop()
+
+    print(f"{args.symbols} symbols, {args.refreshes} refreshes, {args.handshake_ms:.0f} ms per new connection")
+    print(f"  {'mode':<28}{'opened':>8}{'reused':>8}{'fallback':>10}{'body bytes':>12}{'total ms':>10}")
+    for name, (ms, stats, sent) in results.items():
+        print(f"  {name:<28}{stats['opened']:>8}{stats['reused']:>8}{stats['fallback']:>10}{sent:>12}{ms:>10.0f}")
+
+    print(f"\nParsing the quotes of {args.symbols} symbols")
+    print(f"  {'format':<10}{'bytes':>8}{'ms':>10}{'peak heap KiB':>15}")
+    for name, (size, ms, peak) in parse_results.items():
+        print(f"  {name:<10}{size:>8}{ms:>10.3f}{peak / 1024:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
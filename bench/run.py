@@ -0,0 +1,145 @@
+"""
+Run the headless app benchmarks and compare them with bench/baseline.json.
+
+    python bench/run.py                     # run everything, flag regressions against the baseline
+    python bench/run.py sensor_app stock    # only scenarios whose name contains one of the filters
+    python bench/run.py --update-baseline   # record the current numbers as the new baseline
+    python bench/run.py --no-time           # compare widget/style counters only (noisy CI machines)
+    python bench/run.py --repeat 5          # run every scenario 5 times (default 3)
+    python bench/run.py --json out.json     # also write the raw measurements
+
+Widget and style counters are deterministic, any increase is a regression.
+Wall time and heap growth vary between runs and machines, they are only flagged
+when they exceed the baseline by both the relative and the absolute tolerance.
+Every scenario runs several times; the fastest time and smallest heap growth of
+each step are kept, which filters out most of the scheduling noise.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+import harness
+import scenarios
+
+BASELINE_FILE = os.path.join(harness.BENCH_DIR, "baseline.json")
+TIME_TOLERANCE = (0.5, 10.0)   # Flag a step when it is 50% *and* 10 ms slower than the baseline
+ALLOC_TOLERANCE = (0.5, 16.0)  # Flag a step when its heap growth is 50% *and* 16 KiB above the baseline
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_FILE) as f:
+            return json.load(f)
+    except OSError:
+        return {}
+
+
+def save_baseline(baseline):
+    with open(BASELINE_FILE, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def _exceeds(value, base, tolerance):
+    ratio, absolute = tolerance
+    return value > base * (1 + ratio) and value - base > absolute
+
+
+def compare(name, steps, baseline, check_time=True):
+    """Return the list of regression messages of a scenario run against its baseline."""
+    base_steps = {s["step"]: s for s in baseline.get(name, [])}
+    problems = []
+    for step in steps:
+        base = base_steps.get(step["step"], None)
+        if base is None: continue
+        for key in harness.METRICS:
+            if step[key] > base[key]: problems.append(f"{name}/{step['step']}: {key} {base[key]} -> {step[key]}")
+        if not check_time: continue
+        if _exceeds(step["ms"], base["ms"], TIME_TOLERANCE): problems.append(f"{name}/{step['step']}: ms {base['ms']} -> {step['ms']}")
+        if _exceeds(step["alloc_kb"], base["alloc_kb"], ALLOC_TOLERANCE): problems.append(f"{name}/{step['step']}: alloc_kb {base['alloc_kb']} -> {step['alloc_kb']}")
+    return problems
+
+
+def print_table(name, steps, baseline):
+    base_steps = {s["step"]: s for s in baseline.get(name, [])}
+    print(f"\n{name}")
+    print(f"  {'step':<14}{'created':>9}{'deleted':>9}{'styles':>9}{'alloc KiB':>11}{'ms':>10}{'base ms':>10}")
+    for s in steps:
+        base = base_steps.get(s["step"], {})
+        base_ms = f"{base['ms']:.2f}" if "ms" in base else "-"
+        print(f"  {s['step']:<14}{s['created']:>9}{s['deleted']:>9}{s['style_calls']:>9}{s['alloc_kb']:>11.1f}{s['ms']:>10.2f}{base_ms:>10}")
+
+
+def merge_runs(runs):
+    """Combine repeated runs of a scenario: largest counters, fastest time, smallest heap growth."""
+    merged = [dict(step) for step in runs[0]]
+    for steps in runs[1:]:
+        for res, step in zip(merged, steps):
+            for key in harness.METRICS: res[key] = max(res[key], step[key])
+            res["ms"] = min(res["ms"], step["ms"])
+            res["alloc_kb"] = min(res["alloc_kb"], step["alloc_kb"])
+    return merged
+
+
+async def run(selected, repeat):
+    results = {}
+    for scenario in selected:
+        results[scenario.name] = merge_runs([await harness.run_scenario(scenario) for _ in range(repeat)])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless widget-count benchmarks of the apps.")
+    parser.add_argument("filters", nargs="*", help="only run scenarios whose name contains one of these strings")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--no-time", action="store_true", help="ignore wall time and heap growth when comparing")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, the best time is kept (default 3)")
+    parser.add_argument("--json", metavar="FILE", help="write the raw measurements to FILE")
+    parser.add_argument("--quiet", action="store_true", help="silence the apps' own print output")
+    args = parser.parse_args(argv)
+
+    selected = [s for s in scenarios.all_scenarios() if not args.filters or any(f in s.name for f in args.filters)]
+    if not selected:
+        print("No scenario matches the filters.")
+        return 2
+
+    harness.install_micropython_shims()
+    stdout = sys.stdout
+    if args.quiet: sys.stdout = open(os.devnull, "w")
+    try:
+        results = asyncio.run(run(selected, max(1, args.repeat)))
+    finally:
+        if args.quiet:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    baseline = load_baseline()
+    problems = []
+    for name, steps in results.items():
+        print_table(name, steps, baseline)
+        problems += compare(name, steps, baseline, not args.no_time)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+
+    if args.update_baseline:
+        baseline.update(results)
+        save_baseline(baseline)
+        print(f"\nBaseline updated: {BASELINE_FILE}")
+        return 0
+
+    missing = [name for name in results if name not in baseline]
+    if missing: print(f"\nNo baseline for: {', '.join(missing)} (run with --update-baseline)")
+    if problems:
+        print("\nRegressions:")
+        for p in problems: print(f"  {p}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
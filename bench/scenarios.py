@@ -0,0 +1,189 @@
+"""
+Scripted benchmark scenarios: one per app and configuration size.
+Every step is an async callable taking the harness Context.
+"""
+import sys
+import struct
+import aioble
+import clocktime
+from harness import Scenario, advance, settle
+
+_SENSOR_NAME = "SENSOR"     # GAP name the virtual sensor product listens to
+_SENSOR_PRODUCT = "Virtual Sensor"
+_SENSOR_MODEL = 0           # Window sensor model code
+
+
+def _sensor_addr(index):
+    return bytes([0xA0, 0, 0, 0, 0, index])
+
+
+def _sensor_id(index):
+    return "00" + _sensor_addr(index).hex().upper() + "00"
+
+
+def _advertise_sensors(count, measure_id, temperature=215):
+    # One advertisement per sensor: model, measure id, temperature (0.1 C), button, probe, battery
+    for i in range(count):
+        payload = struct.pack("<2Bh3B", _SENSOR_MODEL, measure_id & 0xFF, temperature + i * 10, 0, 1, 90)
+        aioble.advertise(_SENSOR_NAME, _sensor_addr(i), -60, bytes([len(payload) + 1, 0xFF]) + payload)
+
+
+def _lifecycle(name):
+    async def step(ctx):
+        await getattr(ctx.app, name)()
+    return step
+
+
+async def _boot(ctx):
+    await ctx.app.on_boot(ctx.app_mgr)
+
+
+def _tick(seconds, times=1):
+    async def step(ctx):
+        for _ in range(times):
+            advance(seconds)
+            await ctx.app.on_running_foreground()
+    return step
+
+
+def _key(name, times=1):
+    async def step(ctx):
+        for _ in range(times): ctx.key(name)
+    return step
+
+
+def sensor_app(cards):
+    config = {
+        "selected": [{"sensor_id": _sensor_id(i), "nickname": f"Sensor {i + 1}", "dev_model": _SENSOR_MODEL, "product_name": _SENSOR_PRODUCT} for i in range(cards)],
+        "display_mode": cards,
+    }
+
+    async def advertise(ctx):
+        for measure_id in range(1, 4):
+            advance(60)
+            _advertise_sensors(cards, measure_id)
+            await ctx.app.on_running_foreground()
+
+    async def clock_back(ctx):
+        # The clock is set back (e.g. by a time sync): the new record is older than the stored ones
+        clocktime.advance(-600)
+        _advertise_sensors(cards, 4)
+        await settle()
+        await ctx.app.on_running_foreground()
+        # The overlay (shown from two cards) must have been resampled to include that record
+        ui_history = sys.modules[ctx.app.__name__ + ".product.virtual_sensor.ui_history"]
+        if ui_history._overlay_ids and ui_history._times[0] > clocktime.now(): raise RuntimeError("overlay not reloaded")
+
+    steps = [
+        ("boot", _boot),
+        ("start", _lifecycle("on_start")),
+        ("advertise", advertise),
+        ("tick", _tick(60)),
+        ("key_right", _key("RIGHT", cards)),
+        ("key_left", _key("LEFT", cards)),
+        ("open_history", _key("ENTER")),
+        ("history_tick", _tick(60)),
+        ("next_history", _key("ENTER")),
+        ("clock_back", clock_back),
+        ("back_home", _key("ESC")),
+        ("stop", _lifecycle("on_stop")),
+    ]
+    return Scenario(f"sensor_app_{cards}", "sensor_app", config, steps)
+
+
+async def _reboot(ctx):
+    # Load the app again from scratch like after a power cycle, files written under /apps are kept
+    ctx.reload()
+    await ctx.app.on_boot(ctx.app_mgr)
+
+
+_NASDAQ_OPEN_NOW = 1741962600  # 2025-03-14 14:30 UTC, a Friday 10:30 in New York
+
+
+async def _boot_during_session(ctx):
+    # Stock View only refreshes while the exchange is open
+    clocktime.set_now(_NASDAQ_OPEN_NOW)
+    await _boot(ctx)
+
+
+def stock_view(symbols):
+    config = {"stocks": ",".join([f"SYM{i}:NASDAQ" for i in range(symbols)])}
+    steps = [
+        ("boot", _boot_during_session),
+        ("start", _lifecycle("on_start")),
+        ("first_fetch", _tick(1)),
+        ("idle_tick", _tick(30)),
+        ("key_down", _key("DOWN", symbols)),
+        ("refresh", _tick(900)),
+        ("market_close", _tick(6 * 3600)),
+        ("closed_tick", _tick(900)),
+        ("stop", _lifecycle("on_stop")),
+        ("restart", _lifecycle("on_start")),
+        ("stop_again", _lifecycle("on_stop")),
+        ("reboot", _reboot),
+        ("start_cached", _lifecycle("on_start")),
+        ("stop_cached", _lifecycle("on_stop")),
+    ]
+    return Scenario(f"stock_view_{symbols}", "stock_view", config, steps)
+
+
+def days_matter(events):
+    config = {
+        "event_list": [{"template_name": f"Event {i + 1}", "target_day": f"{2026 + i // 12}-{i % 12 + 1:02d}-15", "target_day_repeat": "0"} for i in range(events)],
+        "preset_target_date": [],
+        "style": "light",
+    }
+    steps = [
+        ("boot", _boot),
+        ("start", _lifecycle("on_start")),
+        ("key_down", _key("DOWN", min(events, 10))),
+        ("open_event", _key("ENTER")),
+        ("back_list", _key("ESC")),
+        ("tick", _tick(60)),
+        ("day_change", _tick(86400)),
+        ("stop", _lifecycle("on_stop")),
+    ]
+    return Scenario(f"days_matter_{events}", "Days Matter", config, steps)
+
+
+def calendar_view():
+    async def start(ctx):
+        await ctx.app.on_start()
+        # The calendar is not part of the input group by itself, keys are delivered to it by the system
+        ctx.focus(ctx.app._scr.get_child(2))
+
+    steps = [
+        ("boot", _boot),
+        ("start", start),
+        ("key_right", _key("RIGHT", 3)),
+        ("key_left", _key("LEFT", 3)),
+        ("tick", _tick(60)),
+        ("day_change", _tick(86400)),
+        ("stop", _lifecycle("on_stop")),
+    ]
+    return Scenario("calendar_view", "calendar_view", {"week_start_day": "Mon"}, steps)
+
+
+def pomodoro():
+    steps = [
+        ("boot", _boot),
+        ("start", _lifecycle("on_start")),
+        ("resume", _key("ENTER")),
+        ("tick", _tick(1)),
+        ("ticks_60", _tick(1, 60)),
+        ("pause", _key("ENTER")),
+        ("resume_again", _key("ENTER")),
+        ("session_end", _tick(25 * 60)),
+        ("stop", _lifecycle("on_stop")),
+    ]
+    return Scenario("pomodoro", "pomodoro", {}, steps)
+
+
+def all_scenarios():
+    return [
+        sensor_app(1), sensor_app(2), sensor_app(4),
+        stock_view(5), stock_view(20), stock_view(100),
+        days_matter(10), days_matter(100),
+        calendar_view(),
+        pomodoro(),
+    ]
@@ -0,0 +1,151 @@
+"""
+Load test of Stock View's real fetch path against the local quote server (stock_view/demo/quote_server.py).
+
+For every symbol count the app starts with an empty quote cache, shows its first fetch and is then
+refreshed several times; the prices move between refreshes unless --update-s is 0.
+
+    python bench/stock_load.py
+    python bench/stock_load.py --symbols 5,20,100 --latency-ms 150 --failure-rate 0.1 --compact
+
+Columns:
+    first ms      on_start until the first fetch is on screen
+    refresh ms    mean time of the following refreshes, split into fetch ms (get_stock_details)
+                  and render ms (refresh_stocks)
+    peak KiB      Python heap high-water mark of a refresh (measured in an extra, untimed refresh)
+    requests, conns, 304, failed
+                  counted by the server over the whole run (failed: 503 answers and dropped connections)
+    stale         symbols without a fresh quote after the last refresh
+"""
+import io
+import os
+import sys
+import time
+import asyncio
+import argparse
+import contextlib
+import tracemalloc
+import asyncio.selector_events
+
+import harness
+import lvgl
+
+sys.path.insert(0, os.path.join(harness.REPO_DIR, "stock_view", "demo"))
+from quote_server import QuoteServer  # noqa: E402
+
+# CPython's event loop receives into a new 256 KiB buffer on every socket read, which would dwarf the
+# app's own heap peak; the device reads in small pieces, so do the same here
+asyncio.selector_events._SelectorTransport.max_size = 4096
+
+
+def timed(func, totals, key):
+    """Wrap an async function so that its time (ms) is added to totals[key]."""
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            totals[key] += (time.perf_counter() - start) * 1000
+    return wrapper
+
+
+async def run_count(server, args, count):
+    exchanges = args.exchanges.split(",")
+    symbols = [f"SYM{i}:{exchanges[i % len(exchanges)]}" for i in range(count)]
+    lvgl.reset()
+    lvgl.reset_stats()
+
+    with harness.AppFiles("stock_view"), contextlib.redirect_stdout(io.StringIO()):
+        app = harness.load_app("stock_view")
+        service = app.service
+        service._STOCK_API_URL = server.url
+        service._USE_SIMULATED_DATA = False
+        service._USE_COMPACT_FORMAT = args.compact
+        service._USE_CONDITIONAL_REQUESTS = not args.no_etag
+        totals = {"fetch": 0.0, "render": 0.0}
+        app.get_stock_details = timed(app.get_stock_details, totals, "fetch")
+        app.refresh_stocks = timed(app.refresh_stocks, totals, "render")
+
+        await app.on_boot(harness.AppManager({"stocks": ",".join(symbols)}))
+        server.reset_stats()
+
+        # Empty cache: the list is built from the first fetch, which on_start runs in the background
+        start = time.perf_counter()
+        await app.on_start()
+        if app._refresh_task: await app._refresh_task
+        first_ms = (time.perf_counter() - start) * 1000
+
+        for key in totals: totals[key] = 0.0
+        start = time.perf_counter()
+        for _ in range(args.refreshes):
+            # Let the server's prices move (unless fixed) so that the refresh has something to show
+            if args.update_s: time.sleep(args.update_s)
+            await app.update_stocks()
+        refresh_ms = (time.perf_counter() - start) * 1000 - args.refreshes * args.update_s * 1000
+        fetch_ms, render_ms = totals["fetch"], totals["render"]
+
+        tracemalloc.start()
+        await app.update_stocks()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        details = app._stock_details
+        stale = len(symbols) - len(details) + len([x for x in details if x.get("stale", False) or x.get("currentPrice", None) is None])
+        stats = dict(server.stats)
+        await app.on_stop()
+
+    runs = max(1, args.refreshes)
+    return {
+        "symbols": count,
+        "first_ms": first_ms,
+        "refresh_ms": refresh_ms / runs,
+        "fetch_ms": fetch_ms / runs,
+        "render_ms": render_ms / runs,
+        "peak_kb": peak / 1024,
+        "stale": stale,
+        **stats,
+    }
+
+
+async def run(server, args):
+    return [await run_count(server, args, int(count)) for count in args.symbols.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test of Stock View against the local quote server")
+    parser.add_argument("--symbols", default="5,10,20,50,100", help="symbol counts to run (default 5,10,20,50,100)")
+    parser.add_argument("--exchanges", default="NASDAQ", help="exchange suffixes given to the symbols in turn (default NASDAQ)")
+    parser.add_argument("--refreshes", type=int, default=3, help="refreshes after the first fetch (default 3)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="server time per request (default 50)")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="random extra server time per request (default 20)")
+    parser.add_argument("--handshake-ms", type=float, default=100, help="setup time of a new connection (default 100)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="share of requests answered with 503 (default 0)")
+    parser.add_argument("--drop-rate", type=float, default=0, help="share of requests closed without answer (default 0)")
+    parser.add_argument("--missing-rate", type=float, default=0, help="share of symbols left out of answers (default 0)")
+    parser.add_argument("--max-symbols", type=int, default=0, help="most symbols the server accepts per request (default: no limit)")
+    parser.add_argument("--update-s", type=float, default=0.05, help="seconds between price moves, 0 for fixed prices / 304s (default 0.05)")
+    parser.add_argument("--compact", action="store_true", help="request the compact CSV format")
+    parser.add_argument("--no-etag", action="store_true", help="do not send If-None-Match")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of prices and failures (default 0)")
+    args = parser.parse_args(argv)
+
+    server = QuoteServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, handshake_ms=args.handshake_ms, failure_rate=args.failure_rate,
+                         drop_rate=args.drop_rate, missing_rate=args.missing_rate, max_symbols=args.max_symbols, update_s=args.update_s,
+                         seed=args.seed).start()
+    harness.install_micropython_shims()
+    try:
+        results = asyncio.run(run(server, args))
+    finally:
+        server.stop()
+
+    print(f"latency {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms, handshake {args.handshake_ms:.0f} ms, "
+          f"failures {args.failure_rate:.0%}, drops {args.drop_rate:.0%}, missing {args.missing_rate:.0%}, {args.refreshes} refreshes")
+    print(f"  {'symbols':>7}{'first ms':>10}{'refresh ms':>12}{'fetch ms':>10}{'render ms':>11}{'peak KiB':>10}"
+          f"{'requests':>10}{'conns':>7}{'304':>6}{'failed':>8}{'stale':>7}")
+    for r in results:
+        print(f"  {r['symbols']:>7}{r['first_ms']:>10.0f}{r['refresh_ms']:>12.0f}{r['fetch_ms']:>10.0f}{r['render_ms']:>11.1f}{r['peak_kb']:>10.1f}"
+              f"{r['requests']:>10}{r['connections']:>7}{r['not_modified']:>6}{r['failures'] + r['dropped']:>8}{r['stale']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Stand-in for aioble scanning.
+
+The benchmark queues advertisements with `advertise()`; a scan yields whatever is
+queued and ends as soon as the queue is empty, like a scan window that found nothing else.
+"""
+import asyncio
+
+_queue = []
+
+
+def reset():
+    _queue.clear()
+
+
+def advertise(name, addr, rssi, adv_data):
+    _queue.append(_ScanResult(name, addr, rssi, adv_data))
+
+
+class _Device:
+    def __init__(self, addr):
+        self.addr = addr
+
+
+class _ScanResult:
+    def __init__(self, name, addr, rssi, adv_data):
+        self._name = name
+        self.device = _Device(addr)
+        self.rssi = rssi
+        self.adv_data = adv_data
+
+    def name(self):
+        return self._name
+
+
+class scan:
+    def __init__(self, duration_ms=0, interval_us=0, window_us=0, active=False, filter_dup=False):
+        self._cancelled = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        if self._cancelled or not _queue: raise StopAsyncIteration
+        return _queue.pop(0)
+
+    async def cancel(self):
+        self._cancelled = True
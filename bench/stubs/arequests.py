@@ -0,0 +1,5 @@
+"""Stand-in for arequests: every request fails like an unreachable server, apps under benchmark use their simulated data."""
+
+
+async def request(method, url, **kwargs):
+    raise OSError("network disabled in benchmarks")
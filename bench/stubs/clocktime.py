@@ -0,0 +1,23 @@
+"""Stand-in for the device clock: a fixed, settable Unix epoch interpreted as local time."""
+import time
+
+_now = 1741948200  # 2025-03-14 10:30:00
+
+
+def set_now(epoch):
+    global _now
+    _now = epoch
+
+
+def advance(seconds):
+    global _now
+    _now += seconds
+
+
+def now():
+    return _now
+
+
+def datetime(epoch=None):
+    t = time.gmtime(_now if epoch is None else epoch)
+    return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, t.tm_wday, t.tm_yday)
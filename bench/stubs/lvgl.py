@@ -0,0 +1,357 @@
+"""
+Headless stand-in for the LVGL MicroPython binding used by the benchmark suite.
+
+Widgets only keep the state the apps read back (tree, text, flags, focus, event
+callbacks, background color).  Everything else is accepted and ignored.  Every
+object created or deleted and every style setter call is counted in STATS.
+"""
+
+STATS = {"created": 0, "deleted": 0, "style_calls": 0}
+
+_STYLE_METHODS = ("add_style", "remove_style", "remove_style_all")
+
+
+def reset_stats():
+    for key in STATS: STATS[key] = 0
+
+
+class _Enum:
+    """Namespace whose attributes are distinct, stable integers (lv.EVENT.KEY, lv.ALIGN.CENTER ...)."""
+
+    _next = 1
+
+    def __init__(self, name, **fixed):
+        self._name = name
+        self._values = dict(fixed)
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"): raise AttributeError(attr)
+        values = self.__dict__["_values"]
+        if attr not in values:
+            values[attr] = _Enum._next
+            _Enum._next += 1
+        return values[attr]
+
+
+class _Any:
+    """Accepts any attribute access or call and returns itself (spans, styles, series, cursors ...)."""
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"): raise AttributeError(attr)
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+class _Color:
+    def __init__(self, value):
+        self.value = value
+
+    def eq(self, other):
+        return isinstance(other, _Color) and other.value == self.value
+
+    def __eq__(self, other):
+        return self.eq(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class _Font:
+    def __init__(self, name):
+        self.name = name
+
+
+class _Event:
+    def __init__(self, code, target, key=None):
+        self._code = code
+        self._target = target
+        self._key = key
+
+    def get_code(self): return self._code
+    def get_key(self): return self._key
+    def get_target_obj(self): return self._target
+    def get_target(self): return self._target
+    def get_current_target_obj(self): return self._target
+    def get_layer(self): return _Any()
+    def get_draw_task(self): return _Any()
+    def get_param(self): return None
+    def stop_processing(self): pass
+
+
+EVENT = _Enum("EVENT", ALL=0)
+KEY = _Enum("KEY", UP=17, DOWN=18, RIGHT=19, LEFT=20, ESC=27, ENTER=10)
+PART = _Enum("PART", MAIN=0)
+STATE = _Enum("STATE", DEFAULT=0)
+ALIGN = _Enum("ALIGN")
+OPA = _Enum("OPA", TRANSP=0, COVER=255, _0=0, _70=178, _100=255)
+TEXT_ALIGN = _Enum("TEXT_ALIGN")
+TEXT_DECOR = _Enum("TEXT_DECOR")
+SCROLLBAR_MODE = _Enum("SCROLLBAR_MODE")
+SCROLL_SNAP = _Enum("SCROLL_SNAP")
+ANIM = _Enum("ANIM", OFF=0, ON=1)
+DIR = _Enum("DIR")
+PALETTE = _Enum("PALETTE")
+LAYOUT = _Enum("LAYOUT")
+FLEX_FLOW = _Enum("FLEX_FLOW")
+FLEX_ALIGN = _Enum("FLEX_ALIGN")
+BORDER_SIDE = _Enum("BORDER_SIDE")
+SYMBOL = _Enum("SYMBOL", UP="^", DOWN="v", PLAY=">", OK="ok", CLOSE="x")
+
+
+class obj:
+    FLAG = _Enum("FLAG")
+
+    def __init__(self, parent=None, *args):
+        STATS["created"] += 1
+        self._parent = parent
+        self._children = []
+        self._events = []
+        self._flags = set()
+        self._states = set()
+        self._text = ""
+        self._bg_color = _Color(0xFFFFFF)
+        self._deleted = False
+        if parent is not None: parent._children.append(self)
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"): raise AttributeError(attr)
+
+        def method(*args, **kwargs):
+            if attr.startswith("set_style_") or attr in _STYLE_METHODS: STATS["style_calls"] += 1
+            return None
+        return method
+
+    # Tree
+    def get_parent(self): return self._parent
+    def get_child_count(self): return len(self._children)
+    def get_child_cnt(self): return len(self._children)
+
+    def get_child(self, index):
+        try:
+            return self._children[index]
+        except IndexError:
+            return None
+
+    def get_index(self):
+        return self._parent._children.index(self) if self._parent else 0
+
+    def is_valid(self): return not self._deleted
+
+    def clean(self):
+        children, self._children = self._children, []
+        for child in children: child._destroy()
+
+    def delete(self):
+        if self._deleted: return
+        if self._parent is not None and self in self._parent._children: self._parent._children.remove(self)
+        self._destroy()
+
+    delete_async = delete
+    del_async = delete
+
+    def _destroy(self):
+        self.send_event(EVENT.DELETE)
+        for child in self._children: child._destroy()
+        self._children = []
+        self._deleted = True
+        _default_group.remove_obj(self)
+        STATS["deleted"] += 1
+
+    def move_foreground(self):
+        if self._parent is None: return
+        self._parent._children.remove(self)
+        self._parent._children.append(self)
+
+    def move_background(self):
+        if self._parent is None: return
+        self._parent._children.remove(self)
+        self._parent._children.insert(0, self)
+
+    # Events
+    def add_event_cb(self, cb, code, user_data=None):
+        self._events.append((cb, code))
+
+    def send_event(self, code, key=None):
+        for cb, filter_code in list(self._events):
+            if filter_code in (EVENT.ALL, code): cb(_Event(code, self, key))
+
+    # State read back by the apps
+    def set_text(self, text): self._text = text
+    def get_text(self): return self._text
+    def add_flag(self, flag): self._flags.add(flag)
+    def remove_flag(self, flag): self._flags.discard(flag)
+    def has_flag(self, flag): return flag in self._flags
+    def add_state(self, state): self._states.add(state)
+    def remove_state(self, state): self._states.discard(state)
+    def has_state(self, state): return state in self._states
+
+    def set_style_bg_color(self, color, selector=0):
+        STATS["style_calls"] += 1
+        self._bg_color = color
+
+    def get_style_bg_color(self, part=0): return self._bg_color
+
+
+class label(obj):
+    LONG = _Enum("LONG")
+
+
+class line(obj): pass
+class image(obj): pass
+class button(obj): pass
+class menu_cont(obj): pass
+
+
+class spangroup(obj):
+    def new_span(self): return _Any()
+
+
+class scale(obj):
+    MODE = _Enum("MODE")
+
+
+class chart(obj):
+    AXIS = _Enum("AXIS")
+    TYPE = _Enum("TYPE")
+
+    def add_series(self, color, axis): return _Any()
+    def add_cursor(self, color, direction): return _Any()
+    def get_pressed_point(self): return 0x7fffffff
+
+
+class menu(obj):
+    def set_page(self, page): pass
+
+
+class menu_page(obj):
+    def __init__(self, parent=None, title=None):
+        super().__init__(parent)
+
+
+class buttonmatrix(obj):
+    CTRL = _Enum("CTRL")
+
+    def has_button_ctrl(self, index, ctrl): return False
+
+
+class calendar(obj):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matrix = buttonmatrix(self)
+
+    @staticmethod
+    def set_week_starts_monday(on): pass
+
+    def get_btnmatrix(self): return self._matrix
+
+
+class group:
+    def __init__(self):
+        self._objs = []
+        self._focused = None
+        self._editing = False
+
+    def add_obj(self, target):
+        if target in self._objs: return
+        self._objs.append(target)
+        # Like lv_group_add_obj: the first object of an empty group gets the focus
+        if self._focused is None: self.focus_obj(target)
+
+    def remove_obj(self, target):
+        if target not in self._objs: return
+        self._objs.remove(target)
+        if self._focused is target: self._focused = self._objs[0] if self._objs else None
+
+    def remove_all_objs(self):
+        self._objs = []
+        self._focused = None
+
+    def focus_obj(self, target):
+        if target is self._focused: return
+        previous, self._focused = self._focused, target
+        if previous is not None: previous.send_event(EVENT.DEFOCUSED)
+        if target is not None: target.send_event(EVENT.FOCUSED)
+
+    def focus_next(self): self._move_focus(1)
+    def focus_prev(self): self._move_focus(-1)
+
+    def _move_focus(self, step):
+        if not self._objs: return
+        index = self._objs.index(self._focused) if self._focused in self._objs else -step
+        self.focus_obj(self._objs[(index + step) % len(self._objs)])
+
+    def get_focused(self): return self._focused
+    def set_editing(self, editing): self._editing = editing
+    def get_editing(self): return self._editing
+
+    def send_key(self, key):
+        """Deliver a keypad key like the LVGL keypad indev does: KEY, then CLICKED for ENTER."""
+        target = self._focused
+        if target is None: return
+        target.send_event(EVENT.KEY, key)
+        if key == KEY.ENTER and not target._deleted: target.send_event(EVENT.CLICKED)
+        elif not self._editing and key in (KEY.RIGHT, KEY.DOWN): self.focus_next()
+        elif not self._editing and key in (KEY.LEFT, KEY.UP): self.focus_prev()
+
+
+_default_group = group()
+_active_screen = None
+
+
+def reset():
+    """Forget the screen and input group state (between benchmark scenarios)."""
+    global _default_group, _active_screen
+    _default_group = group()
+    _active_screen = None
+
+
+def group_get_default(): return _default_group
+def group_focus_obj(target): _default_group.focus_obj(target)
+def group_remove_obj(target): _default_group.remove_obj(target)
+
+
+def screen_load(scr):
+    global _active_screen
+    _active_screen = scr
+
+
+scr_load = screen_load
+
+
+def screen_active(): return _active_screen
+def scr_act(): return _active_screen
+
+
+def color_hex(value): return _Color(value)
+def color_hex3(value): return _Color(((value >> 8) & 0xF) * 0x110000 + ((value >> 4) & 0xF) * 0x1100 + (value & 0xF) * 0x11)
+def palette_main(palette): return _Color(palette)
+
+
+class point_t:
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+
+
+class area_t:
+    def __init__(self):
+        self.x1 = self.y1 = self.x2 = self.y2 = 0
+
+
+def image_dsc_t(info): return _Any()
+def draw_rect_dsc_t(): return _Any()
+def draw_rect(layer, dsc, area): pass
+def binfont_create(path): return _Font(path)
+def binfont_destroy(font): pass
+
+draw_dsc_base_t = _Any()
+draw_label_dsc_t = _Any()
+draw_fill_dsc_t = _Any()
+
+
+def __getattr__(name):
+    # Fonts are referenced as module attributes (lv.font_ascii_22 ...)
+    if name.startswith("font_"): return _Font(name)
+    raise AttributeError(name)
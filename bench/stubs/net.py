@@ -0,0 +1,5 @@
+"""Stand-in for the network status module: always connected."""
+
+
+def connected():
+    return True
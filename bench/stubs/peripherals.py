@@ -0,0 +1,24 @@
+"""Headless stand-in for the device peripherals module (screen, buzzer)."""
+
+
+class _Screen:
+    screen_resolution = (320, 240)
+
+    def __init__(self):
+        self._brightness = 100
+
+    def brightness(self, value=None):
+        if value is None: return self._brightness
+        self._brightness = value
+
+
+class _Buzzer:
+    enabled = False
+
+    def acquire(self): pass
+    def release(self): pass
+    def set_volume(self, volume): pass
+
+
+screen = _Screen()
+buzzer = _Buzzer()
@@ -0,0 +1,5 @@
+"""Stand-in for picoweb: only what the app route modules reference at import time."""
+
+
+async def start_response(writer, content_type="text/html", status="200", headers=None):
+    pass
@@ -0,0 +1,12 @@
+"""Stand-in for the system settings module."""
+
+_temp_unit = 1  # 1: Celsius, 0: Fahrenheit
+_hour24 = True
+
+
+def temp_unit():
+    return _temp_unit
+
+
+def hour24():
+    return _hour24
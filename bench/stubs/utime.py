@@ -0,0 +1,10 @@
+"""Stand-in for MicroPython utime: mktime counts seconds from 2000-01-01 like the device port."""
+import calendar
+
+_SECONDS_FROM_1970_TO_2000 = 946684800
+
+
+def mktime(time_tuple):
+    year, month, day, hour, minute, second = time_tuple[:6]
+    # mktime normalises out of range fields (e.g. hour 24), timegm does the same arithmetic
+    return calendar.timegm((year, month, day, 0, 0, 0)) + hour * 3600 + minute * 60 + second - _SECONDS_FROM_1970_TO_2000
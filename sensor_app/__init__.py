@@ -1,5 +1,6 @@
 from . import base
 from . import routes
+from . import profiler
 
 NAME = "Sensor App"
 CAN_BE_AUTO_SWITCHED = True  # Indicates if the app can be auto-switched
@@ -13,10 +14,12 @@ def get_settings_json():
         }]
     }
 
+@profiler.profile("on_start")
 async def on_start():
     """Initialize the screen and load the UI when the app starts."""
     await base.on_start()
 
+@profiler.profile("on_stop")
 async def on_stop():
     """Clean up the screen and leave the app when it stops."""
     await base.on_stop()
@@ -29,5 +32,6 @@ async def on_boot(apm):
 async def on_running_foreground():
     """
     Handle actions when the app is running in the foreground.
+    Not profiled as a whole: the pages pause at the end of their updates, they profile the update itself.
     """
     await base.on_running_foreground()
@@ -1,3 +1,4 @@
+import time
 import asyncio
 import lvgl as lv
 from . import product
@@ -9,12 +10,17 @@ _PAGE_HISTORY = 1    # History data page
 _PAGE_DETAILS = 2    # Device details page
 _PAGE_TIPS = 3        # Tip page
 _MAX_SELECTABLE = 8  # Maximum selectable count
+_SCAN_JOB_TTL = 60000  # Time (ms) a finished scan job stays available for polling
+_SCAN_DURATION = 5000  # Time (ms) of a nearby sensor scan
+_SCAN_JOB_TIMEOUT = _SCAN_DURATION + 3000  # Time (ms) after which a scan job is finished with the sensors found so far
 
 _scr = None             # Initialize screen variable
 _app_mgr = None         # Initialize app manager variable
 _product_registry = {}  # Store product models information
 _curr_page = _PAGE_HOME  # Current displayed page
 _customize_font = {}    # Custom font handles
+_scan_jobs = {}         # {job_id: {"product_name": ..., "running": bool, "timed_out": bool, "finished": ticks_ms}}
+_scan_job_seq = 0       # Last issued scan job ID
 
 def load_font():
     """Load custom binary fonts."""
@@ -69,10 +75,58 @@ async def search_nearby_sensors(product_name, dev_model=None):
     if hasattr(p_model, "get_gap_name_callbacks"):
         bluetooth.set_gap_name_callbacks(p_model.get_gap_name_callbacks())
 
-    await bluetooth.start_scan(5000, 1)
+    await bluetooth.start_scan(_SCAN_DURATION, 1)
     await bluetooth.wait_scan_complete()
     return p_model.get_sensor_found(dev_model)
 
+async def run_scan_job(job_id):
+    """Run the scan of a job in the background and mark it finished, at the latest after _SCAN_JOB_TIMEOUT."""
+    job = _scan_jobs[job_id]
+    try:
+        await asyncio.wait_for(search_nearby_sensors(job["product_name"]), _SCAN_JOB_TIMEOUT / 1000)
+    except asyncio.TimeoutError:
+        # The scan did not report back, e.g. the app's continuous scan was already running and
+        # only completes when the app stops: the sensors found meanwhile are the result
+        job["timed_out"] = True
+    except Exception as e:
+        print(f"scan job failed: {str(e)}")
+    job["running"] = False
+    job["finished"] = time.ticks_ms()
+
+def start_scan_job(product_name):
+    """
+    Start a background scan for a product and return its job ID.
+    A scan already running for the same product is reused instead of starting another one.
+    Returns None if the product does not support scanning.
+    """
+    global _scan_job_seq
+    p_model = _product_registry.get(product_name, None)
+    if not p_model or not hasattr(p_model, "get_sensor_found"): return None
+
+    # Drop finished jobs nobody polled for a while
+    now = time.ticks_ms()
+    for job_id in [k for k, v in _scan_jobs.items() if not v["running"] and time.ticks_diff(now, v["finished"]) > _SCAN_JOB_TTL]:
+        del _scan_jobs[job_id]
+
+    for job_id, job in _scan_jobs.items():
+        if job["running"] and job["product_name"] == product_name: return job_id
+
+    _scan_job_seq += 1
+    job_id = str(_scan_job_seq)
+    _scan_jobs[job_id] = {"product_name": product_name, "running": True, "timed_out": False, "finished": 0}
+    asyncio.create_task(run_scan_job(job_id))
+    return job_id
+
+def get_scan_job(job_id, dev_model=None):
+    """
+    Return the progress of a scan job: {"running": bool, "timedOut": bool, "sensors": sensors found so far},
+    or None if the job is unknown.
+    """
+    job = _scan_jobs.get(job_id, None)
+    if not job: return None
+    p_model = _product_registry[job["product_name"]]
+    return {"running": job["running"], "timedOut": job["timed_out"], "sensors": p_model.get_sensor_found(dev_model)}
+
 def get_page_module(page=None):
     """Return the UI page module based on page index."""
     if page is None: page = _curr_page
@@ -0,0 +1,175 @@
+# Module: display formatting shared by the pages and product modules
+import settings
+import clocktime
+
+TEMP_UNIT_FAHRENHEIT = 0 # settings.temp_unit() value for Fahrenheit
+TEMP_UNIT_CELSIUS = 1    # settings.temp_unit() value for Celsius
+TEMP_SYMBOLS = ("°F", "°C") # Temperature symbol, indexed by unit
+
+_TEMP_CACHE_SIZE = 16 # Number of recently formatted temperatures kept
+_TIME_CACHE_SIZE = 16 # Number of recently formatted minutes kept
+_NO_DATETIME = "-/-/- -:-" # Placeholder for a missing timestamp
+
+# Elapsed time labels, indexed by minutes [0-59] and hours [0-23]
+_MINUTE_TEXT = ("<1m",) + tuple(f"{m}m" for m in range(1, 60))
+_HOUR_TEXT = ("<1h",) + tuple(f"{h}h" for h in range(1, 24))
+
+_temp_cache = {}      # {(centi-degrees, unit): text}
+_temp_cache_keys = [] # Keys of _temp_cache, least recently used first
+_time_cache = {}      # {(epoch minute, hour24): text}
+_time_cache_keys = [] # Keys of _time_cache, oldest first
+_day_start = None     # Epoch of the local midnight of the cached day
+_day_date = None      # (year, month, day) of the cached day
+_utc_offset = None    # UTC offset (seconds, modulo a day) the cached day and texts were computed with
+_offset_minute = None # Clock minute of the last UTC offset check
+
+def temp_unit():
+    """
+    Return the temperature unit from settings.
+    Read it once per render and pass it down rather than once per value.
+    """
+    return TEMP_UNIT_CELSIUS if settings.temp_unit() == TEMP_UNIT_CELSIUS else TEMP_UNIT_FAHRENHEIT
+
+def trunc_div(a, b):
+    """Integer division rounding toward zero, like int(a / b) for a positive b."""
+    return a // b if a >= 0 else -(-a // b)
+
+def to_display_centi(centi, unit):
+    """
+    Convert centi-degrees Celsius to centi-degrees of the display unit, in integers only.
+    Truncates like int(celsius2Fahrenheit(centi / 100) * 100).
+    """
+    if unit == TEMP_UNIT_CELSIUS: return centi
+    # F * 100 = (C * 100) * 9 / 5 + 3200
+    return trunc_div(centi * 9 + 16000, 5)
+
+def tenths_text(tenths):
+    """Format a value in tenths with one decimal, e.g. -5 -> "-0.5"."""
+    sign = "-" if tenths < 0 else ""
+    if tenths < 0: tenths = -tenths
+    return f"{sign}{tenths // 10}.{tenths % 10}"
+
+def format_temperature(centi, unit):
+    """
+    Format centi-degrees Celsius in the display unit with one decimal, e.g. 2356 -> "23.5".
+    Recently formatted values are served from a small LRU cache.
+    """
+    key = (centi, unit)
+    text = _temp_cache.get(key, None)
+    if text is not None:
+        # Move the key to the most recently used end
+        if _temp_cache_keys[-1] != key:
+            _temp_cache_keys.remove(key)
+            _temp_cache_keys.append(key)
+        return text
+
+    text = tenths_text(trunc_div(to_display_centi(centi, unit), 10))
+    if len(_temp_cache_keys) >= _TEMP_CACHE_SIZE:
+        del _temp_cache[_temp_cache_keys.pop(0)]
+    _temp_cache[key] = text
+    _temp_cache_keys.append(key)
+    return text
+
+def format_temperature_delta(curr_centi, last_centi, unit):
+    """
+    Format the difference between two centi-degree Celsius values in the display unit,
+    always signed, e.g. "+0.5" or "-1.2".
+    """
+    diff = to_display_centi(curr_centi, unit) - to_display_centi(last_centi, unit)
+    text = tenths_text(trunc_div(diff, 10))
+    return text if text.startswith("-") else "+" + text
+
+def format_elapsed(seconds):
+    """
+    Format an elapsed duration as "<1m", "5m", "3h" or "2d".
+    Returns None for a negative duration.
+    """
+    if seconds < 0: return None
+    if seconds < 3600: return _MINUTE_TEXT[seconds // 60]
+    if seconds < 86400: return _HOUR_TEXT[seconds // 3600]
+    return f"{seconds // 86400}d"
+
+def hour24():
+    """
+    Return True if times are displayed in 24-hour format.
+    Read it once per batch of timestamps and pass it down.
+    """
+    return settings.hour24()
+
+def check_utc_offset():
+    """
+    Read the UTC offset of local time again, at most once per minute of the clock.
+    When it changed (timezone setting, daylight saving time), the cached day and the
+    formatted times are dropped since they were computed with the previous offset.
+    """
+    global _utc_offset, _offset_minute, _day_start, _day_date
+    now = clocktime.now()
+    if now // 60 == _offset_minute: return
+    _offset_minute = now // 60
+    tm = clocktime.datetime(now)
+    # Local time of day minus UTC time of day: every real offset is less than a day
+    offset = (tm[3] * 3600 + tm[4] * 60 + tm[5] - now) % 86400
+    if offset == _utc_offset: return
+    _utc_offset = offset
+    _day_start = _day_date = None
+    _time_cache.clear()
+    del _time_cache_keys[:]
+
+def local_time(epoch):
+    """
+    Return (year, month, day, hour, minute) of an epoch in local time.
+    The date of the last day seen is cached, so timestamps of that day are broken
+    down with integer arithmetic instead of a clocktime.datetime call each.
+    The cache follows changes of the UTC offset within a minute (check_utc_offset),
+    but timestamps on the other side of a daylight saving change of the cached day use the current offset.
+    """
+    global _day_start, _day_date
+    check_utc_offset()
+    if _day_start is not None and 0 <= epoch - _day_start < 86400:
+        offset = epoch - _day_start
+        return _day_date + (offset // 3600, offset % 3600 // 60)
+
+    tm = clocktime.datetime(epoch)
+    _day_start = epoch - tm[3] * 3600 - tm[4] * 60 - tm[5]
+    _day_date = (tm[0], tm[1], tm[2])
+    return _day_date + (tm[3], tm[4])
+
+def format_datetime(epoch, is_hour24):
+    """
+    Format an epoch as "MM/DD/YYYY HH:MM" (24-hour) or "MM/DD/YYYY H:MM PM" (12-hour),
+    or a placeholder if epoch is None. Results are memoized per minute.
+    """
+    if epoch is None: return _NO_DATETIME
+
+    check_utc_offset()
+    key = (epoch // 60, is_hour24)
+    text = _time_cache.get(key, None)
+    if text is not None: return text
+
+    tm = local_time(epoch)
+    # Decide whether to use 12-hour format based on settings
+    if not is_hour24:
+        if tm[3] < 12:
+            hour = str(tm[3])
+            time_tip = ""
+        elif tm[3] == 12:
+            hour = str(tm[3])
+            time_tip = " PM"
+        else:
+            hour = str(tm[3] - 12)
+            time_tip = " PM"
+    else:
+        time_tip = ""
+        hour = f"{tm[3]:02d}"
+    text = f"{tm[1]:02d}/{tm[2]:02d}/{tm[0]} {hour}:{tm[4]:02d}{time_tip}" #"10/03/2024 15:59"
+
+    if len(_time_cache_keys) >= _TIME_CACHE_SIZE:
+        del _time_cache[_time_cache_keys.pop(0)]
+    _time_cache[key] = text
+    _time_cache_keys.append(key)
+    return text
+
+def format_clock(epoch):
+    """Format an epoch as a 24-hour "HH:MM" time of day."""
+    tm = local_time(epoch)
+    return f"{tm[3]:02d}:{tm[4]:02d}"
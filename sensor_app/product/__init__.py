@@ -1,12 +1,20 @@
-from . import virtual_sensor
+_product_registry = None # Cached mapping of product names to their modules
 
 def get_product_registry():
     """
     Get a mapping of product names to their corresponding modules.
+    The registry is built on first use and shared afterwards.
     """
+    global _product_registry
+    if _product_registry is not None: return _product_registry
+
+    # Product packages are imported on first use rather than at app import
+    from . import virtual_sensor
+
     product_registry = {}
 
     # Register virtual sensor product
     product_registry[virtual_sensor.get_product_name()] = virtual_sensor
 
-    return product_registry
+    _product_registry = product_registry
+    return _product_registry
@@ -1,8 +1,5 @@
-from .ui_home import show_card
 from .config import getProfile, get_sensor_models
-from .ui_details import show_details, update_details
-from .ui_history import reset_history_info, refresh_history, show_history
-from .data_storage import get_live_info, get_record_info, load_sensor_history_data, remove_live_info, clear_cache
+from .data_storage import get_live_info, get_record_info, load_sensor_history_data, remove_live_info, clear_cache, get_sensor_history_raw, get_history_layout, read_sensor_history_file
 from .ble_broadcast import on_ble_broadcast, set_active_state_callback, sync_selected_device, get_sensor_found
 
 _PRODUCT_NAME = "Virtual Sensor" # Product name constant
@@ -24,7 +21,57 @@ def get_sensor_data(sensor_id):
     # Return the live information for a given sensor ID
     return get_live_info(sensor_id)
 
+def get_history_raw(sensor_id):
+    # Return the packed history records for a given sensor ID
+    return get_sensor_history_raw(sensor_id)
+
+def read_history(sensor_id, start=None, end=None, step=0):
+    # Return a generator of packed history records read from flash for a given sensor ID
+    return read_sensor_history_file(sensor_id, start, end, step)
+
 def delete_sensor_data(sensor_id):
     # Clear the cache for a given sensor ID
     remove_live_info(sensor_id)
     clear_cache(sensor_id)
+
+# UI modules are only imported once a page actually needs them
+
+def show_card(parent, s_info, card_type):
+    # Display the sensor card, returns a coroutine
+    from .ui_home import show_card as _show_card
+    return _show_card(parent, s_info, card_type)
+
+def show_details(parent, sensor_info):
+    # Display the sensor details
+    from .ui_details import show_details as _show_details
+    return _show_details(parent, sensor_info)
+
+def update_details(sensor_info):
+    # Update the sensor details
+    from .ui_details import update_details as _update_details
+    return _update_details(sensor_info)
+
+def reset_details_info():
+    # Reset the details page state, returns a coroutine
+    from .ui_details import reset_details_info as _reset_details_info
+    return _reset_details_info()
+
+def show_history(parent, sensor_id, model_code, calibration=None):
+    # Display the sensor history
+    from .ui_history import show_history as _show_history
+    return _show_history(parent, sensor_id, model_code, calibration)
+
+def refresh_history(sensor_id, calibration=None, refresh_all=False):
+    # Refresh the sensor history
+    from .ui_history import refresh_history as _refresh_history
+    return _refresh_history(sensor_id, calibration, refresh_all)
+
+def prefetch_history(sensor_id):
+    # Prepare the sensor history ahead of opening it, returns a coroutine
+    from .ui_history import prefetch_history as _prefetch_history
+    return _prefetch_history(sensor_id)
+
+def reset_history_info():
+    # Reset the history page state, returns a coroutine
+    from .ui_history import reset_history_info as _reset_history_info
+    return _reset_history_info()
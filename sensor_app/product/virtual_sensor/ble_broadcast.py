@@ -16,6 +16,10 @@ def sync_selected_device(devs):
     global _selected_sensors
     _selected_sensors = devs
 
+def get_selected_sensors():
+    # Get the selected sensor IDs, in the order of the home page cards
+    return _selected_sensors
+
 def set_active_state_callback(cb):
     # Set the callback function for displaying the active effect
     global _display_active_effect_cb
@@ -10,14 +10,23 @@ _STRUCT_INFO = {
     "length": 7, # Length of the sensor data structure
     "struct":[("timestamp", "I"), ("measure_id", "B"), ("temperature", "h")] # Structure of the sensor data
 }
+# Little-endian packing format of a single record, see set_sensor_history_data
+_STRUCT_FMT = "<" + "".join([i[1] for i in _STRUCT_INFO["struct"]])
 
 _live_info = {} # Dictionary to store live sensor information
 _record_info = {} # Dictionary to store last record information
 _history_data = {} # Dictionary to store history data
+_live_info_cb = None # Callback notified with the sensor ID whenever its live information is updated
+
+def set_live_info_callback(cb):
+    # Set the callback notified when live sensor information is updated
+    global _live_info_cb
+    _live_info_cb = cb
 
 def set_live_info(sensor_id, info):
     # Update live sensor information
     _live_info[sensor_id] = info
+    if _live_info_cb: _live_info_cb(sensor_id)
 
 def get_live_info(sensor_id):
     # Get live sensor information
@@ -72,6 +81,15 @@ def set_sensor_history_data(sensor_id, s_info):
     # Update record data
     set_record_info(sensor_id, record_data, True)
 
+def iter_sensor_history_data(sensor_id):
+    # Yield the history records of a sensor one at a time, oldest first
+    byte_datas = _history_data.get(sensor_id, {}).get("data", b"")
+    length = _STRUCT_INFO["length"]
+    for off in range(0, len(byte_datas) - length + 1, length):
+        # Parse single measurement data
+        info = struct.unpack_from(_STRUCT_FMT, byte_datas, off)
+        yield {_STRUCT_INFO["struct"][i][0]: info[i] for i in range(len(info))}
+
 def get_sensor_history_data(sensor_id=None):
     # Get history data for one or all sensors
     res = {}
@@ -81,17 +99,102 @@ def get_sensor_history_data(sensor_id=None):
 
     for s_id, s_info in data_source.items():
         if not s_info: continue
-        res[s_id] = []
-        fmt = "<" + "".join([i[1] for i in _STRUCT_INFO["struct"]])
-        byte_datas = s_info["data"]
-        while byte_datas:
-            # Parse single measurement data
-            info = struct.unpack(fmt, byte_datas[: _STRUCT_INFO["length"]])
-            res[s_id].append({_STRUCT_INFO["struct"][i][0]: info[i] for i in range(len(info))})
-            byte_datas = byte_datas[_STRUCT_INFO["length"]:]
+        res[s_id] = list(iter_sensor_history_data(s_id))
+
+    return res
 
+def get_sensor_history_count(sensor_id):
+    # Get the number of history records of a sensor
+    return len(_history_data.get(sensor_id, {}).get("data", b"")) // _STRUCT_INFO["length"]
+
+def merge_sensor_history(sensor_ids, field, bucket, max_buckets):
+    # Resample the history of several sensors onto a common time axis of `bucket` seconds, covering at most the last max_buckets buckets.
+    # Each sensor's packed records are walked once, the values falling into the same bucket are averaged.
+    # Returns {"timestamp": [bucket start, ...], sensor_id: [value or None, ...], ...}
+    length = _STRUCT_INFO["length"]
+    index = [i[0] for i in _STRUCT_INFO["struct"]].index(field)
+    buckets = {} # {sensor_id: {bucket number: [sum, count]}}
+    first = last = None
+    for s_id in sensor_ids:
+        data = _history_data.get(s_id, {}).get("data", b"")
+        if len(data) < length: continue
+        sums = buckets[s_id] = {}
+        # Records are appended in arrival order, which is not chronological when the clock was set back:
+        # the axis bounds (oldest and newest bucket of all records) are found in the same pass that sums the values
+        for off in range(0, len(data) - length + 1, length):
+            record = struct.unpack_from(_STRUCT_FMT, data, off)
+            b = record[0] // bucket
+            if first is None or b < first: first = b
+            if last is None or b > last: last = b
+            acc = sums.get(b, None)
+            if acc is None: sums[b] = [record[index], 1]
+            else:
+                acc[0] += record[index]
+                acc[1] += 1
+    if not buckets: return {}
+
+    start = max(first, last - max_buckets + 1)
+    cnt = last - start + 1
+    res = {"timestamp": [(start + i) * bucket for i in range(cnt)]}
+    for s_id, sums in buckets.items():
+        values = [None] * cnt
+        for b, acc in sums.items():
+            if b >= start: values[b - start] = acc[0] // acc[1]
+        res[s_id] = values
     return res
 
+def get_history_layout():
+    # Get the field names, packing format and length of a single history record
+    return {
+        "fields": [i[0] for i in _STRUCT_INFO["struct"]],
+        "format": _STRUCT_FMT,
+        "length": _STRUCT_INFO["length"],
+    }
+
+def get_sensor_history_raw(sensor_id):
+    # Get the packed history records of a sensor without decoding them
+    s_info = _history_data.get(sensor_id, {})
+    if not s_info: return {}
+    res = get_history_layout()
+    res["data"] = s_info["data"]
+    return res
+
+def read_sensor_history_file(sensor_id, start=None, end=None, step=0, chunk_records=32):
+    # Yield packed records from the sensor's history file, a chunk at a time.
+    # Records are kept if start <= timestamp <= end, and at most one record is kept per `step` seconds.
+    # Only the timestamp of each record is unpacked, the records themselves are passed through as stored.
+    length = _STRUCT_INFO["length"]
+    try:
+        f = open(f"{_HISTORY_PATH}/{sensor_id}.data", "rb")
+    except OSError:
+        return
+
+    with f:
+        # Skip the leading model byte
+        if not f.read(1): return
+        buff = bytearray(length * chunk_records)
+        last_ts = None
+        while True:
+            size = f.readinto(buff)
+            if not size: break
+
+            out = bytearray()
+            for off in range(0, size - size % length, length):
+                # The timestamp is the first field of every record.
+                # Records are stored in arrival order, which is not chronological after the clock was set back:
+                # every record is checked on its own
+                ts = struct.unpack_from("<I", buff, off)[0]
+                if start is not None and ts < start: continue
+                if end is not None and ts > end: continue
+                # Time went backwards: the thinning starts again from this record
+                if last_ts is not None and ts < last_ts: last_ts = None
+                if step and last_ts is not None and ts - last_ts < step: continue
+                last_ts = ts
+                out.extend(buff[off:off + length])
+
+            if out: yield bytes(out)
+            if size < len(buff): break
+
 def clear_sensor_history_data(sensor_id):
     # Remove all history data for a sensor
     if sensor_id in _history_data: del _history_data[sensor_id]
@@ -1,57 +1,51 @@
-import settings
-import clocktime
 import lvgl as lv
 from . import config
 from . import data_storage
+from ... import formatter
 
 _title = None
 _parent = None
 _sensor_id = None
 _cur_details = {}
+_rows = {}     # {row name: [content label, alignment anchor, displayed text]}
+_dirty = False # Set when the live info of the displayed sensor has changed
+
+def get_live_values(live_info):
+    # Values of the rows that follow the live info of the sensor
+    return {
+        "Probe": lv.SYMBOL.OK if live_info.get("probe_state", 1) == 1 else lv.SYMBOL.CLOSE,
+        "Battery": f"{live_info.get('battery_percentage', '-')}%",
+        "Signal": f"{live_info.get('rssi', '-')} dBm",
+        "LastSeen": formatter.format_datetime(live_info.get("timestamp", None), formatter.hour24()),
+    }
 
 def sync_details_info(info):
     # Get the model code from the device info
     model_code = info.get("dev_model", None)
     profile = config.getProfile(model_code)
-    live_info = data_storage.get_live_info(_sensor_id)
+    live_values = get_live_values(data_storage.get_live_info(_sensor_id))
 
     details_info = {}
     details_info["title"] = info.get("nickname", "")
     details_info["options"] = []
     details_info["options"].append(["SN", _sensor_id])
     details_info["options"].append(["Model", profile.get("model", "-")])
-    details_info["options"].append(["Probe", lv.SYMBOL.OK if live_info.get("probe_state", 1) == 1 else lv.SYMBOL.CLOSE])
-    details_info["options"].append(["Battery", f"{live_info.get('battery_percentage', '-')}%"])
-    details_info["options"].append(["Signal", f"{live_info.get("rssi", "-")} dBm"])
+    details_info["options"].append(["Probe", live_values["Probe"]])
+    details_info["options"].append(["Battery", live_values["Battery"]])
+    details_info["options"].append(["Signal", live_values["Signal"]])
     details_info["options"].append(["Product", info.get("product_name", "-")])
-
-    epoch = live_info.get("timestamp", None)
-    if epoch is None:
-        lastseen = "-/-/- -:-"
-    else:
-        tm = clocktime.datetime(epoch)
-        # Decide whether to display 12-hour or 24-hour time based on settings
-        if not settings.hour24():
-            if tm[3] < 12:
-                hour = str(tm[3])
-                time_tip = ""
-            elif tm[3] == 12:
-                hour = str(tm[3])
-                time_tip = " PM"
-            else:
-                hour = str(tm[3] - 12)
-                time_tip = " PM"
-        else:
-            time_tip = ""
-            hour = f"{tm[3]:02d}"
-        minute = f"{tm[4]:02d}"
-        lastseen = "%s/%s/%d %s:%s%s" % (f"{tm[1]:02d}", f"{tm[2]:02d}", tm[0], hour, minute, time_tip)
-    details_info["options"].append(["LastSeen", lastseen])
+    details_info["options"].append(["LastSeen", live_values["LastSeen"]])
 
     return details_info
 
+def on_live_info(sensor_id):
+    # Live info change notification from data_storage, only mark the rows for the next update
+    global _dirty
+    if sensor_id == _sensor_id: _dirty = True
+
 def show_one_data(parent, last_obj, name, content, is_last=False):
     # Display a single row of sensor detail (name and value)
+    # Returns the object to align the next row to and the content label
     title_label = lv.label(parent)
     title_label.set_text(name + ":")
     title_label.set_style_text_font(lv.font_ascii_18, 0)
@@ -71,7 +65,7 @@ def show_one_data(parent, last_obj, name, content, is_last=False):
     content_label.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
 
     # Draw a separator line unless this is the last data row
-    if is_last: return title_label
+    if is_last: return title_label, content_label
     else:
         line_points = [{"x": 0, "y": 0}, {"x": 320, "y": 0}]
         line = lv.line(parent)
@@ -79,28 +73,32 @@ def show_one_data(parent, last_obj, name, content, is_last=False):
         line.align_to(title_label, lv.ALIGN.OUT_BOTTOM_LEFT, -10, 6)
         line.set_style_line_width(2, 0)
         line.set_style_line_color(lv.color_hex(0xBBBBBB), 0)
-        return line
+        return line, content_label
 
 def update_details(sensor_info):
-    global _cur_details
-    tmp_details = sync_details_info(sensor_info)
-    # Update only the changed fields in the UI
-    for index, data in enumerate(_cur_details["options"]):
-        if _cur_details["options"][index][1] == tmp_details["options"][index][1]: continue
-        obj = _parent.get_child((index + 1) * 3)
-        last_obj = _parent.get_child((index + 1) * 3 - 2) if (index + 1) * 3 - 2 >= 0 else None
-        obj.set_text(tmp_details["options"][index][1])
-        if last_obj is None: obj.align(lv.ALIGN.TOP_RIGHT, -10, 6)
-        else: obj.align_to(last_obj, lv.ALIGN.OUT_BOTTOM_RIGHT, -10, 6)
-
-    _cur_details = tmp_details
+    global _dirty
+    # Nothing to do until the live info of this sensor changes
+    if not _dirty: return
+    _dirty = False
+
+    # Only the live rows can change, and only labels whose text differs are touched
+    for name, text in get_live_values(data_storage.get_live_info(_sensor_id)).items():
+        row = _rows.get(name, None)
+        if not row or row[2] == text: continue
+        row[0].set_text(text)
+        if row[1] is None: row[0].align(lv.ALIGN.TOP_RIGHT, -10, 6)
+        else: row[0].align_to(row[1], lv.ALIGN.OUT_BOTTOM_RIGHT, -10, 6)
+        row[2] = text
 
 def show_details(parent, sensor_info):
-    global _parent, _sensor_id, _title, _cur_details
+    global _parent, _sensor_id, _title, _cur_details, _rows, _dirty
     _parent = parent
     _sensor_id = sensor_info.get("sensor_id", None)
 
     _cur_details = sync_details_info(sensor_info)
+    _rows = {}
+    _dirty = False
+    data_storage.set_live_info_callback(on_live_info)
 
     if _parent: _parent.clean()
     try:
@@ -123,9 +121,22 @@ def show_details(parent, sensor_info):
 
         last_obj = line
         last_index = len(_cur_details["options"]) - 1
-        # Display each sensor detail row
+        # Display each sensor detail row once, later updates only change the content labels
         for index, data in enumerate(_cur_details["options"]):
-            last_obj = show_one_data(_parent, last_obj, data[0], data[1], index == last_index)
+            anchor = last_obj
+            last_obj, content_label = show_one_data(_parent, last_obj, data[0], data[1], index == last_index)
+            _rows[data[0]] = [content_label, anchor, data[1]]
 
     except Exception as e:
         print(f"show_details error: {str(e)}")
+
+async def reset_details_info():
+    # Stop listening to live info and drop the row references
+    global _title, _parent, _sensor_id, _cur_details, _rows, _dirty
+    data_storage.set_live_info_callback(None)
+    _title = None
+    _parent = None
+    _sensor_id = None
+    _cur_details = {}
+    _rows = {}
+    _dirty = False
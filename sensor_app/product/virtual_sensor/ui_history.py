@@ -1,17 +1,32 @@
 import asyncio
-import settings
-import clocktime
 import lvgl as lv
+from array import array
 from . import config
 from . import data_storage
+from . import ble_broadcast
+from ... import formatter
+from ... import profiler
 from micropython import const
 
 _PTS_DO_SHIFT_ONLY = 50 # If the number of points exceeds N, only shift the chart, do not redraw
 _LV_CHART_POINT_NONE = 0x7fffffff
 _ENABLE_SHOW_ATTACH = ["temperature"] # Allowed measurement data types to display
+_OVERLAY_PALETTE = (lv.PALETTE.RED, lv.PALETTE.BLUE, lv.PALETTE.GREEN, lv.PALETTE.AMBER) # Series colors of the overlay chart, also its sensor limit
+_OVERLAY_TITLE = {"temperature": "Temperature Compare"} # Overlay chart title per measurement data type
 
 _p_cnt = 0 # Total number of points in the current chart
 _p_index = 0 # The position where a new point is inserted in the current chart
+_p_cap = 0 # Capacity of the preallocated point buffer
+_points = None # Preallocated point buffer bound to the series (display unit), used as a ring once full
+_times = None # Timestamps of the points, same layout as _points
+_last_ts = None # Timestamp of the newest point on the chart
+_v_min = None # Smallest point currently on the chart
+_v_max = None # Largest point currently on the chart
+_y_range = None # Y axis range currently applied to the chart
+_y_axis_text = [] # Save Y-axis text
+_overlay_ids = () # Sensors plotted by the overlay chart, empty when a single sensor is displayed
+_overlay_series = [] # Series of the overlay chart, one per sensor in _overlay_ids
+_overlay_points = [] # Point buffers bound to the overlay series
 _ser1 = None # Series 1 of the chart
 _chart = None
 _cursor = None
@@ -23,18 +38,12 @@ _x_axis_text = [] # Save X-axis text
 _history_data = {}
 _curr_attach = None # Currently displayed data type [temperature/humidity, etc.]
 _time_gap_limit = 900 # If the time interval exceeds 900s, insert an empty coordinate point
+_PREFETCH_SLICE = 8 # Number of records converted by prefetch_history before yielding to the event loop
+_prefetched = {} # History converted ahead of time: {"sensor_id", "timestamp" of its newest record, "data"}
 
 def get_date_time_string(epoch, time):
-    time_text = []
-    for i in range(_major_cnt):
-        tm = clocktime.datetime(epoch + i * time)
-        month = tm[1]
-        day = "0" + str(tm[2]) if tm[2] < 10 else str(tm[2])
-        hour= "0" + str(tm[3]) if tm[3] < 10 else str(tm[3])
-        minute = "0" + str(tm[4]) if tm[4] < 10 else str(tm[4])
-        s = "%s:%s" % (hour, minute)
-        time_text.append(s)
-    return time_text
+    # X axis labels: "HH:MM" of _major_cnt evenly spaced timestamps
+    return [formatter.format_clock(epoch + i * time) for i in range(_major_cnt)]
 
 def data_calibration(data, calibration):
     # Data calibration
@@ -48,30 +57,31 @@ def data_calibration(data, calibration):
                     data[key][index] = value + calibration.get(key, 0)
     return data
 
-def get_history_data(sensor_id):
+def iter_history_data(sensor_id, slice_records=0):
     # Convert historical data to the format required by the UI
+    # If slice_records is set, yields None after every slice_records records so that the caller can pause; the converted data is yielded last
     res = {}
-    for s_id, measurements in data_storage.get_sensor_history_data(sensor_id).items():
-        prev_timestamp = None
-        for measurement in measurements:
-            if not res: res = {key: [] for key in measurement}
-            timestamp = measurement['timestamp']
-            if prev_timestamp is not None and timestamp - prev_timestamp > _time_gap_limit:
-                # If the interval from the previous timestamp is too long, insert empty coordinate points
-                num_insertions = (timestamp - prev_timestamp) // _time_gap_limit  # Calculate the number of timestamps to insert
-                if num_insertions > _PTS_DO_SHIFT_ONLY:
-                    # If the number of points to insert exceeds _PTS_DO_SHIFT_ONLY, clear previous data
-                    prev_timestamp = timestamp
-                    res = {key: [] for key in measurement}
-                else:
-                    # Append coordinate points
-                    for i in range(num_insertions):
-                        new_timestamp = prev_timestamp + _time_gap_limit
-                        for key in measurement: res[key].append(new_timestamp if key == "timestamp" else None)
-                        prev_timestamp = new_timestamp
-            # Insert the current coordinate point
-            for key, value in measurement.items(): res[key].append(int(value))
-            prev_timestamp = timestamp
+    prev_timestamp = None
+    for count, measurement in enumerate(data_storage.iter_sensor_history_data(sensor_id), 1):
+        if not res: res = {key: [] for key in measurement}
+        timestamp = measurement['timestamp']
+        if prev_timestamp is not None and timestamp - prev_timestamp > _time_gap_limit:
+            # If the interval from the previous timestamp is too long, insert empty coordinate points
+            num_insertions = (timestamp - prev_timestamp) // _time_gap_limit  # Calculate the number of timestamps to insert
+            if num_insertions > _PTS_DO_SHIFT_ONLY:
+                # If the number of points to insert exceeds _PTS_DO_SHIFT_ONLY, clear previous data
+                prev_timestamp = timestamp
+                res = {key: [] for key in measurement}
+            else:
+                # Append coordinate points
+                for i in range(num_insertions):
+                    new_timestamp = prev_timestamp + _time_gap_limit
+                    for key in measurement: res[key].append(new_timestamp if key == "timestamp" else None)
+                    prev_timestamp = new_timestamp
+        # Insert the current coordinate point
+        for key, value in measurement.items(): res[key].append(int(value))
+        prev_timestamp = timestamp
+        if slice_records and count % slice_records == 0: yield None
 
     for key in list(res.keys()):
         # For measure_id, only keep the last one
@@ -79,17 +89,39 @@ def get_history_data(sensor_id):
         # For data that is not timestamp/allowed to display, there is no need to save its history
         elif key not in ["timestamp"] + _ENABLE_SHOW_ATTACH: del res[key]
 
+    yield res
+
+def get_history_data(sensor_id):
+    # Convert historical data to the format required by the UI in one go
+    for res in iter_history_data(sensor_id): pass
     return res
 
-def minmax():
-    value_list = [x for x in _history_data.get(_curr_attach, []) if isinstance(x, int)]
-    v_min = min(value_list) if value_list else 0
-    v_max = max(value_list) if value_list else 0
+async def prefetch_history(sensor_id):
+    # Convert the sensor's history ahead of time, a few records per event loop turn, so that opening its history page skips the decoding
+    global _prefetched
+    timestamp = data_storage.get_record_info(sensor_id).get("timestamp", None)
+    if timestamp is None: return
+    # The prefetched data stays valid until the sensor records a new measurement
+    if _prefetched.get("sensor_id", None) == sensor_id and _prefetched.get("timestamp", None) == timestamp: return
+
+    for res in iter_history_data(sensor_id, _PREFETCH_SLICE):
+        if res is None: await asyncio.sleep_ms(0)
+    _prefetched = {"sensor_id": sensor_id, "timestamp": timestamp, "data": res}
+
+def take_history_data(sensor_id):
+    # Use the prefetched history if it is still up to date, otherwise convert it now
+    global _prefetched
+    prefetched = _prefetched
+    _prefetched = {}
+    timestamp = data_storage.get_record_info(sensor_id).get("timestamp", None)
+    if prefetched.get("sensor_id", None) == sensor_id and prefetched.get("timestamp", None) == timestamp: return prefetched["data"]
+    return get_history_data(sensor_id)
 
-    if _curr_attach == "temperature" and settings.temp_unit() == 0:
-        # Convert Celsius to Fahrenheit (for Y axis)
-        v_min = int(config.celsius2Fahrenheit(v_min/100)*100)
-        v_max = int(config.celsius2Fahrenheit(v_max/100)*100)
+def minmax():
+    # Y axis range: the extremes of the points on the chart, widened to the surrounding tick boundaries
+    # Temperature points are already kept in the display unit
+    v_min = _v_min if _v_min is not None else 0
+    v_max = _v_max if _v_max is not None else 0
 
     v_min = (v_min // 200) * 200 - 100
     v_max = (v_max // 200 + 1) * 200 + 100
@@ -127,85 +159,237 @@ def get_chart_style():
     else:
         return "", lv.PALETTE.BLUE
 
+def to_point(value, unit):
+    # Convert a calibrated measurement to a chart point (display unit for temperature)
+    if value is None: return _LV_CHART_POINT_NONE
+    if _curr_attach == "temperature": return formatter.to_display_centi(value, unit)
+    return value
+
+def scan_minmax():
+    # Recompute the extremes of the points currently on the chart
+    global _v_min, _v_max
+    _v_min = _v_max = None
+    for i in range(_p_cnt):
+        value = _points[i]
+        if value == _LV_CHART_POINT_NONE: continue
+        if _v_min is None or value < _v_min: _v_min = value
+        if _v_max is None or value > _v_max: _v_max = value
+
+def update_y_axis(force=False):
+    # Only touch the Y range and labels when the tick-rounded extremes change
+    global _y_range, _y_axis_text
+    y_range = minmax() if _curr_attach in ["temperature"] else (0, 1)
+    if not force and y_range == _y_range: return
+    _y_range = y_range
+    _y_axis_text, v_min, v_max = get_y_axis_text()
+    _parent.get_child(-1).set_text_src(_y_axis_text)
+    _chart.set_range(lv.chart.AXIS.PRIMARY_Y, v_min, v_max)
+
+def update_x_axis():
+    # X axis labels span the oldest to the newest point on the chart, only set when the text changes
+    global _major_cnt, _x_axis_text
+    scale_x = _parent.get_child(-2)
+    major_cnt = min(_p_cnt, 4)
+    if _major_cnt != major_cnt:
+        _major_cnt = major_cnt
+        scale_x.set_total_tick_count(_major_cnt * 2 - 1 if _major_cnt > 1 else 2)
+
+    first_ts = _times[_p_index]
+    time = abs(_last_ts - first_ts)
+    x_axis_text = get_date_time_string(first_ts, time // max(_major_cnt - 1, 1))
+    if x_axis_text == _x_axis_text: return
+    _x_axis_text = x_axis_text
+    scale_x.set_text_src(_x_axis_text)
+
+def append_point(timestamp, value):
+    # Write one point into the buffer: grow the series until the buffer is full, then shift it
+    global _p_cnt, _p_index, _v_min, _v_max
+    evicted = _LV_CHART_POINT_NONE
+    if _p_cnt < _p_cap:
+        slot = _p_cnt
+        _points[slot] = value
+        _times[slot] = timestamp
+        _p_cnt += 1
+        _chart.set_point_count(_p_cnt)
+        _chart.set_value_by_id(_ser1, slot, value)
+    else:
+        # set_next_value writes the slot at the start of the ring and only invalidates that column
+        slot = _p_index
+        evicted = _points[slot]
+        _points[slot] = value
+        _times[slot] = timestamp
+        _chart.set_next_value(_ser1, value)
+        _p_index = (slot + 1) % _p_cap
+
+    if value != _LV_CHART_POINT_NONE:
+        if _v_min is None or value < _v_min: _v_min = value
+        if _v_max is None or value > _v_max: _v_max = value
+    # Only rescan when the point pushed out of the ring was one of the extremes
+    if evicted != _LV_CHART_POINT_NONE and evicted in (_v_min, _v_max): scan_minmax()
+
+def append_history(timestamp, values):
+    # Keep the decoded history in step with the chart, used when switching to another measurement type
+    for key in ["timestamp"] + _ENABLE_SHOW_ATTACH:
+        if key not in _history_data: continue
+        _history_data[key].append(timestamp if key == "timestamp" else values.get(key, None))
+        if len(_history_data[key]) > _p_cap: del _history_data[key][0]
+
 def refresh_history(sensor_id, calibration=None, refresh_all=False):
-    global _p_index, _history_data, _sensor_id, _x_axis_text, _major_cnt
+    global _history_data, _last_ts
     if (_sensor_id != sensor_id): return
     if calibration is None: calibration = {"temperature": 0, "humidity": 0}
+    # The overlay is resampled from the stored records again, it only covers a few sensors
+    if _overlay_ids:
+        load_overlay_data()
+        return
 
-    _history_data = data_calibration(get_history_data(_sensor_id), calibration)
-    point_cnt = len(_history_data.get("timestamp", []))
     if not _chart or not _ser1: # Chart is not drawn
+        _history_data = data_calibration(get_history_data(_sensor_id), calibration)
         # If there are at least 2 data points, try to draw the chart
-        if point_cnt >=2: asyncio.create_task(show_chart())
+        if len(_history_data.get("timestamp", [])) >= 2: asyncio.create_task(show_chart())
         return
+    # The chart is still being created, its first load will pick up the new record
+    if _points is None: return
 
-    # If major_cnt changes, update the X axis scale
-    if _major_cnt != min(point_cnt, 4):
-        _major_cnt = min(point_cnt, 4)
-        tick_count = _major_cnt * 2 - 1 if _major_cnt > 1 else 2
-        _parent.get_child(-2).set_total_tick_count(tick_count)
-
-    at = _history_data.get("timestamp",[])
-    time = abs(at[0] - at[-1])
-    # Update X axis text
-    _x_axis_text = get_date_time_string(at[0], int(time/(_major_cnt-1)))
-    _parent.get_child(-2).set_text_src(_x_axis_text)
-
-    # If the number of points has exceeded the maximum, just shift
-    if _p_cnt >= _PTS_DO_SHIFT_ONLY and not refresh_all:
-        val = _history_data[_curr_attach][-1] + calibration.get(_curr_attach, 0)
-        if _curr_attach == "temperature" and settings.temp_unit() == 0:
-            val = int(config.celsius2Fahrenheit(val/100)*100)
+    record = data_storage.get_record_info(sensor_id)
+    timestamp = record.get("timestamp", None)
+    if timestamp is None or timestamp == _last_ts: return
 
-        _chart.set_next_value(_ser1, val)
-        # Update Y axis text
-        value_text, v_min, v_max = get_y_axis_text()
-        _parent.get_child(-1).set_text_src(value_text)
-        _chart.set_range(lv.chart.AXIS.PRIMARY_Y, v_min, v_max)
-
-        _p_index += 1
-        if _p_index >= _p_cnt: _p_index = 0
-
-    # If there are still few points, reload the entire chart each time new data is received
-    else: load_chart_data()
+    gap = timestamp - _last_ts if _last_ts is not None else 0
+    if refresh_all or _last_ts is None or gap < 0 or gap // _time_gap_limit > _PTS_DO_SHIFT_ONLY:
+        # Nothing to append to, time went backwards or the gap clears the history: reload everything
+        _history_data = data_calibration(get_history_data(_sensor_id), calibration)
+        load_chart_data()
+        return
 
+    unit = formatter.temp_unit() if _curr_attach == "temperature" else None
+    if gap > _time_gap_limit:
+        # If the interval from the previous timestamp is too long, insert empty coordinate points
+        for i in range(gap // _time_gap_limit):
+            _last_ts += _time_gap_limit
+            append_point(_last_ts, _LV_CHART_POINT_NONE)
+            append_history(_last_ts, {})
+
+    values = {}
+    for key in _ENABLE_SHOW_ATTACH:
+        value = record.get(key, None)
+        if isinstance(value, int): values[key] = value + calibration.get(key, 0)
+    append_point(timestamp, to_point(values.get(_curr_attach, None), unit))
+    append_history(timestamp, values)
+    if "measure_id" in record: _history_data["measure_id"] = record["measure_id"]
+    _last_ts = timestamp
+
+    update_x_axis()
+    update_y_axis()
+
+@profiler.section("load_chart_data")
 def load_chart_data():
-    global _p_index, _p_cnt, _x_axis_text
-    if _chart and _ser1:
-        at = _history_data.get("timestamp",[])
-        samples = _history_data.get(_curr_attach, [])
-        if len(at) and _parent.get_child(-2) and _parent.get_child(-1):
-            time = abs(at[0] - at[-1])
-            # Update X axis text
-            _x_axis_text = get_date_time_string(at[0], int(time/(_major_cnt-1)))
-            # If the chart control exists, the X/Y axis scale controls also exist
-            _parent.get_child(-2).set_text_src(_x_axis_text)
-
-            # Update Y axis text
-            value_text, v_min, v_max = get_y_axis_text()
-            _parent.get_child(-1).set_text_src(value_text)
-            _chart.set_range(lv.chart.AXIS.PRIMARY_Y, v_min, v_max)
-
-            label, color = get_chart_style()
-            _chart.set_series_color(_ser1, lv.palette_main(color))
-
-        _p_index = 0
-        _p_cnt = len(samples)
-        if _p_cnt == 0:
-            _p_cnt = 1
-            samples = [0,]
-        _chart.set_point_count(_p_cnt)
-        if (_curr_attach == "temperature") and (settings.temp_unit() == 0):
-            # Convert Celsius to Fahrenheit (for each point)
-            for i,v in enumerate(samples):
-                if isinstance(v, int):
-                    samples[i] = int(config.celsius2Fahrenheit(v/100)*100)
-
-        samples = [x if x is not None else _LV_CHART_POINT_NONE for x in samples]
-        _chart.set_ext_y_array(_ser1, samples)
+    # Load the whole decoded history into a freshly allocated point buffer and bind it to the series once
+    global _p_index, _p_cnt, _p_cap, _points, _times, _last_ts, _x_axis_text
+    if not _chart or not _ser1: return
+    at = _history_data.get("timestamp", [])
+    samples = _history_data.get(_curr_attach, [])
+
+    _p_index = 0
+    _p_cnt = max(len(samples), 1)
+    # Below _PTS_DO_SHIFT_ONLY points the buffer keeps room to grow, after that it is used as a ring
+    _p_cap = max(_p_cnt, _PTS_DO_SHIFT_ONLY)
+    _points = array("i", [_LV_CHART_POINT_NONE] * _p_cap)
+    _times = array("I", [0] * _p_cap)
+
+    unit = formatter.temp_unit() if _curr_attach == "temperature" else None
+    for i, value in enumerate(samples): _points[i] = to_point(value, unit)
+    for i, timestamp in enumerate(at): _times[i] = timestamp
+    _last_ts = at[-1] if at else None
+    scan_minmax()
+
+    _chart.set_point_count(_p_cnt)
+    _chart.set_ext_y_array(_ser1, _points)
+    _chart.set_x_start_point(_ser1, 0)
+
+    label, color = get_chart_style()
+    _chart.set_series_color(_ser1, lv.palette_main(color))
+    # If the chart control exists, the X/Y axis scale controls also exist
+    if _parent.get_child(-2) and _parent.get_child(-1):
+        _x_axis_text = []
+        if _last_ts is not None: update_x_axis()
+        update_y_axis(True)
+
+def create_title(label):
+    # Title and separator line at the top of the page
+    title = lv.label(_parent)
+    title.set_text(label)
+    title.set_style_text_font(lv.font_ascii_bold_28, 0)
+    title.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
+    title.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
+    title.align(lv.ALIGN.TOP_LEFT, 10, 1)
+
+    # Separator line
+    line_points = [{"x": 0, "y": 0}, {"x": 320, "y": 0}]
+    line = lv.line(_parent)
+    line.set_points(line_points, len(line_points))  # Set the points
+    line.align(lv.ALIGN.TOP_LEFT, 0, 35)
+    line.set_style_line_width(2, 0)
+    line.set_style_line_color(lv.color_hex(0xBBBBBB), 0)
+    return title
+
+def create_chart(cnt):
+    # Chart with its X/Y axis scales for cnt points, the scales are the last two children of _parent
+    global _major_cnt
+    _major_cnt = cnt if cnt < 4 else 4
+
+    chart_size = (255, 175)
+    chart = lv.chart(_parent)
+    chart.set_size(*chart_size)
+    chart.align(lv.ALIGN.CENTER, 20, 10)
+    chart.set_div_line_count(5, 0)
+    chart.set_type(lv.chart.TYPE.LINE)
+    chart.set_style_bg_opa(lv.OPA.TRANSP, lv.PART.MAIN)
+    chart.set_style_radius(0, lv.PART.MAIN)
+    chart.set_style_border_width(0, lv.PART.MAIN)
+    chart.set_style_text_color(lv.color_hex(0x111111), lv.PART.MAIN | lv.STATE.DEFAULT)
+    chart.set_style_text_font(lv.font_ascii_14, 0)
+    chart.set_style_text_align(lv.TEXT_ALIGN.CENTER, 0)
+
+    # In lvgl v9.1, chart does not have set_axis_tick function, need to use scale control to display
+    scale_x = lv.scale(_parent)
+    scale_x.set_size(chart_size[0] - 30, 25)
+    scale_x.set_mode(lv.scale.MODE.HORIZONTAL_BOTTOM)
+    # Set main/secondary tick lines to transparent
+    scale_x.set_style_line_opa(lv.OPA._0, lv.PART.MAIN)
+    scale_x.set_style_line_opa(lv.OPA._0, lv.PART.ITEMS)
+    # Main tick width is 1, text is font_ascii_14
+    scale_x.set_style_line_width(1, lv.PART.INDICATOR)
+    scale_x.set_style_text_font(lv.font_ascii_14, 0)
+    # Set range
+    tick_count = _major_cnt * 2 - 1 if _major_cnt > 1 else 2
+    scale_x.set_total_tick_count(tick_count)
+    scale_x.set_major_tick_every(2)
+    scale_x.set_text_src([""] * _major_cnt)
+    scale_x.align_to(chart, lv.ALIGN.OUT_BOTTOM_MID, 0, -3)
+
+    scale_y = lv.scale(_parent)
+    scale_y.set_size(25, chart_size[1] - 16)
+    scale_y.set_mode(lv.scale.MODE.VERTICAL_LEFT)
+    scale_y.align_to(chart, lv.ALIGN.OUT_LEFT_MID, -3, 0)
+    # Set main line to transparent
+    scale_y.set_style_line_opa(lv.OPA._0, lv.PART.MAIN)
+    # Main/secondary tick width is 1
+    scale_y.set_style_length(10, lv.PART.INDICATOR)
+    scale_y.set_style_line_width(1, lv.PART.ITEMS)
+    scale_y.set_style_line_width(1, lv.PART.INDICATOR)
+    scale_y.set_style_text_font(lv.font_ascii_14, 0)
+    # Set range
+    scale_y.set_total_tick_count(9)
+    scale_y.set_major_tick_every(2)
+    scale_y.set_text_src([""] * 5)
+
+    # Do not display points on the data
+    chart.set_style_size(0, 0, lv.PART.INDICATOR)
+    return chart
 
 async def show_chart():
-    global _chart, _ser1, _cursor, _major_cnt
+    global _chart, _ser1, _cursor, _points
     last_id = -1
 
     def _shifted_id(id):
@@ -237,92 +421,31 @@ async def show_chart():
         elif code == lv.EVENT.REFR_EXT_DRAW_SIZE: pass # e.set_ext_draw_size(20)
 
     try:
-        if _parent: _parent.clean()
-        label, color = get_chart_style()
-
-        # Title
-        title = lv.label(_parent)
-        title.set_text(label)
-        title.set_style_text_font(lv.font_ascii_bold_28, 0)
-        title.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
-        title.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
-        title.align(lv.ALIGN.TOP_LEFT, 10, 1)
-
-        # Separator line
-        line_points = [{"x": 0, "y": 0}, {"x": 320, "y": 0}]
-        line = lv.line(_parent)
-        line.set_points(line_points, len(line_points))  # Set the points
-        line.align(lv.ALIGN.TOP_LEFT, 0, 35)
-        line.set_style_line_width(2, 0)
-        line.set_style_line_color(lv.color_hex(0xBBBBBB), 0)
-
-        cnt = len(_history_data.get("timestamp",[]))
-        if cnt < 2:
-            # Prompt: no historical data yet
-            tip = lv.label(_parent)
-            tip.set_text("No historical data yet. ")
-            tip.set_style_text_font(lv.font_ascii_18, 0)
-            tip.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
-            tip.align(lv.ALIGN.CENTER, 0, 0)
-            return tip
-
-        elif cnt < 4: _major_cnt = cnt
-        else: _major_cnt = 4
-
-        chart_size = (255, 175)
-        _chart = lv.chart(_parent)
-        _chart.set_size(*chart_size)
-        _chart.align(lv.ALIGN.CENTER, 20, 10)
-        _chart.set_div_line_count(5, 0)
-        _chart.set_type(lv.chart.TYPE.LINE)
-        _chart.set_style_bg_opa(lv.OPA.TRANSP, lv.PART.MAIN)
-        _chart.set_style_radius(0, lv.PART.MAIN)
-        _chart.set_style_border_width(0, lv.PART.MAIN)
-        _chart.set_style_text_color(lv.color_hex(0x111111), lv.PART.MAIN | lv.STATE.DEFAULT)
-        _chart.set_style_text_font(lv.font_ascii_14, 0)
-        _chart.set_style_text_align(lv.TEXT_ALIGN.CENTER, 0)
-
-        # In lvgl v9.1, chart does not have set_axis_tick function, need to use scale control to display
-        scale_x = lv.scale(_parent)
-        scale_x.set_size(chart_size[0] - 30, 25)
-        scale_x.set_mode(lv.scale.MODE.HORIZONTAL_BOTTOM)
-        # Set main/secondary tick lines to transparent
-        scale_x.set_style_line_opa(lv.OPA._0, lv.PART.MAIN)
-        scale_x.set_style_line_opa(lv.OPA._0, lv.PART.ITEMS)
-        # Main tick width is 1, text is font_ascii_14
-        scale_x.set_style_line_width(1, lv.PART.INDICATOR)
-        scale_x.set_style_text_font(lv.font_ascii_14, 0)
-        # Set range
-        tick_count = _major_cnt * 2 - 1 if _major_cnt > 1 else 2
-        scale_x.set_total_tick_count(tick_count)
-        scale_x.set_major_tick_every(2)
-        scale_x.set_text_src([""] * _major_cnt)
-        scale_x.align_to(_chart, lv.ALIGN.OUT_BOTTOM_MID, 0, -3)
-
-        scale_y = lv.scale(_parent)
-        scale_y.set_size(25, chart_size[1] - 16)
-        scale_y.set_mode(lv.scale.MODE.VERTICAL_LEFT)
-        scale_y.align_to(_chart, lv.ALIGN.OUT_LEFT_MID, -3, 0)
-        # Set main line to transparent
-        scale_y.set_style_line_opa(lv.OPA._0, lv.PART.MAIN)
-        # Main/secondary tick width is 1
-        scale_y.set_style_length(10, lv.PART.INDICATOR)
-        scale_y.set_style_line_width(1, lv.PART.ITEMS)
-        scale_y.set_style_line_width(1, lv.PART.INDICATOR)
-        scale_y.set_style_text_font(lv.font_ascii_14, 0)
-        # Set range
-        scale_y.set_total_tick_count(9)
-        scale_y.set_major_tick_every(2)
-        scale_y.set_text_src([""] * 5)
-
-        _chart.add_event_cb(event_cb, lv.EVENT.ALL, None)
-        _chart.refresh_ext_draw_size()
-
-        _cursor = _chart.add_cursor(lv.palette_main(lv.PALETTE.GREEN), lv.DIR.LEFT| lv.DIR.BOTTOM)
-
-        # Do not display points on the data
-        _chart.set_style_size(0, 0, lv.PART.INDICATOR)
-        _ser1 = _chart.add_series(lv.palette_main(color), lv.chart.AXIS.PRIMARY_Y)
+        with profiler.section("show_chart"):
+            # The previous chart (if any) is deleted with the parent's children, nothing may append to it meanwhile
+            _chart = _ser1 = _points = None
+            if _parent: _parent.clean()
+            label, color = get_chart_style()
+            title = create_title(label)
+
+            cnt = len(_history_data.get("timestamp",[]))
+            if cnt < 2:
+                # Prompt: no historical data yet
+                tip = lv.label(_parent)
+                tip.set_text("No historical data yet. ")
+                tip.set_style_text_font(lv.font_ascii_18, 0)
+                tip.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
+                tip.align(lv.ALIGN.CENTER, 0, 0)
+                return tip
+
+            _chart = create_chart(cnt)
+            _chart.add_event_cb(event_cb, lv.EVENT.ALL, None)
+            _chart.refresh_ext_draw_size()
+
+            _cursor = _chart.add_cursor(lv.palette_main(lv.PALETTE.GREEN), lv.DIR.LEFT| lv.DIR.BOTTOM)
+
+            _ser1 = _chart.add_series(lv.palette_main(color), lv.chart.AXIS.PRIMARY_Y)
+        # The pause lets the page show before the data is loaded, it is not part of the measured render
         await asyncio.sleep_ms(100)
         load_chart_data()
         return title
@@ -330,11 +453,89 @@ async def show_chart():
         print(f"show_chart error: {str(e)}")
         return _parent
 
+def get_overlay_sensors(sensor_id):
+    # Sensors plotted by the overlay: the current one first, then the other selected sensors
+    # that can display the current measurement type and have at least 2 records
+    res = []
+    for s_id in [sensor_id] + [i for i in ble_broadcast.get_selected_sensors() if i != sensor_id]:
+        if data_storage.get_sensor_history_count(s_id) < 2: continue
+        model_code = data_storage.get_record_info(s_id).get("dev_model", None)
+        if model_code is None: model_code = data_storage.get_live_info(s_id).get("dev_model", None)
+        if _curr_attach not in config.getProfile(model_code).get("attr", {}).get("display", {}).get("attachInfo", []): continue
+        res.append(s_id)
+        if len(res) >= len(_OVERLAY_PALETTE): break
+    return tuple(res)
+
+@profiler.section("load_overlay_data")
+def load_overlay_data():
+    # Resample the overlay sensors onto common buckets and load one series per sensor
+    global _p_index, _p_cnt, _times, _last_ts, _v_min, _v_max, _overlay_points, _x_axis_text
+    if not _chart or not _overlay_series: return
+    merged = data_storage.merge_sensor_history(_overlay_ids, _curr_attach, _time_gap_limit, _PTS_DO_SHIFT_ONLY)
+    at = merged.get("timestamp", [])
+    if not at: return
+
+    _p_index = 0
+    _p_cnt = len(at)
+    _times = array("I", at)
+    _last_ts = at[-1]
+    _v_min = _v_max = None
+    _overlay_points = []
+    unit = formatter.temp_unit() if _curr_attach == "temperature" else None
+    _chart.set_point_count(_p_cnt)
+    for s_id, ser in zip(_overlay_ids, _overlay_series):
+        points = array("i", [to_point(value, unit) for value in merged.get(s_id, [None] * _p_cnt)])
+        for value in points:
+            if value == _LV_CHART_POINT_NONE: continue
+            if _v_min is None or value < _v_min: _v_min = value
+            if _v_max is None or value > _v_max: _v_max = value
+        # Keep a reference to every bound buffer for as long as the chart uses it
+        _overlay_points.append(points)
+        _chart.set_ext_y_array(ser, points)
+        _chart.set_x_start_point(ser, 0)
+
+    _x_axis_text = []
+    update_x_axis()
+    update_y_axis(True)
+
+async def show_overlay_chart():
+    global _chart, _ser1, _points, _overlay_series
+    try:
+        with profiler.section("show_overlay_chart"):
+            _chart = _ser1 = _points = None
+            _overlay_series = []
+            if _parent: _parent.clean()
+            title = create_title(_OVERLAY_TITLE.get(_curr_attach, ""))
+
+            # Legend: the tail of each sensor ID in its series color, created first so that the scales stay the last children
+            legend = None
+            for s_id, color in zip(_overlay_ids, _OVERLAY_PALETTE):
+                item = lv.label(_parent)
+                item.set_text(s_id[-6:])
+                item.set_style_text_font(lv.font_ascii_14, 0)
+                item.set_style_text_color(lv.palette_main(color), 0)
+                if legend is None: item.align(lv.ALIGN.TOP_RIGHT, -10, 40)
+                else: item.align_to(legend, lv.ALIGN.OUT_LEFT_MID, -8, 0)
+                legend = item
+
+            _chart = create_chart(_PTS_DO_SHIFT_ONLY)
+            for color in _OVERLAY_PALETTE[:len(_overlay_ids)]:
+                _overlay_series.append(_chart.add_series(lv.palette_main(color), lv.chart.AXIS.PRIMARY_Y))
+        # As in show_chart, the pause is not part of the measured render
+        await asyncio.sleep_ms(100)
+        load_overlay_data()
+        return title
+    except Exception as e:
+        print(f"show_overlay_chart error: {str(e)}")
+        return _parent
+
 def show_history(parent, sensor_id, model_code, calibration=None):
     # return: None - No measurement type available for display; True - There is a measurement type available for display
-    global _parent, _sensor_id, _history_data, _attach_info, _curr_attach
+    global _parent, _sensor_id, _history_data, _attach_info, _curr_attach, _overlay_ids
     if calibration is None: calibration = {"temperature": 0}
     if _sensor_id == sensor_id and _curr_attach is not None:
+        # The overlay follows the last measurement type, nothing comes after it
+        if _overlay_ids: return None
         # If the sensor is the same as last time and curr_attach is not empty,
         # then switch to the next measurement type for history display
         new_attach = None
@@ -343,7 +544,14 @@ def show_history(parent, sensor_id, model_code, calibration=None):
                 new_attach = attach
                 break
 
-        if new_attach is None: return None
+        if new_attach is None:
+            # Compare the last measurement type with the other selected sensors if there are any
+            overlay_ids = get_overlay_sensors(sensor_id)
+            if len(overlay_ids) < 2: return None
+            _overlay_ids = overlay_ids
+            _parent = parent
+            asyncio.create_task(show_overlay_chart())
+            return True
         _curr_attach = new_attach
         # If history data has already been obtained, no need to get it again
     else:
@@ -353,6 +561,7 @@ def show_history(parent, sensor_id, model_code, calibration=None):
         _attach_info = tuple(_profile.get("attr", {}).get("display", {}).get("attachInfo", []))
 
         _curr_attach = None
+        _overlay_ids = ()
         # Check if the sensor's measurement data type can be displayed
         for attach in _ENABLE_SHOW_ATTACH:
             if attach in _attach_info:
@@ -361,7 +570,7 @@ def show_history(parent, sensor_id, model_code, calibration=None):
         # If there is no type that can display historical data, return None
         if _curr_attach is None: return None
 
-        _history_data = data_calibration(get_history_data(sensor_id), calibration)
+        _history_data = data_calibration(take_history_data(sensor_id), calibration)
 
     _parent = parent
     _sensor_id = sensor_id
@@ -370,11 +579,20 @@ def show_history(parent, sensor_id, model_code, calibration=None):
 
 async def reset_history_info():
     # Reset current parameters
-    global _curr_attach, _chart, _parent, _history_data, _sensor_id, _attach_info
+    global _curr_attach, _chart, _ser1, _parent, _history_data, _sensor_id, _attach_info, _points, _times, _last_ts, _y_range
+    global _overlay_ids, _overlay_series, _overlay_points
     _curr_attach = None
     _chart = None
+    _ser1 = None
     _parent = None
     _history_data = {}
     _sensor_id = None
     _curr_attach = None # Currently displayed data type [temperature/humidity, etc.]
     _attach_info = () # Measurement data types corresponding to the sensor
+    _points = None
+    _times = None
+    _last_ts = None
+    _y_range = None
+    _overlay_ids = ()
+    _overlay_series = []
+    _overlay_points = []
@@ -1,35 +1,25 @@
-import settings
 import clocktime
 import lvgl as lv
 from . import config
 from . import ui_style
 from . import data_storage
+from ... import formatter
 from ... import base as app_base
 
-def show_elapsed_time(parent, live_info, record_info, calibration):
+def show_elapsed_time(parent, live_info, record_info, calibration, unit):
     elapsed_text = ""
     if "temperature" in live_info:
         _offset = calibration.get("temperature", 0)
         last_tm = record_info.get("temperature", 0) + _offset
         curr_tm = live_info.get("temperature", 0) + _offset
-        if settings.temp_unit() == 0:
-            # Convert Celsius to Fahrenheit
-            last_tm = int(config.celsius2Fahrenheit(last_tm / 100) * 100)
-            curr_tm = int(config.celsius2Fahrenheit(curr_tm / 100) * 100)
-
-        # Calculate the difference
-        value = str(int((curr_tm - last_tm) / 10) / 10)
-        elapsed_text += ("" if value.startswith("-") else "+") + f"{value}° "
+        # Difference in the display unit
+        elapsed_text += f"{formatter.format_temperature_delta(curr_tm, last_tm, unit)}° "
     elapsed_text += "since last record"
 
     # Calculate time difference
-    diff_time = clocktime.now() - record_info.get("timestamp", 0)
+    time_label = formatter.format_elapsed(clocktime.now() - record_info.get("timestamp", 0))
     # If the time difference is illogical, do not display
-    if diff_time < 0: return None
-    elif diff_time < 60: time_label = "<1m"
-    elif diff_time < 3600: time_label = f"{diff_time // 60}m"
-    elif diff_time < 86400: time_label = f"{diff_time // 3600}h"
-    else: time_label = f"{diff_time // 68400}d"
+    if time_label is None: return None
     elapsed_text += f" {time_label} ago"
 
     # Display text
@@ -41,23 +31,19 @@ def show_elapsed_time(parent, live_info, record_info, calibration):
 
     return elapsed
 
-def convert_measurement(value, _type, calibration):
+def convert_measurement(value, _type, calibration, unit):
     # Convert the value and unit to be displayed according to the data type/configuration
     res = ["N/A", None]
     try:
         if _type == "temperature":
             value = value + calibration.get(_type, 0)
-            if settings.temp_unit() == 1:
-                res[1] = "°C"
-                res[0] = str(int(value / 10) / 10)
-            else:
-                res[1] = "°F"
-                res[0] = str(int(int(config.celsius2Fahrenheit(value/100) * 100) / 10) / 10)
+            res[0] = formatter.format_temperature(value, unit)
+            res[1] = formatter.TEMP_SYMBOLS[unit]
     except Exception as e:
         print(f"convert measurement fail.[{str(e)}]")
     return res
 
-def show_measure(parent, info, calibration, card_type):
+def show_measure(parent, info, calibration, card_type, unit):
     # Display measurement data
     model_code = info.get("dev_model", None)
     _profile = config.getProfile(model_code)
@@ -76,7 +62,7 @@ def show_measure(parent, info, calibration, card_type):
     for index, m_type in enumerate(attach_info):
         data_width = data_style.get("value_width", [])
         # Get the converted measurement value
-        value, symbol = convert_measurement(info.get(m_type, None), m_type, calibration)
+        value, symbol = convert_measurement(info.get(m_type, None), m_type, calibration, unit)
 
         # Create a hidden label for alarm use
         f_label = lv.label(parent)
@@ -160,6 +146,35 @@ def show_probe(parent, align_obj, probe_status, card_style):
         return probe_icon
     return align_obj
 
+# Signal bar rectangles (x1, y1, x2, y2) relative to the icon, indexed by signal grade [0-5]
+# Active bars grow by 4px per level, inactive bars are drawn as short stubs
+_SIGNAL_BARS = tuple(
+    tuple((i * 4 + 3, (21 - 4 * i) if i < grade else 23, i * 4 + 5, 25) for i in range(5))
+    for grade in range(6)
+)
+_signal_bar_dsc = None # Shared rectangle descriptor used to draw the signal bars
+
+def draw_signal_bars(e, grade):
+    # DRAW_MAIN callback of the signal icon: draw all bars of the grade directly on the layer
+    global _signal_bar_dsc
+    if _signal_bar_dsc is None:
+        _signal_bar_dsc = lv.draw_rect_dsc_t()
+        _signal_bar_dsc.init()
+        _signal_bar_dsc.radius = 0
+        _signal_bar_dsc.bg_opa = lv.OPA.COVER
+        _signal_bar_dsc.bg_color = lv.color_hex3(0xFFF)
+
+    coords = lv.area_t()
+    e.get_target_obj().get_coords(coords)
+    layer = e.get_layer()
+    for x1, y1, x2, y2 in _SIGNAL_BARS[grade]:
+        area = lv.area_t()
+        area.x1 = coords.x1 + x1
+        area.y1 = coords.y1 + y1
+        area.x2 = coords.x1 + x2
+        area.y2 = coords.y1 + y2
+        lv.draw_rect(layer, _signal_bar_dsc, area)
+
 def show_signal(parent, align_obj, info, card_style):
     if not parent: return align_obj
 
@@ -167,29 +182,17 @@ def show_signal(parent, align_obj, info, card_style):
 
     if "signal" in card_style["icon"]["type"]:
         signal = abs(info["rssi"])
-        signal_icon = lv.obj(parent)
-        signal_icon.set_size(28, 28)
-        signal_icon.set_style_radius(0, 0)
-        signal_icon.set_style_pad_all(0, 0)
-        signal_icon.set_style_border_width(0, 0)
-        signal_icon.set_style_bg_opa(lv.OPA._0, 0)
-        signal_icon.set_style_bg_color(lv.color_hex3(0x000), 0)
-
         if signal < 50: grade = 5
         elif signal < 60: grade = 4
         elif signal < 70: grade = 3
         elif signal < 80: grade = 2
         else: grade = 1
 
-        for index in range(5):
-            if index < grade:
-                line_points = [{"x": index * 4 + 4, "y": 21 - 4 * index}, {"x": index * 4 + 4, "y": 25}]
-            else:
-                line_points = [{"x": index * 4 + 4, "y": 23}, {"x": index * 4 + 4, "y": 25}]
-            line = lv.line(signal_icon)
-            line.set_points(line_points, len(line_points))  # Set the points
-            line.set_style_line_width(3, 0)
-            line.set_style_line_color(lv.color_hex3(0xFFF), 0)
+        # A single bare object draws all five bars itself
+        signal_icon = lv.obj(parent)
+        signal_icon.remove_style_all()
+        signal_icon.set_size(28, 28)
+        signal_icon.add_event_cb(lambda e: draw_signal_bars(e, grade), lv.EVENT.DRAW_MAIN, None)
 
     # If the signal icon is None, return align_obj
     if signal_icon is None: return align_obj
@@ -200,7 +203,7 @@ def show_signal(parent, align_obj, info, card_style):
     else:
         if align_obj is None: signal_icon.align(lv.ALIGN.TOP_RIGHT, 10, -4)
         else:
-            align_obj.del_async()
+            align_obj.delete_async()
             signal_icon.align(lv.ALIGN.TOP_RIGHT, 10, -4)
 
     return signal_icon
@@ -233,6 +236,8 @@ async def show_card(parent, s_info, card_type):
     live_info = data_storage.get_live_info(s_info["sensor_id"])
     record_info = data_storage.get_record_info(s_info["sensor_id"])
     calibration = {"temperature": 0, "humidity": 0}
+    # Read the unit once for the whole card
+    unit = formatter.temp_unit()
 
     align_obj = None
     probe_state = live_info.get("probe_state", 1)
@@ -245,7 +250,7 @@ async def show_card(parent, s_info, card_type):
 
     # Time difference/measurement difference display
     if record_info and card_style["elapsed_time"]:
-        show_elapsed_time(parent, live_info, record_info, calibration)
+        show_elapsed_time(parent, live_info, record_info, calibration, unit)
 
     # Data display
     # Create a container at the end of parent to store measurement controls
@@ -268,4 +273,4 @@ async def show_card(parent, s_info, card_type):
         tip_label.set_style_text_align(lv.TEXT_ALIGN.CENTER, 0)
         tip_label.align(lv.ALIGN.CENTER, 0, 5)
     else:
-        show_measure(m_obj, live_info, calibration, card_type)
+        show_measure(m_obj, live_info, calibration, card_type, unit)
@@ -1,23 +1,27 @@
 import json
+import struct
 import picoweb
-import settings
-import clocktime
 from . import base
+from . import formatter
 from . import product
+from . import profiler
+from . import timeslice
+
+_STREAM_CHUNK_RECORDS = 32 # Number of history records serialized per write
 
 _app_mgr = None # Application manager instance
 _product_registry = None # Mapping of product name to its model
 
-def get_selected_sensors():
+def iter_selected_sensors():
     """
-    Retrieve a list of selected sensors with display info.
-    Returns a list of dicts: {
+    Yield the selected sensors with display info one at a time.
+    Each item is a dict: {
         model, lastSeen, nickname, sensorId, brand
     }
     """
-    sensor_list = []
     config = _app_mgr.config()
     selected_configs = config.get("selected", [])
+    is_hour24 = formatter.hour24()
 
     for sensor in selected_configs:
         p_model = _product_registry.get(sensor["product_name"], {})
@@ -36,36 +40,72 @@ def get_selected_sensors():
             timestamp = p_model.get_record_info(sensor["sensor_id"]).get("timestamp", None)
 
         # Format last seen time or use placeholder
-        if timestamp is None:
-            last_seen = "-/-/- -:-"
-        else:
-            tm = clocktime.datetime(timestamp)
-            # Decide whether to use 12-hour format based on settings
-            if not settings.hour24():
-                if tm[3] < 12:
-                    hour = str(tm[3])
-                    time_tip = ""
-                elif tm[3] == 12:
-                    hour = str(tm[3])
-                    time_tip = " PM"
-                else:
-                    hour = str(tm[3] - 12)
-                    time_tip = " PM"
-            else:
-                time_tip = ""
-                hour = f"{tm[3]:02d}"
-            minute = f"{tm[4]:02d}"
-            last_seen = "%s/%s/%d %s:%s%s" % (f"{tm[1]:02d}", f"{tm[2]:02d}", tm[0], hour, minute, time_tip) #"10/03/2024 15:59"
+        last_seen = formatter.format_datetime(timestamp, is_hour24)
 
-        sensor_list.append({
+        yield {
             "model": model_name,
             "lastSeen": last_seen,
             "nickname": sensor["nickname"],
             "sensorId": sensor["sensor_id"],
             "brand": sensor["product_name"],
-        })
+        }
+
+def get_selected_sensors():
+    """
+    Retrieve a list of selected sensors with display info.
+    """
+    return list(iter_selected_sensors())
 
-    return sensor_list
+async def awrite_json_items(resp, head, items, tail="]}"):
+    """
+    Stream a JSON document whose payload is an array.
+        - head: opening text up to and including "["
+        - items: iterable of JSON-serializable objects, written one at a time
+        - tail: closing text
+    Only one item is serialized at a time, so the heap never holds the whole document.
+    """
+    await resp.awrite(head)
+    sep = ""
+    for item in items:
+        await resp.awrite(sep + json.dumps(item))
+        sep = ","
+    await resp.awrite(tail)
+
+async def awrite_history_json(resp, sensor_id, raw):
+    """
+    Stream one sensor's packed history as a JSON object:
+    {"sensorId": ..., "fields": [...], "records": [[...], ...]}
+    """
+    data = raw.get("data", b"")
+    fmt, length = raw["format"], raw["length"]
+    total = len(data) - len(data) % length
+    await resp.awrite('{"sensorId": %s, "fields": %s, "records": [' % (json.dumps(sensor_id), json.dumps(raw["fields"])))
+
+    sep = ""
+    chunk_size = length * _STREAM_CHUNK_RECORDS
+    for start in range(0, total, chunk_size):
+        end = min(start + chunk_size, total)
+        # Decode a handful of records straight from the packed buffer
+        rows = [json.dumps(struct.unpack_from(fmt, data, off)) for off in range(start, end, length)]
+        await resp.awrite(sep + ",".join(rows))
+        sep = ","
+    await resp.awrite("]}")
+
+async def awrite_history_binary(resp, sensor_id, raw):
+    """
+    Stream one sensor's packed history as a binary block:
+        u8 id length | id | u8 format length | struct format | u16 record count | records
+    All integers are little-endian, records use the struct format as stored on disk.
+    """
+    data = raw.get("data", b"")
+    fmt, length = raw["format"], raw["length"]
+    count = len(data) // length
+    s_id = sensor_id.encode()
+    await resp.awrite(struct.pack("<B", len(s_id)) + s_id + struct.pack("<B", len(fmt)) + fmt.encode() + struct.pack("<H", count))
+
+    chunk_size = length * _STREAM_CHUNK_RECORDS
+    for start in range(0, count * length, chunk_size):
+        await resp.awrite(data[start:min(start + chunk_size, count * length)])
 
 async def get_max_selectable(req, resp):
     """
@@ -79,6 +119,132 @@ async def get_max_selectable(req, resp):
     await picoweb.start_response(resp, status=res["code"], content_type="application/json")
     await resp.awrite(json.dumps(res))
 
+def _clone_config(config):
+    """
+    Copy the app config deep enough for operations to mutate the sensor list,
+    so a failed or unchanged operation never touches the live config.
+    """
+    clone = dict(config)
+    clone["selected"] = [dict(dev) for dev in config.get("selected", [])]
+    return clone
+
+def _commit_config(config):
+    """
+    Persist the config only if it differs from the stored one.
+    Returns True if a write happened.
+    """
+    if config == _app_mgr.config(): return False
+    _app_mgr.config(config)
+    return True
+
+def _op_card_view(config, data, actions):
+    # Set the number of display cards
+    if "displayCount" not in data: return {"code": "422", "msg": "displayCount is required"}
+    config["display_mode"] = data["displayCount"]
+    return {"code": "200"}
+
+def _op_clear_cache(config, data, actions):
+    # Clear the cache of a selected sensor once the batch succeeded
+    if "sensorId" not in data: return {"code": "422", "msg": "sensorId is required"}
+    for sensor in config.get("selected", []):
+        if sensor["sensor_id"] != data["sensorId"]: continue
+        p_model = _product_registry.get(sensor["product_name"], None)
+        if p_model and hasattr(p_model, "clear_cache"):
+            actions.append((p_model.clear_cache, sensor["sensor_id"]))
+        return {"code": "200", "msg": "cache cleared"}
+    return {"code": "404", "msg": "sensorId not found"}
+
+def _op_delete_sensor(config, data, actions):
+    # Remove a sensor from the selected list, its data is deleted once the batch succeeded
+    if "sensorId" not in data: return {"code": "422", "msg": "sensorId is required"}
+    selected_sensor = config.get("selected", [])
+    sensor_ids = [dev["sensor_id"] for dev in selected_sensor]
+    if data["sensorId"] not in sensor_ids: return {"code": "404", "msg": "sensorId not found"}
+
+    del_sensor = selected_sensor.pop(sensor_ids.index(data["sensorId"]))
+    p_model = _product_registry.get(del_sensor["product_name"], None)
+    if p_model and hasattr(p_model, "delete_sensor_data"):
+        actions.append((p_model.delete_sensor_data, del_sensor["sensor_id"]))
+    config["selected"] = selected_sensor
+    return {"code": "200"}
+
+def _op_nickname(config, data, actions):
+    # Update the nickname of a selected sensor
+    if "sensorId" not in data or "nickname" not in data:
+        return {"code": "422", "msg": "sensorId and nickname are required"}
+    for sensor in config.get("selected", []):
+        if sensor["sensor_id"] != data["sensorId"]: continue
+        sensor["nickname"] = data["nickname"]
+    return {"code": "200"}
+
+def _op_add_sensors(config, data, actions):
+    # Add one or more sensors under the given product/model
+    if "productName" not in data or "modelId" not in data or "sensorIds" not in data:
+        return {"code": "422", "msg": "productName and modelId and sensorIds are required"}
+    selected_sensor = config.get("selected", [])
+    sensor_ids = [dev["sensor_id"] for dev in selected_sensor]
+    for sensor_id in data["sensorIds"]:
+        if sensor_id in sensor_ids: continue
+        selected_sensor.append({
+            "sensor_id": sensor_id,
+            "nickname": sensor_id[-6:],
+            "dev_model": data["modelId"],
+            "product_name": data["productName"]})
+        sensor_ids.append(sensor_id)
+    config["selected"] = selected_sensor
+    return {"code": "200"}
+
+# Config operations available to the single-purpose routes and to /sensor_app/batch
+_CONFIG_OPS = {
+    "card_view": _op_card_view,
+    "clear_cache": _op_clear_cache,
+    "delete_sensor": _op_delete_sensor,
+    "nickname": _op_nickname,
+    "add_sensors": _op_add_sensors,
+}
+
+def apply_config_ops(ops):
+    """
+    Apply a list of config operations atomically.
+        - ops: list of dicts, each with an "op" name from _CONFIG_OPS plus its arguments.
+    All operations run on a copy of the config; if one fails nothing is persisted
+    and no side effect runs. Otherwise the config is written at most once and the
+    deferred side effects (e.g. deleting sensor data) run afterwards.
+    Returns the result dict of the failed operation (with its "index"), or {"code": "200", "persisted": bool}.
+    """
+    config = _clone_config(_app_mgr.config())
+    actions = []
+    for index, op in enumerate(ops):
+        handler = _CONFIG_OPS.get(op.get("op", None), None) if isinstance(op, dict) else None
+        if handler is None: return {"code": "422", "msg": "unknown op", "index": index}
+
+        res = handler(config, op, actions)
+        if res["code"] != "200":
+            res["index"] = index
+            return res
+
+    persisted = _commit_config(config)
+    for action, arg in actions: action(arg)
+    return {"code": "200", "persisted": persisted}
+
+async def config_op_response(req, resp, method, op):
+    """
+    Run a single config operation for a single-purpose route and write its JSON response.
+    """
+    res = {"code": "403"}
+    if req.method == method:
+        await req.read_json_data()
+        data = dict(req.form)
+        data["op"] = op
+        res = apply_config_ops([data])
+        # Keep the single-purpose responses as they were
+        if "index" in res: del res["index"]
+        if "persisted" in res: del res["persisted"]
+        if res["code"] == "200" and op == "clear_cache": res["msg"] = "cache cleared"
+
+    await picoweb.start_response(resp, status=res["code"], content_type="application/json")
+    await resp.awrite(json.dumps(res))
+
 async def card_view(req, resp):
     """
     POST /sensor_app/card_view
@@ -86,131 +252,177 @@ async def card_view(req, resp):
     GET /sensor_app/card_view
         - Retrieve the current display card count ("displayCount") from config.
     """
-    res = {"code": "403"}
-    config = _app_mgr.config()
-
-    if req.method == "POST":
-        await req.read_json_data()
-        if "displayCount" not in req.form:
-            res["code"] = "422"
-            res["msg"] = "displayCount is required"
-        else:
-            if config.get("display_mode", None) != req.form["displayCount"]:
-                config["display_mode"] = req.form["displayCount"]
-                _app_mgr.config(config)
-            res = {"code": "200"}
-    elif req.method == "GET":
-        res = {"code": "200", "displayCount": config.get("display_mode", 1)}
+    if req.method == "GET":
+        res = {"code": "200", "displayCount": _app_mgr.config().get("display_mode", 1)}
+        await picoweb.start_response(resp, status=res["code"], content_type="application/json")
+        await resp.awrite(json.dumps(res))
+        return
 
-    await picoweb.start_response(resp, status=res["code"], content_type="application/json")
-    await resp.awrite(json.dumps(res))
+    await config_op_response(req, resp, "POST", "card_view")
 
 async def clear_cache(req, resp):
     """
     POST /sensor_app/clear_cache
         - Clear the cache for a given sensor ("sensorId") if it exists in selected list.
     """
-    res = {"code": "403"}
-    config = _app_mgr.config()
-
-    if req.method == "POST":
-        await req.read_json_data()
-        if "sensorId" not in req.form:
-            res["code"] = "422"
-            res["msg"] = "sensorId is required"
-        else:
-            selected_sensor = config.get("selected", [])
-            sensor_ids = [dev["sensor_id"] for dev in selected_sensor]
-            if req.form["sensorId"] in sensor_ids:
-                sensor =selected_sensor[sensor_ids.index(req.form["sensorId"])]
-                p_model = _product_registry.get(sensor["product_name"], None)
-                if p_model and hasattr(p_model, "clear_cache"):
-                    p_model.clear_cache(sensor["sensor_id"])
-                res["code"] = "200"
-                res["msg"] = "cache cleared"
-            else:
-                res["code"] = "404"
-                res["msg"] = "sensorId not found"
-
-    await picoweb.start_response(resp, status=res["code"], content_type="application/json")
-    await resp.awrite(json.dumps(res))
+    await config_op_response(req, resp, "POST", "clear_cache")
 
 async def delete_sensor(req, resp):
     """
     DELETE /sensor_app/delete_sensor
         - Remove a sensor ("sensorId") from selected list and delete its data via product model.
     """
-    res = {"code": "403"}
-    config = _app_mgr.config()
+    await config_op_response(req, resp, "DELETE", "delete_sensor")
+
+async def get_sensors(req, resp):
+    """
+    GET /sensor_app/get_sensors
+        - Return the list of currently selected sensors with display info.
+    """
+    if req.method != "GET":
+        await picoweb.start_response(resp, content_type="application/json")
+        await resp.awrite(json.dumps({"code": "403"}))
+        return
+
+    # Stream one sensor at a time instead of dumping the whole list
+    await picoweb.start_response(resp, content_type="application/json")
+    await awrite_json_items(resp, '{"code": "200", "sensors": [', iter_selected_sensors())
 
-    if req.method == "DELETE":
+async def get_histories(req, resp):
+    """
+    POST /sensor_app/get_histories
+        - Return the history of several selected sensors ("sensorIds") in one response.
+        - "format": "json" (default) streams records in chunks, "binary" streams the packed records.
+    """
+    res = {"code": "403"}
+    if req.method == "POST":
         await req.read_json_data()
-        if "sensorId" not in req.form:
+        if "sensorIds" not in req.form:
             res["code"] = "422"
-            res["msg"] = "sensorId is required"
+            res["msg"] = "sensorIds is required"
+        else: res["code"] = "200"
+
+    if res["code"] != "200":
+        await picoweb.start_response(resp, status=res["code"], content_type="application/json")
+        await resp.awrite(json.dumps(res))
+        return
+
+    binary = req.form.get("format", "json") == "binary"
+    selected = {dev["sensor_id"]: dev for dev in _app_mgr.config().get("selected", [])}
+
+    if binary: await picoweb.start_response(resp, content_type="application/octet-stream")
+    else:
+        await picoweb.start_response(resp, content_type="application/json")
+        await resp.awrite('{"code": "200", "histories": [')
+
+    sep = ""
+    for sensor_id in req.form["sensorIds"]:
+        sensor = selected.get(sensor_id, None)
+        if not sensor: continue
+        p_model = _product_registry.get(sensor["product_name"], None)
+        if not p_model or not hasattr(p_model, "get_history_raw"): continue
+        raw = p_model.get_history_raw(sensor_id)
+        if not raw: continue
+
+        if binary: await awrite_history_binary(resp, sensor_id, raw)
         else:
-            selected_sensor = config.get("selected", [])
-            sensor_ids = [dev["sensor_id"] for dev in selected_sensor]
-            if req.form["sensorId"] in sensor_ids:
-                del_sensor =selected_sensor.pop(sensor_ids.index(req.form["sensorId"]))
-                p_model = _product_registry.get(del_sensor["product_name"], None)
-                if p_model and hasattr(p_model, "delete_sensor_data"):
-                    p_model.delete_sensor_data(del_sensor["sensor_id"])
-
-                config["selected"] = selected_sensor
-                _app_mgr.config(config)
-                res = {"code": "200"}
-            else:
-                res["code"] = "404"
-                res["msg"] = "sensorId not found"
+            await resp.awrite(sep)
+            await awrite_history_json(resp, sensor_id, raw)
+            sep = ","
 
-    await picoweb.start_response(resp, status=res["code"], content_type="application/json")
-    await resp.awrite(json.dumps(res))
+    if not binary: await resp.awrite("]}")
 
-async def get_sensors(req, resp):
+async def history(req, resp):
     """
-    GET /sensor_app/get_sensors
-        - Return the list of currently selected sensors with display info.
+    GET /sensor_app/history?sensorId=...&start=...&end=...&step=...&format=csv|binary
+        - Export a selected sensor's history straight from flash.
+        - start/end: optional epoch range (inclusive), step: minimum seconds between two records.
+        - format: "csv" (default) or "binary" (records packed as stored, layout given in the X-Record-* headers).
     """
     res = {"code": "403"}
     if req.method == "GET":
-        res["code"] = "200"
-        res["sensors"] = get_selected_sensors()
+        req.parse_qs()
+        form = req.form
+        try:
+            start = int(form["start"]) if form.get("start", "") else None
+            end = int(form["end"]) if form.get("end", "") else None
+            step = int(form.get("step", "") or 0)
+        except ValueError:
+            start = end = step = None
+
+        selected = {dev["sensor_id"]: dev for dev in _app_mgr.config().get("selected", [])}
+        if "sensorId" not in form:
+            res["code"] = "422"
+            res["msg"] = "sensorId is required"
+        elif step is None:
+            res["code"] = "422"
+            res["msg"] = "start, end and step must be integers"
+        elif form["sensorId"] not in selected:
+            res["code"] = "404"
+            res["msg"] = "sensorId not found"
+        else:
+            p_model = _product_registry.get(selected[form["sensorId"]]["product_name"], None)
+            if not p_model or not hasattr(p_model, "read_history"):
+                res["code"] = "404"
+                res["msg"] = "history not supported"
+            else: res["code"] = "200"
 
-    await picoweb.start_response(resp, content_type="application/json")
-    await resp.awrite(json.dumps(res))
+    if res["code"] != "200":
+        await picoweb.start_response(resp, status=res["code"], content_type="application/json")
+        await resp.awrite(json.dumps(res))
+        return
+
+    layout = p_model.get_history_layout()
+    fmt, length = layout["format"], layout["length"]
+    chunks = p_model.read_history(form["sensorId"], start, end, step)
+
+    if form.get("format", "csv") == "binary":
+        headers = {"X-Record-Format": fmt, "X-Record-Fields": ",".join(layout["fields"])}
+        await picoweb.start_response(resp, content_type="application/octet-stream", headers=headers)
+        for chunk in chunks: await resp.awrite(chunk)
+    else:
+        await picoweb.start_response(resp, content_type="text/csv")
+        await resp.awrite(",".join(layout["fields"]) + "\n")
+        for chunk in chunks:
+            rows = [",".join([str(v) for v in struct.unpack_from(fmt, chunk, off)]) for off in range(0, len(chunk), length)]
+            await resp.awrite("\n".join(rows) + "\n")
 
 async def nickname(req, resp):
     """
     PUT /sensor_app/nickname
         - Update the nickname of a selected sensor ("sensorId") in app configuration.
     """
-    res = {"code": "403"}
-    config = _app_mgr.config()
+    await config_op_response(req, resp, "PUT", "nickname")
 
-    if req.method == "PUT":
+async def batch(req, resp):
+    """
+    POST /sensor_app/batch
+        - Apply a list of config operations ("ops") atomically with a single persist.
+        - Each operation is {"op": name, ...arguments of the matching single-purpose route},
+          name being one of: card_view, clear_cache, delete_sensor, nickname, add_sensors.
+        - The config is only written if something actually changed ("persisted").
+    """
+    res = {"code": "403"}
+    if req.method == "POST":
         await req.read_json_data()
-        if "sensorId" not in req.form or "nickname" not in req.form:
+        if not isinstance(req.form.get("ops", None), list):
             res["code"] = "422"
-            res["msg"] = "sensorId and nickname are required"
+            res["msg"] = "ops is required"
         else:
-            selected_sensor = config.get("selected", [])
-            for sensor in selected_sensor:
-                if sensor["sensor_id"] != req.form["sensorId"]: continue
-                sensor["nickname"] = req.form["nickname"]
-
-            config["selected"] = selected_sensor
-            _app_mgr.config(config)
-            res = {"code": "200"}
+            res = apply_config_ops(req.form["ops"])
 
     await picoweb.start_response(resp, status=res["code"], content_type="application/json")
     await resp.awrite(json.dumps(res))
 
-
 async def ble_scan(req, resp):
     """
     POST /sensor_app/ble_scan
-        - Perform a BLE scan for nearby sensors given "productName" and "modelId".
+        - Start a background BLE scan for nearby sensors given "productName" and "modelId".
+        - Returns a "jobId" right away, a scan already running for the product is shared.
+    GET /sensor_app/ble_scan?jobId=...&modelId=...
+        - Poll a scan job: "running" tells whether it is still scanning,
+          "sensors" holds the sensors of the model discovered so far,
+          "timedOut" tells that the scan was ended after base._SCAN_JOB_TIMEOUT without reporting back.
     """
     res = {"code": "403"}
 
@@ -221,43 +433,64 @@ async def ble_scan(req, resp):
             res["code"] = "422"
             res["msg"] = "productName and modelId are required"
         else:
-            res["sensors"] = await base.search_nearby_sensors(req.form["productName"], req.form["modelId"])
+            job_id = base.start_scan_job(req.form["productName"])
+            if job_id is None:
+                res["running"] = False
+                res["timedOut"] = False
+                res["sensors"] = []
+            else:
+                res["jobId"] = job_id
+                res.update(base.get_scan_job(job_id, req.form["modelId"]))
+    elif req.method == "GET":
+        req.parse_qs()
+        try:
+            dev_model = int(req.form.get("modelId", ""))
+        except ValueError:
+            dev_model = None
+
+        job = base.get_scan_job(req.form.get("jobId", None), dev_model)
+        if "jobId" not in req.form or dev_model is None:
+            res["code"] = "422"
+            res["msg"] = "jobId and modelId are required"
+        elif job is None:
+            res["code"] = "404"
+            res["msg"] = "jobId not found"
+        else:
+            res = {"code": "200", "jobId": req.form["jobId"]}
+            res.update(job)
     await picoweb.start_response(resp, status=res["code"], content_type="application/json")
     await resp.awrite(json.dumps(res))
 
-async def add_sensors(req, resp):
+async def profile(req, resp):
     """
-    POST /sensor_app/add_sensors
-        - Add one or more sensors ("sensorIds") to the selected list under given product/model.
+    GET /sensor_app/profile
+        - Return whether profiling is enabled, the recorded measurements ("records", oldest first)
+          and the step timings of the last run of every time-sliced rebuild ("slices").
+    POST /sensor_app/profile
+        - Turn profiling on or off ("enabled"), turning it on clears the previous measurements.
     """
     res = {"code": "403"}
-    config = _app_mgr.config()
-
     if req.method == "POST":
-        res = {"code": "200"}
         await req.read_json_data()
-        data = req.form
-        if "productName" not in data or "modelId" not in data or "sensorIds" not in data:
+        if not isinstance(req.form.get("enabled", None), bool):
             res["code"] = "422"
-            res["msg"] = "productName and modelId and sensorIds are required"
+            res["msg"] = "enabled is required"
         else:
-            selected_sensor = config.get("selected", [])
-            sensor_ids = [dev["sensor_id"] for dev in selected_sensor]
-            for sensor_id in data["sensorIds"]:
-                if sensor_id in sensor_ids: continue
-                selected_sensor.append({
-                    "sensor_id": sensor_id,
-                    "nickname": sensor_id[-6:],
-                    "dev_model": data["modelId"],
-                    "product_name": data["productName"]})
-
-            config["selected"] = selected_sensor
-            _app_mgr.config(config)
-            res["code"] = "200"
+            profiler.enable(req.form["enabled"])
+            res = {"code": "200", "enabled": profiler.is_enabled()}
+    elif req.method == "GET":
+        res = {"code": "200", "enabled": profiler.is_enabled(), "records": profiler.records(), "slices": timeslice.get_last_runs()}
 
     await picoweb.start_response(resp, status=res["code"], content_type="application/json")
     await resp.awrite(json.dumps(res))
 
+async def add_sensors(req, resp):
+    """
+    POST /sensor_app/add_sensors
+        - Add one or more sensors ("sensorIds") to the selected list under given product/model.
+    """
+    await config_op_response(req, resp, "POST", "add_sensors")
+
 async def get_product_info(req, resp):
     """
     GET /sensor_app/get_product_info
@@ -282,12 +515,16 @@ def get_routes():
         ("/sensor_app/get_max_selectable", get_max_selectable),
         ("/sensor_app/delete_sensor", delete_sensor),
         ("/sensor_app/get_sensors", get_sensors),
+        ("/sensor_app/get_histories", get_histories),
+        ("/sensor_app/history", history),
         ("/sensor_app/clear_cache", clear_cache),
         ("/sensor_app/card_view", card_view),
         ("/sensor_app/nickname", nickname),
+        ("/sensor_app/batch", batch),
         ("/sensor_app/ble_scan", ble_scan),
         ("/sensor_app/add_sensors", add_sensors),
         ("/sensor_app/get_product_info", get_product_info),
+        ("/sensor_app/profile", profile),
     ]
 
 def init(apm):
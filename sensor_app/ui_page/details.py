@@ -3,6 +3,7 @@ import lvgl as lv
 import peripherals
 from .. import base
 from .. import product
+from .. import profiler
 
 # Get the screen resolution from peripherals
 _SCR_WIDTH, _SCR_HEIGHT = peripherals.screen.screen_resolution
@@ -12,6 +13,7 @@ _app_mgr = None     # application manager instance
 _curr_data = {}     # cached sensor data
 _sensor_id = None   # currently selected sensor ID
 _container = None   # container for detail page UI elements
+_s_model = None     # product model showing the details, reset on stop even if the sensor was removed meanwhile
 
 def get_sensor_info(sensor_id):
     """
@@ -49,7 +51,7 @@ async def show_details():
     """
     Build and display the detail page UI for the current sensor.
     """
-    global _container, _curr_data
+    global _container, _curr_data, _s_model
     if not _sensor_id: return
     sensor_info = get_sensor_info(_sensor_id)
     product_registry = product.get_product_registry()
@@ -73,6 +75,7 @@ async def show_details():
 
     # If the model defines a show_details function, invoke it
     if hasattr(s_model, "show_details"): s_model.show_details(_container, sensor_info)
+    _s_model = s_model
 
     # Add container to default group and enable editing mode
     lv.group_get_default().add_obj(_container)
@@ -99,7 +102,12 @@ async def on_stop():
     """
     Called when the detail page is stopped.
     """
-    global _scr, _sensor_id, _container
+    global _scr, _sensor_id, _container, _s_model
+
+    # The sensor may have been deleted from the web page meanwhile: reset the model that showed it,
+    # not the one its (missing) configuration would name, so that its live info callback is dropped
+    if _s_model and hasattr(_s_model, "reset_details_info"): await _s_model.reset_details_info()
+    _s_model = None
 
     if _app_mgr: _app_mgr.enter_root_page()
 
@@ -130,7 +138,8 @@ async def on_running_foreground():
     if _curr_data == tmp_data: return
 
     # Update the UI details if a method is provided
-    if hasattr(s_model, "update_details"): s_model.update_details(sensor_info)
+    if hasattr(s_model, "update_details"):
+        with profiler.section("update_details"): s_model.update_details(sensor_info)
     _curr_data = tmp_data
 
     await asyncio.sleep_ms(100)
@@ -3,6 +3,7 @@ import lvgl as lv
 import peripherals
 from .. import base
 from .. import product
+from .. import profiler
 
 # Constants for screen resolution
 _SCR_WIDTH, _SCR_HEIGHT = peripherals.screen.screen_resolution
@@ -147,7 +148,8 @@ async def on_running_foreground():
     if _record_data == tmp_data: return
 
     # Data changed → invoke model.refresh_history
-    if hasattr(s_model, "refresh_history"): s_model.refresh_history(_sensor_id)
+    if hasattr(s_model, "refresh_history"):
+        with profiler.section("refresh_history"): s_model.refresh_history(_sensor_id)
     _record_data = tmp_data
 
     await asyncio.sleep_ms(100)
\ No newline at end of file
@@ -4,6 +4,8 @@ import lvgl as lv
 import peripherals
 from .. import base
 from .. import product
+from .. import profiler
+from ..timeslice import TimeSlice
 from micropython import const
 
 # Display modes: single / dual / quad cards at once
@@ -32,6 +34,8 @@ _container = None               # Container for sensor cards
 _devices_info = {}              # {sensor_id: {"refresh": ts, "curr_info": {...}}}
 _selected_devices = []          # List of selected sensor configs
 _display_mode = _MODE_SINGLE    # Number of cards shown at once
+_prefetch_task = None           # Background task preparing the focused sensor's history
+_render_seq = 0                 # Incremented by every render_sensors call, a superseded render stops early
 
 def check_selected_device():
     """
@@ -146,9 +150,14 @@ async def render_sensors(focus_style=True):
     Render sensor cards in the container.
         - Create or clear cards based on `_display_mode`.
         - Call each product's `show_card` to populate content.
+        - Yield to the event loop between cards once a frame's worth of time is used;
+          a newer render_sensors call makes this one stop at the next card.
     """
-    global _focus_time, _devices_info
+    global _focus_time, _devices_info, _render_seq
     if not _container: return
+    _render_seq += 1
+    seq = _render_seq
+    slicer = TimeSlice("render_sensors", span=profiler.span("render_sensors"))
 
     # If number of children doesn't match display_mode, rebuild cards
     if _container.get_child_count() != _display_mode:
@@ -223,9 +232,28 @@ async def render_sensors(focus_style=True):
         except Exception as e:
             print(f"show card fail.[{str(e)}]")
 
+        await slicer.checkpoint(index)
+        if seq != _render_seq or not _container: return
+
+    slicer.finish()
     # Update focus timestamp
     _focus_time = time.ticks_ms()
 
+def prefetch_focused_history(product_registry):
+    """
+    Let the focused sensor's product prepare its history page in the background,
+    so that clicking the card opens it without decoding the history first.
+    Only one prefetch runs at a time; the product skips it if its data is still current.
+    """
+    global _prefetch_task
+    if _prefetch_task and not _prefetch_task.done(): return
+    if _focus_index >= len(_selected_devices): return
+
+    info = _selected_devices[_focus_index]
+    s_model = product_registry.get(info["product_name"], None)
+    if not hasattr(s_model, "prefetch_history"): return
+    _prefetch_task = asyncio.create_task(s_model.prefetch_history(info["sensor_id"]))
+
 async def show_home():
     """
     Build and display the home page:
@@ -307,9 +335,13 @@ async def on_stop():
     """
     Called when the app stops:
         - Remove active-state callbacks.
+        - Cancel a running history prefetch.
         - Clean up screen and container.
     """
-    global _scr, _container
+    global _scr, _container, _prefetch_task
+
+    if _prefetch_task and not _prefetch_task.done(): _prefetch_task.cancel()
+    _prefetch_task = None
 
     for p_model in product.get_product_registry().values():
         if hasattr(p_model, "set_active_state_callback"):
@@ -328,9 +360,11 @@ async def on_running_foreground():
         - For each visible sensor card:
             * Check if data has changed or 60s passed.
             * If so, update the card via `show_card`.
+        - Prefetch the history of the focused sensor.
     """
     global _focus_time
     if not _container: return
+    span = profiler.span("update_cards")
 
     curr_time = time.ticks_ms()
     # Restore card background if focus highlight has expired
@@ -341,11 +375,12 @@ async def on_running_foreground():
         _focus_time = curr_time
 
     # Update each displayed sensor card if needed
+    product_registry = product.get_product_registry()
     for index, info in enumerate(get_display_sensors()):
         s_id = info["sensor_id"]
         s_info = _devices_info.get(s_id, {})
         s_card = _container.get_child(index)
-        s_model = product.get_product_registry().get(info["product_name"], None)
+        s_model = product_registry.get(info["product_name"], None)
         if not s_info or not s_model or not s_card: continue
 
         try:
@@ -366,4 +401,6 @@ async def on_running_foreground():
         except Exception as e:
             print(f"show card fail.[{str(e)}]")
 
+    prefetch_focused_history(product_registry)
+    span.end()
     await asyncio.sleep_ms(300)
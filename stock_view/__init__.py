@@ -3,21 +3,32 @@ import asyncio
 import clocktime
 import lvgl as lv
 import peripherals
+from array import array
 from micropython import const
-from .service import get_stock_details
+from .service import get_stock_details, get_cached_stock_details, get_symbol_key
+from . import market_hours
+from . import profiler
+from . import http_pool
+from .timeslice import TimeSlice
 
 NAME = "Stock View" # App name
 CAN_BE_AUTO_SWITCHED = True # Whether the App supports auto-switching in carousel mode
 
 _MENU_ITEM_FOCUSED = lv.color_hex3(0x022) # Background color when a widget is focused
 _MENU_ITEM_DEFOCUSED = lv.color_hex3(0x000) # Background color when a widget is unfocused
-_STOCK_UPDATE_INTERVAL = const(900) # Time interval for updating stock information (in seconds)
+_STOCK_UPDATE_INTERVAL = const(900) # Time interval for updating stock information (in seconds) of exchanges with unknown trading hours
+_OPEN_UPDATE_INTERVAL = const(60) # Time interval for updating stock information (in seconds) while its exchange is open
 _SCR_WIDTH, _SCR_HEIGHT = peripherals.screen.screen_resolution  # Get the screen size from peripherals
 _ITEM_WIDTH, _ITEM_HEIGHT = (_SCR_WIDTH, const(60)) # Size of a single stock information item
+_VISIBLE_ROWS = _SCR_HEIGHT // _ITEM_HEIGHT # Stock rows fitting on the screen
+_OVERSCAN_ROWS = const(1) # Rows kept bound above and below the visible ones
+_PRICE_COLOR = const(0xFFFE66) # Color of an up-to-date price
+_STALE_PRICE_COLOR = const(0x888888) # Color of a cached price waiting for its refresh
+_HISTORY_SIZE = const(30) # Polled prices kept per symbol for the sparkline
+_SPARK_WIDTH, _SPARK_HEIGHT = (const(60), const(20)) # Size of the sparkline of a stock row
 
-_NO_SUBUNIT_CURRENCIES = ["JPY", "KRW", "VND", "CLP"] # Currencies that don't commonly use subunits (cents)
-_THREE_DECIMAL_CURRENCIES = ["KWD", "BHD", "OMR", "IQD", "JOD", "TND", "LYD"] # Currencies with three decimal places
 _DEFAULT_STOCK_SYMBOLS = ["MSFT:NASDAQ", "TSLA:NASDAQ", "NVDA:NASDAQ", "AAPL:NASDAQ", "GOOG:NASDAQ"] # Default stock configuration
+
 _CURRENCY_SYMBOLS= {
         "USD": "$",   # US Dollar
         "EUR": "€",   # Euro
@@ -40,12 +51,33 @@ _CURRENCY_SYMBOLS= {
         # ... Add more as needed
     }
 
+# ISO 4217 codes by number of decimal places (minor unit)
+_CURRENCY_DECIMALS = (
+    (0, "BIF CLP DJF GNF ISK JPY KMF KRW PYG RWF UGX UYI VND VUV XAF XOF XPF"),
+    (2, "AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BMD BND BOB BOV BRL BSD BTN BWP BYN BZD "
+        "CAD CDF CHE CHF CHW CNY COP COU CRC CUC CUP CVE CZK DKK DOP DZD EGP ERN ETB EUR FJD FKP GBP GEL "
+        "GHS GIP GMD GTQ GYD HKD HNL HTG HUF IDR ILS INR IRR JMD KES KGS KHR KPW KYD KZT LAK LBP LKR LRD "
+        "LSL MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK MXN MXV MYR MZN NAD NGN NIO NOK NPR NZD PAB PEN "
+        "PGK PHP PKR PLN QAR RON RSD RUB SAR SBD SCR SDG SEK SGD SHP SLE SLL SOS SRD SSP STN SVC SYP SZL "
+        "THB TJS TMT TOP TRY TTD TWD TZS UAH USD USN UYU UZS VED VES WST XCD XCG YER ZAR ZMW ZWG ZWL"),
+    (3, "BHD IQD JOD KWD LYD OMR TND"),
+    (4, "CLF UYW"),
+)
+# Format of a price in integer minor units: (sign and currency symbol, whole units, minor units), by decimal places
+_DECIMAL_FORMATS = ("{0}{1}", "{0}{1}.{2:01d}", "{0}{1}.{2:02d}", "{0}{1}.{2:03d}", "{0}{1}.{2:04d}")
+
 _scr = None  # Initialize screen variable
 _app_mgr = None  # Initialize app manager variable
-_stock_count = 0 # Number of stock information items currently displayed
-_last_updated = 0 # Timestamp of the last stock information update
+_exchange_updated = {} # {exchange: timestamp of the last update of its stocks}
+_exchange_fresh = {} # {exchange: timestamp of the last update that brought fresh quotes of all its stocks}
 _stock_details = [] # Current stock information for multiple stocks
 _stock_symbols = _DEFAULT_STOCK_SYMBOLS # Current stock configuration
+_pool = [] # [{widget name: widget, "index": bound stock, "shown": {...}}] Row widgets, rebound as the focus moves
+_row_symbols = [] # Symbols of the displayed stocks, in display order
+_focus_index = 0 # Index of the focused stock
+_top_index = 0 # Index of the stock in the top visible row
+_refresh_task = None # Background fetch started when the app starts with out-of-date quotes
+_price_history = {} # {symbol key: [array('f') ring of polled prices, prices stored, index of the next write]}
 
 def get_settings_json():
     return {
@@ -67,14 +99,18 @@ def get_settings_json():
 
 def _load_config():
     # Load application configuration
-    global _stock_symbols, _last_updated, _stock_details
+    global _stock_symbols, _exchange_updated, _exchange_fresh, _stock_details
     stock_cfg = _app_mgr.config()
     symbols = stock_cfg.get("stocks", None)
     if symbols:
         # Check if configuration has changed; if so, need to refresh stock information
         temp_symbols = [x.strip() for x in symbols.strip(",").split(",") ]
         if _stock_symbols != temp_symbols:
-            _last_updated = 0
+            _exchange_updated = {}
+            _exchange_fresh = {}
+            # Keep the price history of the symbols still configured
+            keys = [get_symbol_key(x) for x in temp_symbols]
+            for key in [x for x in _price_history if x not in keys]: del _price_history[key]
             _stock_details = []
             _stock_symbols = temp_symbols
         print(f"{NAME}: {_stock_symbols}")
@@ -94,26 +130,225 @@ def _load_config():
         _app_mgr.config(stock_cfg)
         return True
 
-async def display_single_stock(parent, price_info):
-    # Display information for a single stock
-    if ('symbol' not in price_info) or (price_info['symbol'] is None): return None
+def record_price(key, price):
+    # Append a polled price to the symbol's ring, once the ring is full the oldest price is overwritten
+    entry = _price_history.get(key, None)
+    if entry is None:
+        entry = [array("f", [0.0] * _HISTORY_SIZE), 0, 0]
+        _price_history[key] = entry
+    entry[0][entry[2]] = price
+    entry[2] = (entry[2] + 1) % _HISTORY_SIZE
+    if entry[1] < _HISTORY_SIZE: entry[1] += 1
+
+def update_sparkline_points(points, key):
+    """
+    Fill the points (a list of _HISTORY_SIZE {"x", "y"} dicts, reused between calls) with the symbol's
+    polled prices, oldest first, scaled to the sparkline box. Returns the number of points set.
+    """
+    entry = _price_history.get(key, None)
+    if not entry or entry[1] < 2: return 0
+    ring, count, head = entry
+    start = (head - count) % _HISTORY_SIZE
+    low = high = ring[start]
+    for i in range(count):
+        price = ring[(start + i) % _HISTORY_SIZE]
+        if price < low: low = price
+        if price > high: high = price
+
+    span = high - low
+    for i in range(count):
+        price = ring[(start + i) % _HISTORY_SIZE]
+        point = points[i]
+        point["x"] = i * (_SPARK_WIDTH - 1) // (_HISTORY_SIZE - 1)
+        # Higher prices are drawn higher up, an unchanged price is a flat line in the middle
+        point["y"] = int((high - price) * (_SPARK_HEIGHT - 1) / span) if span else _SPARK_HEIGHT // 2
+    return count
+
+def build_currency_formats():
+    # {currency: (symbol, minor units per unit, format string)}, built once at import
+    formats = {}
+    for decimals, codes in _CURRENCY_DECIMALS:
+        for code in codes.split():
+            formats[code] = (_CURRENCY_SYMBOLS.get(code, code), 10 ** decimals, _DECIMAL_FORMATS[decimals])
+    # No currency in the quote: US Dollar; the server could not tell the currency: no symbol
+    formats[None] = formats["USD"]
+    formats["Unknown"] = ("", 100, _DECIMAL_FORMATS[2])
+    return formats
+
+_CURRENCY_FORMATS = build_currency_formats() # {currency: (symbol, minor units per unit, format string)}
+
+def get_currency_format(currency):
+    """
+    (symbol, minor units per unit, format string) of a currency, a single dict lookup for the codes of the table.
+    Other spellings are resolved on every call and not added to the table, so whatever the server sends cannot grow it:
+    lower case codes like their upper case code, unknown codes are shown as such with two decimals,
+    and a value that is not a string (numeric field) like "Unknown".
+    """
+    if currency is not None and not isinstance(currency, str): return _CURRENCY_FORMATS["Unknown"]
+    entry = _CURRENCY_FORMATS.get(currency, None)
+    if entry is not None: return entry
+    return _CURRENCY_FORMATS.get(currency.upper(), None) or (currency, 100, _DECIMAL_FORMATS[2])
+
+def get_price_display(price_info):
+    # Texts and colors displayed for a stock's price, None when no price information is available
+    curr_price = price_info["currentPrice"]
+    prev_close = price_info["previousClose"]
+    if curr_price is None or not prev_close: return None
+
+    currency, scale, fmt = get_currency_format(price_info["currency"])
+    # Prices in integer minor units (cents ...): the difference shown is exactly the difference of the prices shown
+    amount = round(curr_price * scale)
+    diff_amount = amount - round(prev_close * scale)
+    # The direction follows the actual prices, also when they differ by less than a displayed unit
+    change = curr_price - prev_close
+    color = 0xA50E0E if change < 0 else 0x137333
+    bgcolor = 0xFCE8E6 if change < 0 else 0xE6f4EA
+    arrow = lv.SYMBOL.DOWN if change < 0 else lv.SYMBOL.UP
+    prefix = "-" + currency if change < 0 else "+" + currency
+
+    if change == 0: prefix, arrow = "", " "
+    if diff_amount < 0: diff_amount = -diff_amount
+    sign = ""
+    if amount < 0: sign, amount = "-", -amount
+
+    # Ratio in hundredths of a percent
+    diff_ratio = round(10000 * change / prev_close)
+    if diff_ratio < 0: diff_ratio = -diff_ratio
+
+    return {
+        "amount": fmt.format(sign + currency, amount // scale, amount % scale),
+        "diff": fmt.format(prefix, diff_amount // scale, diff_amount % scale),
+        "ratio": "{}.{:02d}%".format(diff_ratio // 100, diff_ratio % 100),
+        "arrow": arrow,
+        "color": color,
+        "bgcolor": bgcolor,
+    }
 
-    # Create container
-    menu_cont = lv.menu_cont(parent)
-    menu_cont.set_size(_ITEM_WIDTH, _ITEM_HEIGHT)
-    menu_cont.set_style_pad_all(0, lv.PART.MAIN)
+def create_price_widgets(row):
+    # Create the price, difference and ratio labels of a stock row
+    cont = row["cont"]
+    amount = lv.label(cont)
+    amount.set_width(_ITEM_WIDTH // 3 + 5)
+    amount.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
+    amount.set_style_text_font(lv.font_ascii_bold_22, 0)
+    amount.align(lv.ALIGN.BOTTOM_LEFT, -12, 10)
+
+    diff_amount = lv.label(cont)
+    diff_amount.set_width(_ITEM_WIDTH // 3 - 10)
+    diff_amount.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
+    diff_amount.set_style_text_font(lv.font_ascii_bold_22, 0)
+    diff_amount.align(lv.ALIGN.BOTTOM_LEFT, 100, 10)
+
+    ratio_obj = lv.obj(cont)
+    ratio_obj.set_size(110, 32)
+    ratio_obj.set_style_pad_all(0, 0)
+    ratio_obj.set_style_border_width(0, 0)
+    ratio_obj.align(lv.ALIGN.BOTTOM_RIGHT, 10, 10)
+
+    diff_ratio_label = lv.label(ratio_obj)
+    diff_ratio_label.set_style_text_font(lv.font_ascii_bold_22, 0)
+    diff_ratio_label.align(lv.ALIGN.CENTER, 10, 0)
+
+    arrow_text = lv.label(ratio_obj)
+
+    # Sparkline of the last polled prices, between the symbol and the short name
+    spark = lv.line(cont)
+    spark.set_size(_SPARK_WIDTH, _SPARK_HEIGHT)
+    spark.set_style_line_width(2, 0)
+    spark.set_style_line_rounded(True, 0)
+    spark.align(lv.ALIGN.TOP_LEFT, _ITEM_WIDTH // 3, -10)
+
+    # LVGL keeps referring to the points, they live as long as the row
+    spark_points = [{"x": 0, "y": 0} for _ in range(_HISTORY_SIZE)]
+
+    row.update({"amount": amount, "diff": diff_amount, "ratio_obj": ratio_obj, "ratio": diff_ratio_label, "arrow": arrow_text,
+                "spark": spark, "spark_points": spark_points})
+
+def create_tip_widget(row):
+    # Create the label indicating that the data source is not available
+    tip_label = lv.label(row["cont"])
+    tip_label.set_text("Stock information not found.")
+    tip_label.set_width(_ITEM_WIDTH)
+    tip_label.align(lv.ALIGN.BOTTOM_MID, 0, 10)
+    tip_label.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
+    tip_label.set_style_text_font(lv.font_ascii_18, lv.PART.MAIN)
+    tip_label.set_style_text_align(lv.TEXT_ALIGN.CENTER, lv.PART.MAIN)
+    tip_label.set_style_text_color(lv.color_hex(0x888888), lv.PART.MAIN)
+    row["tip"] = tip_label
+
+def set_row_text(row, key, text):
+    # Set the text of a row label if it changed, returns whether it did
+    if row["shown"].get(key, None) == text: return False
+    row[key].set_text(text)
+    row["shown"][key] = text
+    return True
+
+def update_single_stock(row, price_info):
+    # Bring the widgets of a stock row up to date, only the values that changed are touched
+    set_row_text(row, "short_name", price_info["shortName"])
+    display = get_price_display(price_info)
+    shown = row["shown"]
+
+    if display is None:
+        # No price information obtained, indicate data source not available
+        if shown.get("mode", None) == "tip": return
+        if row["amount"]:
+            for key in ("amount", "diff", "ratio_obj", "spark"): row[key].add_flag(lv.obj.FLAG.HIDDEN)
+        if row["tip"]: row["tip"].remove_flag(lv.obj.FLAG.HIDDEN)
+        else: create_tip_widget(row)
+        shown["mode"] = "tip"
+        return
 
-    cont = lv.obj(menu_cont)
+    if shown.get("mode", None) != "price":
+        if row["tip"]: row["tip"].add_flag(lv.obj.FLAG.HIDDEN)
+        if not row["amount"]: create_price_widgets(row)
+        elif shown.get("mode", None) == "tip":
+            for key in ("amount", "diff", "ratio_obj", "spark"): row[key].remove_flag(lv.obj.FLAG.HIDDEN)
+        shown["mode"] = "price"
+
+    set_row_text(row, "amount", display["amount"])
+    set_row_text(row, "diff", display["diff"])
+    # Quotes served from the cache are dimmed until they have been refreshed
+    stale = price_info.get("stale", False)
+    if shown.get("stale", None) != stale:
+        row["amount"].set_style_text_color(lv.color_hex(_STALE_PRICE_COLOR if stale else _PRICE_COLOR), 0)
+        shown["stale"] = stale
+    ratio_changed = set_row_text(row, "ratio", display["ratio"])
+    arrow_changed = set_row_text(row, "arrow", display["arrow"])
+    # The arrow is placed next to the ratio, follow the ratio's new width
+    if ratio_changed or arrow_changed:
+        row["arrow"].align_to(row["ratio"], lv.ALIGN.OUT_LEFT_MID, -4, 0)
+
+    if shown.get("color", None) != display["color"]:
+        color = lv.color_hex(display["color"])
+        for key in ("diff", "ratio", "arrow"): row[key].set_style_text_color(color, 0)
+        row["spark"].set_style_line_color(color, 0)
+        shown["color"] = display["color"]
+    if shown.get("bgcolor", None) != display["bgcolor"]:
+        row["ratio_obj"].set_style_bg_color(lv.color_hex(display["bgcolor"]), 0)
+        shown["bgcolor"] = display["bgcolor"]
+
+    # Redraw the sparkline only when a price was polled since it was last drawn
+    key = get_symbol_key(price_info["symbol"] or "")
+    entry = _price_history.get(key, None)
+    version = (entry[1], entry[2]) if entry else None
+    if shown.get("spark", None) != version:
+        count = update_sparkline_points(row["spark_points"], key)
+        row["spark"].set_points(row["spark_points"], count)
+        shown["spark"] = version
+
+def create_row(parent):
+    # Create the widgets of a pooled stock row, bound to a stock by bind_row
+    cont = lv.obj(parent)
     cont.set_style_radius(0, lv.PART.MAIN)
     cont.remove_flag(lv.obj.FLAG.SCROLLABLE)
     cont.set_size(_ITEM_WIDTH, _ITEM_HEIGHT)
-    cont.set_style_bg_color(lv.color_hex3(0x000), lv.PART.MAIN)
+    cont.set_style_bg_color(_MENU_ITEM_DEFOCUSED, lv.PART.MAIN)
     cont.set_style_border_side(lv.BORDER_SIDE.BOTTOM, lv.PART.MAIN)
     cont.set_style_border_color(lv.color_hex3(0xFFF), lv.PART.MAIN)
 
     # Display symbol
     symbol = lv.label(cont)
-    symbol.set_text(price_info["symbol"])
     symbol.set_width(_ITEM_WIDTH // 3 + 5)
     symbol.align(lv.ALIGN.TOP_LEFT, -8, -12)
     symbol.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
@@ -123,167 +358,196 @@ async def display_single_stock(parent, price_info):
 
     # Display short name
     short_name = lv.label(cont)
-    short_name.set_text(price_info["shortName"])
     short_name.align(lv.ALIGN.TOP_RIGHT, 5, -12)
-    short_name.set_width((_ITEM_WIDTH // 3) * 2 - 15)
+    short_name.set_width((_ITEM_WIDTH // 3) * 2 - 15 - _SPARK_WIDTH)
     short_name.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
     short_name.set_style_text_font(lv.font_ascii_18, lv.PART.MAIN)
     short_name.set_style_text_align(lv.TEXT_ALIGN.RIGHT, lv.PART.MAIN)
     short_name.set_style_text_color(lv.color_hex(0x888888), lv.PART.MAIN)
 
-    curr_price = price_info["currentPrice"]
-    prev_close = price_info["previousClose"]
-    if curr_price is not None and prev_close != 0:
-        # Choose currency symbol to display
-        if price_info["currency"] is None:
-            currency = _CURRENCY_SYMBOLS["USD"]
-        elif price_info["currency"].upper() in _CURRENCY_SYMBOLS:
-            currency = _CURRENCY_SYMBOLS[price_info["currency"].upper()]
-        elif price_info["currency"] == "Unknown":
-            currency = ""
-        else:
-            currency = price_info["currency"]
-
-        diff_amount = curr_price - prev_close
-        color = 0xA50E0E if diff_amount < 0 else 0x137333
-        bgcolor = 0xFCE8E6 if diff_amount < 0 else 0xE6f4EA
-        arrow = lv.SYMBOL.DOWN if diff_amount < 0 else lv.SYMBOL.UP
-        prefix = "-" + currency if diff_amount < 0 else "+" + currency
-
-        if diff_amount == 0: prefix = ""
-        if diff_amount < 0: diff_amount = -diff_amount
-
-        # Determine how many decimal places to display
-        if price_info["currency"] in _NO_SUBUNIT_CURRENCIES:
-            amount_number = "{:.0f}".format(round(curr_price, 0))
-            diff_amount_number = "{:.0f}".format(round(diff_amount, 0))
-        elif price_info["currency"] in _THREE_DECIMAL_CURRENCIES:
-            amount_number = "{:.3f}".format(round(curr_price, 3))
-            diff_amount_number = "{:.3f}".format(round(diff_amount, 3))
-        else:
-            amount_number = "{:.2f}".format(round(curr_price, 2))
-            diff_amount_number = "{:.2f}".format(round(diff_amount, 2))
-
-        amount_text = currency + amount_number
-        diff_amount_text = prefix + diff_amount_number
-
-        amount = lv.label(cont)
-        amount.set_text(amount_text)
-        amount.set_width(_ITEM_WIDTH // 3 + 5)
-        amount.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
-        amount.set_style_text_font(lv.font_ascii_bold_22, 0)
-        amount.set_style_text_color(lv.color_hex(0xFFFE66), 0)
-        amount.align(lv.ALIGN.BOTTOM_LEFT, -12, 10)
-
-        diff_amount = lv.label(cont)
-        diff_amount.set_text(amount_text)
-        diff_amount.set_width(_ITEM_WIDTH // 3 - 10)
-        diff_amount.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
-        diff_amount.set_style_text_font(lv.font_ascii_bold_22, 0)
-        diff_amount.set_text(diff_amount_text)
-        diff_amount.set_style_text_color(lv.color_hex(color), 0)
-        diff_amount.align(lv.ALIGN.BOTTOM_LEFT, 100, 10)
-
-        ratio_obj = lv.obj(cont)
-        ratio_obj.set_style_bg_color(lv.color_hex(bgcolor), 0)
-        ratio_obj.set_size(110, 32)
-        ratio_obj.set_style_pad_all(0, 0)
-        ratio_obj.set_style_border_width(0, 0)
-        ratio_obj.align(lv.ALIGN.BOTTOM_RIGHT, 10, 10)
-
-        diff_ratio =  100 * (curr_price - prev_close) / prev_close
-        if diff_ratio < 0: diff_ratio = -diff_ratio
-        diff_ratio_label = lv.label(ratio_obj)
-        diff_ratio_label.set_text("{:.2f}%".format(round(diff_ratio, 2)))
-        diff_ratio_label.set_style_text_font(lv.font_ascii_bold_22, 0)
-        diff_ratio_label.set_style_text_color(lv.color_hex(color), 0)
-        diff_ratio_label.align(lv.ALIGN.CENTER, 10, 0)
-
-        if prefix == "": arrow= " "
-        arrow_text = lv.label(ratio_obj)
-        arrow_text.set_text(arrow)
-        arrow_text.set_style_text_color(lv.color_hex(color), 0)
-        arrow_text.align_to(diff_ratio_label, lv.ALIGN.OUT_LEFT_MID, -4, 0)
-
-    else:
-        # No price information obtained, indicate data source not available
-        tip_label = lv.label(cont)
-        tip_label.set_text("Stock information not found.")
-        tip_label.set_width(_ITEM_WIDTH)
-        tip_label.align(lv.ALIGN.BOTTOM_MID, 0, 10)
-        tip_label.set_long_mode(lv.label.LONG.SCROLL_CIRCULAR)
-        tip_label.set_style_text_font(lv.font_ascii_18, lv.PART.MAIN)
-        tip_label.set_style_text_align(lv.TEXT_ALIGN.CENTER, lv.PART.MAIN)
-        tip_label.set_style_text_color(lv.color_hex(0x888888), lv.PART.MAIN)
-
-    return menu_cont
-
-def menu_cont_event_handler(e):
-    # Widget event callback for implementing widget switching
-    global _stock_count
+    # Price widgets and the "not found" tip are created on first use and then only updated
+    return {"cont": cont, "symbol": symbol, "short_name": short_name, "amount": None, "diff": None, "ratio_obj": None, "ratio": None,
+            "arrow": None, "tip": None, "index": -1, "shown": {}}
+
+def bind_row(row, index):
+    # Show the stock at index in a pooled row, only the values that differ from the previous stock are touched
+    price_info = _stock_details[index]
+    shown = row["shown"]
+    row["index"] = index
+    set_row_text(row, "symbol", price_info["symbol"] or "")
+    # The sparkline drawn belongs to the previous stock
+    shown.pop("spark", None)
+    # For the last stock, no need to add an underline
+    last = index == len(_stock_details) - 1
+    if shown.get("last", None) != last:
+        row["cont"].set_style_border_opa(lv.OPA.TRANSP if last else lv.OPA.COVER, lv.PART.MAIN)
+        shown["last"] = last
+    update_single_stock(row, price_info)
+
+@profiler.section("layout_rows")
+def layout_rows():
+    """
+    Bind the pooled rows to the stocks around the focused one and move them into place.
+    The visible window follows the focus; rows leaving the window (plus overscan) are rebound
+    to the stocks entering it, so the widget count does not depend on the number of stocks.
+    """
+    global _top_index
+    total = len(_stock_details)
+    visible = min(_VISIBLE_ROWS, total)
+    if _focus_index < _top_index: _top_index = _focus_index
+    elif _focus_index >= _top_index + visible: _top_index = _focus_index - visible + 1
+
+    # Overscan rows are bound above and below the visible ones, fewer at the ends of the list
+    start = max(0, min(_top_index - _OVERSCAN_ROWS, total - len(_pool)))
+    window = range(start, start + len(_pool))
+    bound = [row["index"] for row in _pool]
+    free = [row for row in _pool if row["index"] not in window]
+    for index in window:
+        if index not in bound: bind_row(free.pop(), index)
+
+    for row in _pool:
+        shown = row["shown"]
+        y = (row["index"] - _top_index) * _ITEM_HEIGHT
+        if shown.get("y", None) != y:
+            row["cont"].set_pos(0, y)
+            shown["y"] = y
+        # The focused stock is highlighted when the list is longer than the screen
+        focused = row["index"] == _focus_index and total > _VISIBLE_ROWS
+        if shown.get("focused", None) != focused:
+            row["cont"].set_style_bg_color(_MENU_ITEM_FOCUSED if focused else _MENU_ITEM_DEFOCUSED, lv.PART.MAIN)
+            shown["focused"] = focused
+
+def list_event_handler(e):
+    """
+    Handle key and focus events on the stock list:
+        - Left/Right (Up/Down): move the focus to the previous/next stock
+        - Focused: ensure LVGL group is in editing mode so that keys reach the list
+    """
+    global _focus_index
     e_code = e.get_code()
-    target = e.get_target_obj()
-    lv_group = lv.group_get_default()
-
-    if lv_group.get_focused() == target and lv_group.get_editing():
-        lv_group.set_editing(False)
-
-    if e_code == lv.EVENT.FOCUSED:
-        target.scroll_to_view(lv.ANIM.OFF)
-        if _stock_count > 4: target.get_child(0).set_style_bg_color(_MENU_ITEM_FOCUSED, 0)
-
-    elif e_code == lv.EVENT.DEFOCUSED:
-        if _stock_count > 4: target.get_child(0).set_style_bg_color(_MENU_ITEM_DEFOCUSED, 0)
-    elif e_code == lv.EVENT.DELETE:
-        # FIXME: When a widget is deleted, lv.EVENT.DELETE is triggered first, then lv.EVENT.DEFOCUSED,
-        # causing an error when setting background color [widget already deleted]
-        _stock_count = 0
+    if e_code == lv.EVENT.KEY:
+        e_key = e.get_key()
+        if e_key in (lv.KEY.LEFT, lv.KEY.UP): step = -1
+        elif e_key in (lv.KEY.RIGHT, lv.KEY.DOWN): step = 1
+        else: return
+        if not _pool: return
+        _focus_index = (_focus_index + step) % len(_stock_details)
+        layout_rows()
+    elif e_code == lv.EVENT.FOCUSED:
+        lv_group = lv.group_get_default()
+        if lv_group.get_focused() != e.get_target_obj(): return
+        if not lv_group.get_editing(): lv_group.set_editing(True)
 
 async def display_multiple_stocks():
-    global _stock_count
+    global _pool, _row_symbols, _focus_index, _top_index
 
     if not _scr: return
+    scr = _scr
     _scr.clean()
+    _pool = []
+    _row_symbols = []
+    _focus_index = _top_index = 0
+    # Rows are built a frame's worth at a time so that key input is handled in between
+    slicer = TimeSlice("display_multiple_stocks", span=profiler.span("display_multiple_stocks"))
 
-    # Create a menu object
-    menu = lv.menu(_scr)
-    menu.set_size(_SCR_WIDTH, _SCR_HEIGHT)
-    menu.set_style_bg_color(lv.color_hex3(0x000), lv.PART.MAIN)
-    menu.center()
-
-    # Create a main page
-    main_page = lv.menu_page(menu, None)
-    # remove the scroll bar
-    main_page.set_scrollbar_mode(lv.SCROLLBAR_MODE.OFF)
-
-    for price_info in _stock_details:
-        # Try to render stock information
-        try:
-            menu_cont = await display_single_stock(main_page, price_info)
-            if not menu_cont: continue
-            menu_cont.add_event_cb(menu_cont_event_handler, lv.EVENT.ALL, None)
-            lv.group_get_default().add_obj(menu_cont)
-            _stock_count += 1
-        except Exception as e:
-            pass
-
-    if _stock_count > 0:
-        # For the last stock information widget, no need to add an underline
-        main_page.get_child(-1).get_child(0).set_style_border_width(0, lv.PART.MAIN)
-        menu.set_page(main_page)
-        # Focus on the first stock information
-        lv.group_focus_obj(main_page.get_child(0))
-    else:
+    if not _stock_details:
         # No stock information? Display "No Data" message
-        _scr.clean()
         tip_label = lv.label(_scr)
         tip_label.set_text("Not Data...")
         tip_label.set_style_text_font(lv.font_ascii_18, lv.PART.MAIN)
         tip_label.set_style_text_color(lv.color_hex(0xA7A7A7), lv.PART.MAIN)
         tip_label.center()
+        return
+
+    # A single focusable list, its rows are a pool reused for whichever stocks are on screen
+    stock_list = lv.obj(_scr)
+    stock_list.remove_style(None, lv.PART.MAIN)
+    stock_list.remove_style(None, lv.PART.SCROLLBAR)
+    stock_list.remove_flag(lv.obj.FLAG.SCROLLABLE)
+    stock_list.set_size(_SCR_WIDTH, _SCR_HEIGHT)
+    stock_list.set_style_bg_color(lv.color_hex3(0x000), lv.PART.MAIN)
+    stock_list.center()
+    stock_list.add_event_cb(list_event_handler, lv.EVENT.ALL, None)
+
+    for i in range(min(len(_stock_details), _VISIBLE_ROWS + 2 * _OVERSCAN_ROWS)):
+        _pool.append(create_row(stock_list))
+        await slicer.checkpoint(i)
+        # The app was stopped meanwhile, its screen is gone
+        if _scr is not scr: return
+
+    layout_rows()
+    slicer.finish()
+    _row_symbols = [x["symbol"] for x in _stock_details]
+
+    # Add the list to input group and enable edit mode
+    lv.group_get_default().add_obj(stock_list)
+    lv.group_focus_obj(stock_list)
+    lv.group_get_default().set_editing(True)
+
+async def refresh_stocks():
+    # Show the latest stock information: rows on screen are updated in place, keeping focus and scroll position,
+    # the list is only rebuilt when the stocks changed
+    symbols = [x["symbol"] for x in _stock_details]
+    if not _pool or symbols != _row_symbols:
+        await display_multiple_stocks()
+        return
 
+    with profiler.section("refresh_rows"):
+        for row in _pool:
+            try:
+                update_single_stock(row, _stock_details[row["index"]])
+            except Exception as e:
+                pass
+
+def get_due_symbols(now):
+    """
+    Configured symbols whose stock information needs fetching now, grouped by exchange.
+    An open exchange is refreshed every _OPEN_UPDATE_INTERVAL, a closed one once after its close
+    (to show the closing prices) and then not until it opens again; while that update did not bring
+    fresh quotes, it is retried every _STOCK_UPDATE_INTERVAL.
+    Exchanges with unknown trading hours are refreshed every _STOCK_UPDATE_INTERVAL.
+    """
+    due = []
+    for exchange, symbols in market_hours.group_by_exchange(_stock_symbols).items():
+        last = _exchange_updated.get(exchange, 0)
+        state = market_hours.is_open(exchange, now)
+        if state is None: is_due = now - last >= _STOCK_UPDATE_INTERVAL
+        elif state: is_due = now - last >= _OPEN_UPDATE_INTERVAL
+        else:
+            close = market_hours.last_close(exchange, now)
+            is_due = last < close or (_exchange_fresh.get(exchange, 0) < close and now - last >= _STOCK_UPDATE_INTERVAL)
+        if is_due: due += symbols
+    return due
+
+async def update_stocks(symbols=None):
+    # Fetch the stock information of the symbols (default: all configured ones) and update the display
+    global _stock_details
+    now = clocktime.now()
+    if symbols is None: symbols = _stock_symbols
+    details = await get_stock_details(symbols, _stock_symbols)
+    # Prices answered by the server feed the sparklines, cached fallbacks do not
+    for symbol, item in zip(symbols, details):
+        if item.get("currentPrice", None) is not None and not item.get("stale", False): record_price(get_symbol_key(symbol), item["currentPrice"])
+    # Merge into the displayed information, in the configured order
+    by_key = {get_symbol_key(x["symbol"]): x for x in _stock_details if x.get("symbol", None) is not None}
+    for symbol, item in zip(symbols, details): by_key[get_symbol_key(symbol)] = item
+    _stock_details = [by_key[k] for k in [get_symbol_key(x) for x in _stock_symbols] if k in by_key]
+    await refresh_stocks()
+    fresh = [get_symbol_key(symbol) for symbol, item in zip(symbols, details) if item.get("currentPrice", None) is not None and not item.get("stale", False)]
+    for exchange, group in market_hours.group_by_exchange(symbols).items():
+        _exchange_updated[exchange] = now
+        # Cached fallbacks of a failed fetch do not count, a closed exchange keeps being retried
+        if all([get_symbol_key(x) in fresh for x in group]): _exchange_fresh[exchange] = now
+
+def start_background_refresh(symbols=None):
+    # Fetch the stock information without holding up the caller, at most one fetch at a time
+    global _refresh_task
+    if _refresh_task and not _refresh_task.done(): return
+    _refresh_task = asyncio.create_task(update_stocks(symbols))
+
+@profiler.profile("on_start")
 async def on_start():
-    global _scr
+    global _scr, _stock_details
     if not _scr:
         _scr = lv.obj()
         _scr.set_style_bg_color(lv.color_hex3(0x000), lv.PART.MAIN)
@@ -308,38 +572,54 @@ async def on_start():
     loading_label.set_style_text_font(lv.font_ascii_22, lv.PART.MAIN)
     loading_label.set_style_text_color(lv.color_hex3(0xFFF), lv.PART.MAIN)
 
-    # If stock information already exists, display it directly
+    # If stock information already exists, display it directly, otherwise start from the quotes cached on flash
+    if not _stock_details:
+        _stock_details, cached_at = get_cached_stock_details(_stock_symbols)
+        for exchange in market_hours.group_by_exchange(_stock_symbols): _exchange_updated[exchange] = _exchange_fresh[exchange] = cached_at
     if _stock_details: await display_multiple_stocks()
 
+    # Out-of-date quotes stay on screen while fresh ones are fetched in the background
+    now = clocktime.now()
+    if now < 0: return
+    due = get_due_symbols(now)
+    if due: start_background_refresh(due)
+
+@profiler.profile("on_stop")
 async def on_stop():
     """Clean up the screen and leave the app when it stops."""
-    global _scr
+    global _scr, _pool, _row_symbols, _refresh_task
+    if _refresh_task and not _refresh_task.done(): _refresh_task.cancel()
+    _refresh_task = None
     if _scr:
         _scr.clean()
         _scr.delete_async()
         _scr = None
         _app_mgr.leave_root_page()
+    _pool = []
+    _row_symbols = []
+    # Do not hold server connections while the app is in the background
+    await http_pool.close_all()
 
 async def on_boot(apm):
     global _app_mgr
     _app_mgr = apm
 
+@profiler.profile("on_running_foreground")
 async def on_running_foreground():
     """
     Handle actions when the app is running in the foreground.
     """
-    global _last_updated, _stock_details
     # When no stock information is displayed, no need to update
     if _scr.get_child_count() < 1: return
+    # A background fetch is already under way
+    if _refresh_task and not _refresh_task.done(): return
 
     now = clocktime.now()
     # No need to update if network not connected / time not synchronized / no stock configuration
     if not net.connected() or now < 0 or not _stock_symbols: return
-    # No need to update if time interval not reached
-    if now - _last_updated < _STOCK_UPDATE_INTERVAL: return
-
-    # Time interval reached, fetch stock information again
-    _stock_details = await get_stock_details(_stock_symbols)
-    # Redraw stock information
-    await display_multiple_stocks()
-    _last_updated = now
+    # No need to update while the exchanges are closed or their time interval is not reached
+    due = get_due_symbols(now)
+    if not due: return
+
+    # Fetch the due exchanges' stock information again, each exchange's symbols together
+    await update_stocks(due)
@@ -0,0 +1,191 @@
+"""
+Local stand-in for the quote server of Stock View, to exercise the real request path
+(http_pool.py, chunking, ETags, the CSV format, the quote cache) from a computer on the same network.
+
+    python quote_server.py --port 8080 --latency-ms 80 --failure-rate 0.1
+
+Then set `_STOCK_API_URL = "http://<computer ip>:8080/quotes"` and `_USE_SIMULATED_DATA = False` in service.py.
+"""
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Currency of the quotes by exchange suffix of the symbol ("AAPL:NASDAQ"), USD for the others
+_CURRENCIES = {
+    "TSE": "CAD", "LON": "GBP", "ETR": "EUR", "FRA": "EUR", "EPA": "EUR", "AMS": "EUR", "BIT": "EUR", "BME": "EUR",
+    "SWX": "CHF", "TYO": "JPY", "KRX": "KRW", "HKG": "HKD", "SHA": "CNY", "SHE": "CNY", "NSE": "INR", "BOM": "INR",
+}
+_NO_DECIMAL_CURRENCIES = ("JPY", "KRW")
+
+class QuoteBook:
+    """Prices following a random walk per symbol, moving one step every `update_s` seconds (0: never)."""
+
+    def __init__(self, update_s=5.0, seed=None):
+        self.update_s = update_s
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.prices = {} # {symbol: [previous close, current price, walk step of the current price]}
+
+    def step_now(self):
+        return int(time.monotonic() / self.update_s) if self.update_s > 0 else 0
+
+    def quote(self, symbol):
+        # Quote of a configured symbol ("AAPL:NASDAQ"), its price brought up to the current walk step
+        name, _, exchange = symbol.partition(":")
+        currency = _CURRENCIES.get(exchange.upper(), "USD")
+        with self.lock:
+            entry = self.prices.get(name, None)
+            if entry is None:
+                price = self.random.uniform(20, 500) * (100 if currency in _NO_DECIMAL_CURRENCIES else 1)
+                entry = self.prices[name] = [price, price, self.step_now()]
+            # Catch up on the steps missed since the last request, at most a day's worth
+            steps = min(self.step_now() - entry[2], 86400)
+            for _ in range(steps): entry[1] *= 1 + self.random.gauss(0, 0.002)
+            entry[2] += steps
+            prev_close, price = entry[0], entry[1]
+
+        digits = 0 if currency in _NO_DECIMAL_CURRENCIES else 2
+        return {"symbol": name, "shortName": exchange, "currentPrice": round(price, digits), "previousClose": round(prev_close, digits), "currency": currency}
+
+class QuoteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # Keep-alive unless the client asks otherwise
+    disable_nagle_algorithm = True  # Headers and body are written separately, do not let delayed ACKs stall them
+
+    def setup(self):
+        # Runs once per connection: stands in for the DNS + TCP + TLS setup of the device's Wi-Fi link
+        self.server.quote_server.count("connections")
+        time.sleep(self.server.quote_server.handshake_ms / 1000)
+        super().setup()
+
+    def do_GET(self):
+        qs = self.server.quote_server
+        qs.count("requests")
+        time.sleep((qs.latency_ms + qs.random.uniform(0, qs.jitter_ms)) / 1000)
+
+        # Simulated failures: a connection closed without answer, or a server error
+        if qs.random.random() < qs.drop_rate:
+            qs.count("dropped")
+            self.close_connection = True
+            return
+        if qs.random.random() < qs.failure_rate:
+            qs.count("failures")
+            self.send_error(503, "Simulated failure")
+            return
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        symbols = [s for s in query.get("symbols", [""])[0].split(",") if s]
+        if url.path != "/quotes" or not symbols:
+            self.send_error(404 if url.path != "/quotes" else 400)
+            return
+        if qs.max_symbols and len(symbols) > qs.max_symbols:
+            self.send_error(400, f"At most {qs.max_symbols} symbols per request")
+            return
+
+        # Symbols missing from the answer, as when the upstream source does not know them
+        stocks = [qs.book.quote(s) for s in symbols if qs.random.random() >= qs.missing_rate]
+        if query.get("format", [""])[0] == "csv":
+            lines = ["symbol,currentPrice,previousClose,currency"] + [f"{x['symbol']},{x['currentPrice']},{x['previousClose']},{x['currency']}" for x in stocks]
+            body, content_type = "\n".join(lines).encode(), "text/csv"
+        else:
+            body, content_type = json.dumps({"stocks": stocks}).encode(), "application/json"
+
+        etag = '"%08x"' % zlib.crc32(body)
+        if self.headers.get("If-None-Match", None) == etag:
+            qs.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+        qs.count("body_bytes", len(body))
+
+    def log_message(self, *args):
+        if self.server.quote_server.verbose: super().log_message(*args)
+
+class QuoteServer:
+    """
+    Quote server answering GET /quotes?symbols=AAPL:NASDAQ,...[&format=csv] like the API Stock View expects.
+    Runs in the foreground (serve_forever) or in a background thread (start/stop), e.g. from a benchmark.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, handshake_ms=0, failure_rate=0.0, drop_rate=0.0,
+                 missing_rate=0.0, max_symbols=0, update_s=5.0, seed=None, verbose=False):
+        self.latency_ms = latency_ms       # Time to answer every request
+        self.jitter_ms = jitter_ms         # Random extra time added to the latency
+        self.handshake_ms = handshake_ms   # Setup time of every new connection
+        self.failure_rate = failure_rate   # Share of requests answered with 503
+        self.drop_rate = drop_rate         # Share of requests whose connection is closed without answer
+        self.missing_rate = missing_rate   # Share of symbols left out of an answer
+        self.max_symbols = max_symbols     # Most symbols accepted in one request, 0 for no limit
+        self.verbose = verbose
+        self.random = random.Random(seed)
+        self.book = QuoteBook(update_s, seed)
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer((host, port), QuoteHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.quote_server = self
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/quotes"
+
+    def count(self, key, value=1):
+        with self._lock: self.stats[key] += value
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"connections": 0, "requests": 0, "not_modified": 0, "failures": 0, "dropped": 0, "body_bytes": 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in quote server for Stock View")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on (default: all interfaces)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default 8080)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="time to answer a request (default 50)")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="random extra time per request (default 20)")
+    parser.add_argument("--handshake-ms", type=float, default=0, help="extra setup time of a new connection (default 0)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="share of requests answered with 503 (default 0)")
+    parser.add_argument("--drop-rate", type=float, default=0, help="share of requests closed without answer (default 0)")
+    parser.add_argument("--missing-rate", type=float, default=0, help="share of symbols left out of an answer (default 0)")
+    parser.add_argument("--max-symbols", type=int, default=0, help="most symbols per request, larger requests get 400 (default: no limit)")
+    parser.add_argument("--update-s", type=float, default=5, help="seconds between price moves, 0 for fixed prices (default 5)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed, for repeatable prices and failures")
+    args = parser.parse_args()
+
+    server = QuoteServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.handshake_ms, args.failure_rate, args.drop_rate,
+                         args.missing_rate, args.max_symbols, args.update_s, args.seed, verbose=True)
+    print(f"Serving quotes on http://{args.host}:{args.port}/quotes?symbols=AAPL:NASDAQ,VOD:LON (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n{server.stats}")
@@ -0,0 +1,164 @@
+# Module: keep-alive HTTP client sharing connections between requests to the same server
+import json
+import time
+import asyncio
+import arequests
+from micropython import const
+
+_IDLE_TIMEOUT_MS = const(30000) # Idle connections older than this are closed instead of reused
+_MAX_IDLE_PER_HOST = const(2)   # Idle connections kept per server
+_TIMEOUT_S = const(15)          # Time allowed for a whole request
+
+_pool = {} # {(host, port, ssl): [(reader, writer, last used ticks_ms), ...]} Idle connections
+_stats = {"opened": 0, "reused": 0, "fallback": 0} # Connections opened / requests served on a reused connection / requests handed to arequests
+
+class Response:
+    """Response of a pooled request, with the same reading interface as arequests responses."""
+
+    def __init__(self, status_code, reason, headers, content):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers   # Header names are lower case
+        self.content = content
+
+    async def text(self):
+        return self.content.decode()
+
+    async def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+def get_stats():
+    """Connection counters, to check how often connections are reused."""
+    return _stats
+
+def parse_url(url):
+    # Split an http(s) URL into (use ssl, host, port, path)
+    if url.startswith("https://"): use_ssl, rest, port = True, url[8:], 443
+    elif url.startswith("http://"): use_ssl, rest, port = False, url[7:], 80
+    else: raise ValueError(f"unsupported URL: {url}")
+
+    host, _, path = rest.partition("/")
+    if ":" in host:
+        host, port = host.split(":")
+        port = int(port)
+    return use_ssl, host, port, "/" + path
+
+async def close_connection(writer):
+    try:
+        writer.close()
+        await writer.wait_closed()
+    except Exception as e:
+        pass
+
+async def close_all():
+    """Close every idle connection, e.g. when the app stops."""
+    for conns in _pool.values():
+        for conn in conns: await close_connection(conn[1])
+    _pool.clear()
+
+async def take_connection(key):
+    # An idle connection to the server if one is recent enough, otherwise a new one; returns (reader, writer, reused)
+    conns = _pool.get(key, [])
+    now = time.ticks_ms()
+    while conns:
+        reader, writer, last_used = conns.pop()
+        if time.ticks_diff(now, last_used) < _IDLE_TIMEOUT_MS: return reader, writer, True
+        await close_connection(writer)
+
+    use_ssl, host, port = key[2], key[0], key[1]
+    reader, writer = await asyncio.open_connection(host, port, ssl=use_ssl)
+    _stats["opened"] += 1
+    return reader, writer, False
+
+def release_connection(key, reader, writer):
+    # Keep a connection whose response was read completely for the next request to the server
+    conns = _pool.setdefault(key, [])
+    if len(conns) >= _MAX_IDLE_PER_HOST: return False
+    conns.append((reader, writer, time.ticks_ms()))
+    return True
+
+async def read_body(reader, headers):
+    # Read the response body; returns (body, whether the connection can be reused)
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0: break
+            parts.append(await reader.readexactly(size))
+            await reader.readline()
+        # Skip trailers up to the blank line ending the message
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""): pass
+        return b"".join(parts), True
+
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        return (await reader.readexactly(length)) if length else b"", True
+
+    # No length: the body ends with the connection
+    return await reader.read(-1), False
+
+async def send_request(reader, writer, method, host, path, headers, data):
+    # Send one request and read its response; returns (Response, whether the connection can be reused)
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive"]
+    for name, value in headers.items(): lines.append(f"{name}: {value}")
+    if data is not None: lines.append(f"Content-Length: {len(data)}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    if data is not None: writer.write(data)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line: raise OSError("connection closed by server")
+    parts = status_line.decode().strip().split(" ", 2)
+    status_code = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ""
+
+    res_headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""): break
+        name, _, value = line.decode().partition(":")
+        res_headers[name.strip().lower()] = value.strip()
+
+    if method == "HEAD" or status_code in (204, 304) or 100 <= status_code < 200:
+        body, reusable = b"", True
+    else:
+        body, reusable = await read_body(reader, res_headers)
+    if res_headers.get("connection", "").lower() == "close": reusable = False
+    return Response(status_code, reason, res_headers, body), reusable
+
+async def pooled_request(method, url, headers, data):
+    use_ssl, host, port, path = parse_url(url)
+    key = (host, port, use_ssl)
+    # A reused connection may have been closed by the server meanwhile, retry once on a new one
+    for attempt in range(2):
+        reader, writer, reused = await take_connection(key)
+        try:
+            response, reusable = await send_request(reader, writer, method, host, path, headers, data)
+        except Exception as e:
+            writer.close()
+            if reused and attempt == 0: continue
+            raise
+        except BaseException:
+            # Cancelled by the timeout: the connection is in an unknown state
+            writer.close()
+            raise
+        if reused: _stats["reused"] += 1
+        if not reusable or not release_connection(key, reader, writer): await close_connection(writer)
+        return response
+
+async def request(method, url, headers=None, data=None):
+    """
+    Send an HTTP request, reusing an idle connection to the same server when there is one.
+    Returns a Response (status_code, headers, await text()/json()).
+    Falls back to arequests when the pooled request fails, so callers get the same behavior as before.
+    """
+    headers = headers or {}
+    if isinstance(data, str): data = data.encode()
+    try:
+        return await asyncio.wait_for(pooled_request(method, url, headers, data), _TIMEOUT_S)
+    except Exception as e:
+        _stats["fallback"] += 1
+        return await arequests.request(method, url, headers=headers, data=data)
@@ -0,0 +1,119 @@
+# Module: exchange trading sessions, used to refresh quotes only while their market is open
+from micropython import const
+
+_DST_NONE = const(0) # No daylight saving time
+_DST_US = const(1)   # Second Sunday of March 2:00 local to first Sunday of November 2:00 local
+_DST_EU = const(2)   # Last Sunday of March to last Sunday of October, both at 1:00 UTC
+
+# Exchange codes as used in the symbol suffix ("AAPL:NASDAQ") ->
+# (UTC offset of standard time in minutes, DST rule, session open, session close in local minutes since midnight)
+# Weekend days are closed; exchange holidays are not known and count as open days.
+_EXCHANGES = {
+    "NASDAQ": (-300, _DST_US, 570, 960),  # New York 9:30-16:00
+    "NYSE": (-300, _DST_US, 570, 960),
+    "NYSEARCA": (-300, _DST_US, 570, 960),
+    "NYSEAMERICAN": (-300, _DST_US, 570, 960),
+    "TSE": (-300, _DST_US, 570, 960),     # Toronto 9:30-16:00
+    "LON": (0, _DST_EU, 480, 990),        # London 8:00-16:30
+    "ETR": (60, _DST_EU, 540, 1050),      # Xetra 9:00-17:30
+    "FRA": (60, _DST_EU, 480, 1320),      # Frankfurt 8:00-22:00
+    "EPA": (60, _DST_EU, 540, 1050),      # Euronext Paris 9:00-17:30
+    "AMS": (60, _DST_EU, 540, 1050),      # Euronext Amsterdam 9:00-17:30
+    "BIT": (60, _DST_EU, 540, 1050),      # Milan 9:00-17:30
+    "BME": (60, _DST_EU, 540, 1050),      # Madrid 9:00-17:30
+    "SWX": (60, _DST_EU, 540, 1050),      # SIX Swiss 9:00-17:30
+    "TYO": (540, _DST_NONE, 540, 930),    # Tokyo 9:00-15:30
+    "KRX": (540, _DST_NONE, 540, 930),    # Seoul 9:00-15:30
+    "HKG": (480, _DST_NONE, 570, 960),    # Hong Kong 9:30-16:00
+    "SHA": (480, _DST_NONE, 570, 900),    # Shanghai 9:30-15:00
+    "SHE": (480, _DST_NONE, 570, 900),    # Shenzhen 9:30-15:00
+    "NSE": (330, _DST_NONE, 555, 930),    # India 9:15-15:30
+    "BOM": (330, _DST_NONE, 555, 930),
+}
+
+def days_from_civil(y, m, d):
+    # Days since 1970-01-01 of a proleptic Gregorian date
+    y -= m <= 2
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+def year_of_days(days):
+    # Year of a day number counted from 1970-01-01
+    z = days + 719468
+    era = (z if z >= 0 else z - 146096) // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    y = yoe + era * 400
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    return y + (1 if mp >= 10 else 0)
+
+def weekday(days):
+    # Day of the week of a day number, Monday is 0
+    return (days + 3) % 7
+
+def nth_sunday(year, month, n):
+    # Day number of the n-th Sunday of a month, n = -1 for the last one
+    if n > 0:
+        first = days_from_civil(year, month, 1)
+        return first + (6 - weekday(first)) % 7 + (n - 1) * 7
+    last = days_from_civil(year + (month == 12), month % 12 + 1, 1) - 1
+    return last - (weekday(last) + 1) % 7
+
+def is_dst(rule, std_offset, utc):
+    # Whether daylight saving time is in effect at a UTC epoch
+    if rule == _DST_NONE: return False
+    year = year_of_days(utc // 86400)
+    if rule == _DST_US:
+        # Switches at 2:00 local time: standard time going forward, daylight time going back
+        start = nth_sunday(year, 3, 2) * 86400 + 7200 - std_offset * 60
+        end = nth_sunday(year, 11, 1) * 86400 + 7200 - (std_offset + 60) * 60
+    else:
+        start = nth_sunday(year, 3, -1) * 86400 + 3600
+        end = nth_sunday(year, 10, -1) * 86400 + 3600
+    return start <= utc < end
+
+def get_exchange(symbol):
+    """Exchange code of a configured symbol ("AAPL:NASDAQ" -> "NASDAQ"), "" when there is none."""
+    return symbol.split(":")[1].strip().upper() if ":" in symbol else ""
+
+def group_by_exchange(symbols):
+    """{exchange: [symbols]} keeping the configured order of the symbols within each exchange."""
+    groups = {}
+    for symbol in symbols: groups.setdefault(get_exchange(symbol), []).append(symbol)
+    return groups
+
+def utc_offset(exchange, utc):
+    """UTC offset in minutes of the exchange's local time at a UTC epoch, None for an unknown exchange."""
+    info = _EXCHANGES.get(exchange, None)
+    if not info: return None
+    return info[0] + (60 if is_dst(info[1], info[0], utc) else 0)
+
+def is_open(exchange, utc):
+    """
+    Whether the exchange is in its trading session at a UTC epoch (clocktime.now()).
+    Returns None for an unknown exchange, whose hours cannot be told.
+    """
+    info = _EXCHANGES.get(exchange, None)
+    if not info: return None
+    local = utc + utc_offset(exchange, utc) * 60
+    if weekday(local // 86400) > 4: return False
+    minute = local % 86400 // 60
+    return info[2] <= minute < info[3]
+
+def last_close(exchange, utc):
+    """UTC epoch of the latest session close at or before utc, None for an unknown exchange."""
+    info = _EXCHANGES.get(exchange, None)
+    if not info: return None
+    day = (utc + utc_offset(exchange, utc) * 60) // 86400
+    # Walk back to the latest weekday whose close has passed (at most a weekend and today)
+    for _ in range(4):
+        close = day * 86400 + info[3] * 60
+        # The offset of that day may differ from today's when DST changed over the weekend
+        close -= utc_offset(exchange, close - info[0] * 60) * 60
+        if weekday(day) < 5 and close <= utc: return close
+        day -= 1
+    return close
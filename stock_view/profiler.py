@@ -0,0 +1,145 @@
+# Module: opt-in profiling of app lifecycle hooks and render sections
+import gc
+import time
+import lvgl as lv
+from micropython import const
+
+_RING_SIZE = const(64) # Number of most recent measurements kept
+
+_enabled = False # Profiling is off unless enable() is called, the hooks then only cost a flag check
+_ring = []       # Ring buffer of measurements: (name, start ticks_ms, duration ms, heap delta bytes, widget count)
+_ring_pos = 0    # Position of the next measurement once the ring is full
+
+def enable(on=True):
+    """Turn profiling on or off, turning it on clears the previous measurements."""
+    global _enabled
+    if on and not _enabled: clear()
+    _enabled = on
+
+def is_enabled():
+    return _enabled
+
+def clear():
+    """Drop all recorded measurements."""
+    global _ring, _ring_pos
+    _ring = []
+    _ring_pos = 0
+
+def count_objects(obj=None):
+    """Number of LVGL objects in the tree of obj (the active screen by default), obj included."""
+    if obj is None: obj = lv.screen_active()
+    if obj is None: return 0
+    total = 1
+    for i in range(obj.get_child_count()): total += count_objects(obj.get_child(i))
+    return total
+
+def begin():
+    """Start a measurement, returns the state to pass to end()."""
+    return (time.ticks_ms(), gc.mem_alloc())
+
+def end(name, state):
+    """Finish a measurement started with begin() and record it under name."""
+    start, alloc = state
+    add_record(name, start, time.ticks_diff(time.ticks_ms(), start), gc.mem_alloc() - alloc)
+
+def add_record(name, start, ms, alloc):
+    # Store a measurement in the ring buffer, together with the current widget count
+    global _ring_pos
+    record = (name, start, ms, alloc, count_objects())
+    if len(_ring) < _RING_SIZE:
+        _ring.append(record)
+    else:
+        _ring[_ring_pos] = record
+        _ring_pos = (_ring_pos + 1) % _RING_SIZE
+
+class section:
+    """
+    Context manager measuring a named block of synchronous code, or decorator measuring every call
+    of a synchronous function:
+        with profiler.section("refresh_rows"): ...
+        @profiler.section("load_chart_data")
+        def load_chart_data(): ...
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.state = None
+
+    def __enter__(self):
+        if _enabled: self.state = begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.state is not None: end(self.name, self.state)
+        self.state = None
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+        def wrapper(*args, **kwargs):
+            if not _enabled: return fn(*args, **kwargs)
+            state = begin()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                end(name, state)
+        return wrapper
+
+class span:
+    """
+    Measurement of an async render that gives the event loop turns in between (time slices):
+    only the time and heap growth between the pauses count, not the other tasks running meanwhile.
+        s = profiler.span("render_sensors")
+        ...; s.pause(); await asyncio.sleep_ms(0); s.resume(); ...
+        s.end()
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.ticks_ms()
+        self.ms = 0
+        self.alloc = 0
+        self.state = begin() if _enabled else None # None while paused or when profiling is off
+        self.recording = self.state is not None
+
+    def pause(self):
+        if self.state is None: return
+        start, alloc = self.state
+        self.ms += time.ticks_diff(time.ticks_ms(), start)
+        self.alloc += gc.mem_alloc() - alloc
+        self.state = None
+
+    def resume(self):
+        if self.recording and self.state is None: self.state = begin()
+
+    def end(self):
+        """Record the measurement, later calls do nothing."""
+        self.pause()
+        if self.recording: add_record(self.name, self.start, self.ms, self.alloc)
+        self.recording = False
+
+def profile(name):
+    """
+    Decorator for coroutine functions (lifecycle hooks, async render functions):
+    every awaited call is recorded under name while profiling is enabled.
+    """
+    def decorator(fn):
+        async def wrapper(*args, **kwargs):
+            if not _enabled: return await fn(*args, **kwargs)
+            state = begin()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                end(name, state)
+        return wrapper
+    return decorator
+
+def records():
+    """Recorded measurements, oldest first, as dicts ready to be serialized."""
+    ring = _ring[_ring_pos:] + _ring[:_ring_pos]
+    return [{"name": r[0], "start": r[1], "ms": r[2], "alloc": r[3], "objects": r[4]} for r in ring]
+
+def dump():
+    """Print the recorded measurements, oldest first, to the serial console."""
+    for r in records():
+        print(f"{r['name']}: {r['ms']}ms, heap {r['alloc']:+d}B, {r['objects']} objects @{r['start']}")
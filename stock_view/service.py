@@ -1,8 +1,24 @@
+import json
 import random
-import arequests as request
+import asyncio
+import clocktime
+from micropython import const
+from . import http_pool
+from .market_hours import group_by_exchange
 
 _STOCK_API_URL = "" # Server URL, needs to be configured
 _USE_SIMULATED_DATA = True # Whether to use simulated stock information
+_USE_COMPACT_FORMAT = False # Ask the server for CSV lines "symbol,currentPrice,previousClose,currency" instead of JSON
+_USE_CONDITIONAL_REQUESTS = True # Send If-None-Match so that unchanged quotes cost a 304 without body
+_CACHE_FILE = "/apps/stock_view/quotes.json" # Quote cache kept on flash so that quotes survive reboots
+_CACHE_TTL = const(900) # Seconds a cached quote is considered fresh
+_MAX_SYMBOLS_PER_REQUEST = const(10) # Most symbols the server accepts in one request
+_MAX_PARALLEL_REQUESTS = const(2) # Requests in flight at the same time, each one holds a TLS connection
+
+_quote_cache = None # {symbol: {"ts": fetch time, "quote": {...}}}, loaded from flash on first use
+_saved_at = 0 # Clock time of the last write of the quote cache to flash
+_saved_keys = None # Sorted symbols of the last written quote cache
+_etags = {} # {symbols parameter of a request: ETag of its last answer}
 
 def generate_mock_stock_info(symbols):
     # Generate simulated stock information
@@ -17,32 +33,202 @@ def generate_mock_stock_info(symbols):
         res["stocks"].append(item)
     return res
 
+def parse_number(text):
+    # A price field of the compact format, None when empty or invalid
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def parse_compact_quotes(text):
+    # Parse the compact format one line at a time, without building the intermediate structures of a JSON document
+    stocks = []
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        if end < 0: end = len(text)
+        line = text[start:end].strip()
+        start = end + 1
+        # Skip empty lines and the optional header line
+        if not line or line.startswith("symbol,"): continue
+        fields = line.split(",")
+        if len(fields) < 4: continue
+        stocks.append({"symbol": fields[0], "currentPrice": parse_number(fields[1]), "previousClose": parse_number(fields[2]), "currency": fields[3] or None})
+    return stocks
+
+def get_header(response, name):
+    # Header of a pooled (lower case names) or arequests response
+    headers = getattr(response, "headers", None) or {}
+    for key, value in headers.items():
+        if key.lower() == name: return value
+    return None
+
 async def fetch_stock_info(symbols="MSFT"):
-    # Fetch stock information
+    """
+    Fetch stock information.
+    Returns {"stocks": [...], "etag": ETag of the answer or None}, {"not_modified": True} when the quotes did not change
+    since the last answer (304), or {} on failure. The ETag is only kept once the quotes are in the cache (get_stock_details).
+    """
     url = f"{_STOCK_API_URL}?symbols={symbols}"
+    if _USE_COMPACT_FORMAT: url += "&format=csv"
+    headers = {}
+    if _USE_CONDITIONAL_REQUESTS and symbols in _etags: headers["If-None-Match"] = _etags[symbols]
 
     try:
-        response = await request.request("GET", url)
-        if response.status_code == 200: return await response.json()
+        response = await http_pool.request("GET", url, headers=headers)
+        if response.status_code == 304: return {"not_modified": True}
+        if response.status_code == 200:
+            # The quotes changed, the previous ETag no longer matches what the cache holds
+            _etags.pop(symbols, None)
+            if _USE_COMPACT_FORMAT: res = {"stocks": parse_compact_quotes(await response.text())}
+            else: res = await response.json()
+            res["etag"] = get_header(response, "etag")
+            return res
     except Exception as e:
         pass
 
     return {}
 
-async def get_stock_details(symbols):
-    # Fetch stock details information
+def get_symbol_key(symbol):
+    # Key matching a configured symbol with its quote ("MSFT:NASDAQ" -> "MSFT"), quotes carry the bare symbol
+    return symbol.split(":")[0].upper()
+
+def load_quote_cache():
+    # Read the quote cache from flash once, a missing or damaged file gives an empty cache
+    global _quote_cache
+    if _quote_cache is not None: return _quote_cache
+    try:
+        with open(_CACHE_FILE, "r") as f: _quote_cache = json.load(f)
+    except Exception as e:
+        _quote_cache = {}
+    return _quote_cache
+
+def save_quote_cache(symbols, now):
+    # Write the quotes of the configured symbols to flash, entries of removed symbols are dropped.
+    # To spare the flash, a cache holding the same symbols is rewritten at most once per _CACHE_TTL:
+    # refreshes every minute during market hours only update it in memory
+    global _quote_cache, _saved_at, _saved_keys
+    keys = [get_symbol_key(x) for x in symbols]
+    _quote_cache = {k: v for k, v in load_quote_cache().items() if k in keys}
+    cached = sorted(_quote_cache)
+    if cached == _saved_keys and 0 <= now - _saved_at < _CACHE_TTL: return
+    try:
+        with open(_CACHE_FILE, "w") as f: json.dump(_quote_cache, f)
+        _saved_at = now
+        _saved_keys = cached
+    except Exception as e:
+        print(f"save quote cache failed: {str(e)}")
+
+def get_cached_stock_details(symbols):
+    """
+    Stock details of the symbols as last fetched, without network access.
+    Returns (details, oldest fetch time); details is empty when no symbol has been fetched yet.
+    Every item carries "stale": True once it is older than the cache TTL or the clock is not set.
+    """
+    cache = load_quote_cache()
+    now = clocktime.now()
     details = []
-    if not symbols: return details
+    oldest = 0
+    for symbol in symbols:
+        entry = cache.get(get_symbol_key(symbol), None)
+        if not entry: continue
+        item = dict(entry["quote"])
+        item["stale"] = now < 0 or now - entry["ts"] >= _CACHE_TTL
+        details.append(item)
+        if not oldest or entry["ts"] < oldest: oldest = entry["ts"]
+    # Symbols never fetched count as infinitely old
+    if len(details) < len(symbols): oldest = 0
+    return details, oldest
 
+async def fetch_stock_chunk(symbols):
+    # Fetch the quotes of at most _MAX_SYMBOLS_PER_REQUEST symbols, returns ({symbol key: quote}, ETag of the answer or None)
     if _USE_SIMULATED_DATA:
         res = generate_mock_stock_info(symbols)
     else:
         res = await fetch_stock_info(",".join(symbols))
 
-    for index, item in enumerate(res.get("stocks", [])):
-        # No symbol field in data? Get from symbols
+    if res.get("not_modified", False):
+        # Unchanged since the last answer, which is in the quote cache
+        cache = load_quote_cache()
+        keys = [get_symbol_key(x) for x in symbols]
+        if all([k in cache for k in keys]): return {k: dict(cache[k]["quote"]) for k in keys}, None
+        # The cache lost some of them: the next request has to download the quotes again
+        _etags.pop(",".join(symbols), None)
+        return {}, None
+
+    quotes = {}
+    items = res.get("stocks", [])
+    for index, item in enumerate(items):
+        if not isinstance(item, dict): continue
         if item.get("symbol", None) is None:
-            item["symbol"], item["shortName"] = symbols[index].split(":")
+            # No symbol field in data? Only a complete answer can be matched by position
+            if len(items) != len(symbols): continue
+            item["symbol"] = symbols[index].split(":")[0]
+        quotes[get_symbol_key(item["symbol"])] = item
+    return quotes, res.get("etag", None)
+
+def forget_etags(symbols):
+    # Forget the ETags of requests for symbols no longer configured
+    keys = [get_symbol_key(x) for x in symbols]
+    for param in list(_etags):
+        if not all([get_symbol_key(x) in keys for x in param.split(",")]): del _etags[param]
+
+async def fetch_stock_quotes(symbols):
+    # Fetch the quotes of all symbols in chunks the server accepts, a few chunks at a time.
+    # A chunk holds symbols of one exchange, so an exchange refreshed on its own sends the same requests (and ETags) each time.
+    # Returns ({symbol key: quote}, {symbols parameter: ETag of its answer})
+    chunks = []
+    for group in group_by_exchange(symbols).values():
+        chunks += [group[i:i + _MAX_SYMBOLS_PER_REQUEST] for i in range(0, len(group), _MAX_SYMBOLS_PER_REQUEST)]
+
+    quotes = {}
+    etags = {}
+    for i in range(0, len(chunks), _MAX_PARALLEL_REQUESTS):
+        batch = chunks[i:i + _MAX_PARALLEL_REQUESTS]
+        results = await asyncio.gather(*[fetch_stock_chunk(x) for x in batch], return_exceptions=True)
+        for chunk, res in zip(batch, results):
+            if not isinstance(res, tuple): continue
+            quotes.update(res[0])
+            if res[1]: etags[",".join(chunk)] = res[1]
+    return quotes, etags
+
+async def get_stock_details(symbols, configured=None):
+    """
+    Fetch the stock details of the symbols, one item per symbol in the same order.
+    Quotes are matched by symbol. A symbol whose fetch failed keeps its last cached quote (marked stale),
+    or gets an item without price when it was never fetched.
+    Successful quotes are stored in the quote cache, which keeps the configured symbols (default: symbols)
+    so that fetching a part of them does not drop the others.
+    """
+    details = []
+    if not symbols: return details
+
+    quotes, etags = await fetch_stock_quotes(symbols)
+    cache = load_quote_cache()
+    now = clocktime.now()
+    stored = []
+    for symbol in symbols:
+        key = get_symbol_key(symbol)
+        item = quotes.get(key, None)
+        if item is not None and item.get("currentPrice", None) is not None:
+            if now >= 0:
+                cache[key] = {"ts": now, "quote": item}
+                stored.append(key)
+        elif key in cache:
+            # Failed or incomplete: keep the last known good quote
+            item = dict(cache[key]["quote"])
+            item["stale"] = True
+        elif item is None:
+            item = {"symbol": key, "currentPrice": None, "previousClose": None, "currency": None}
+        if item.get("shortName", None) is None:
+            item["shortName"] = symbol.split(":")[1] if ":" in symbol else ""
         details.append(item)
 
+    # Keep an ETag only when its whole answer went to the cache: a 304 to it is answered from there
+    for param, etag in etags.items():
+        if all([get_symbol_key(x) in stored for x in param.split(",")]): _etags[param] = etag
+
+    if configured is None: configured = symbols
+    forget_etags(configured)
+    if quotes and now >= 0: save_quote_cache(configured, now)
     return details
@@ -0,0 +1,55 @@
+# Module: cooperative time slicing for long widget rebuilds
+import time
+import asyncio
+from micropython import const
+
+FRAME_BUDGET_MS = const(16) # Work allowed between two yields to the event loop, about one display frame
+
+_last_runs = {} # {slice name: {"total_ms", "yields", "steps": [(step, ms), ...]}} of the last finished run
+
+class TimeSlice:
+    """
+    Split a long UI rebuild into per-frame chunks.
+
+    Call `await checkpoint(step)` after each unit of work (a card, a row ...).
+    Once the frame budget is used up it yields with asyncio.sleep_ms(0), so key
+    events and other tasks run between chunks instead of after the whole rebuild.
+    The duration of every step is recorded; `finish()` stores them for `get_last_runs()`
+    and prints them when the slice was created with report=True.
+    A profiler span passed in is paused while other tasks run, and ended by `finish()`.
+    """
+
+    def __init__(self, name, budget_ms=FRAME_BUDGET_MS, report=False, span=None):
+        self.name = name
+        self.budget_ms = budget_ms
+        self.report = report
+        self.span = span
+        self.steps = []  # [(step, ms)] in execution order
+        self.yields = 0  # Number of times the slice gave the event loop a turn
+        self._start = self._slice_start = self._step_start = time.ticks_ms()
+
+    async def checkpoint(self, step=None):
+        """Record the step that just finished and yield if the frame budget is used up."""
+        now = time.ticks_ms()
+        self.steps.append((step, time.ticks_diff(now, self._step_start)))
+        if time.ticks_diff(now, self._slice_start) >= self.budget_ms:
+            if self.span: self.span.pause()
+            await asyncio.sleep_ms(0)
+            if self.span: self.span.resume()
+            self.yields += 1
+            self._slice_start = time.ticks_ms()
+        self._step_start = time.ticks_ms()
+
+    def finish(self):
+        """Store (and optionally print) the timings of this run, returns the total duration in ms."""
+        total = time.ticks_diff(time.ticks_ms(), self._start)
+        if self.span: self.span.end()
+        _last_runs[self.name] = {"total_ms": total, "yields": self.yields, "steps": self.steps}
+        if self.report:
+            steps = ", ".join([f"{step}:{ms}ms" for step, ms in self.steps])
+            print(f"{self.name}: {total}ms in {len(self.steps)} steps, {self.yields} yields [{steps}]")
+        return total
+
+def get_last_runs():
+    """Timings of the last finished run of every time slice, keyed by name."""
+    return _last_runs